@@ -1,6 +1,10 @@
-from .modules import modules
 import bpy
 
+from .utils import timed, timings
+
+with timed('Import modules'):
+    from .modules import modules
+
 bl_info = {
     "name": "Curvature Creator",
     "author": "Zenker",
@@ -17,12 +21,16 @@ class ZenUtilsPreferences(bpy.types.AddonPreferences):
 
     def draw(self, context):
         layout = self.layout
-        # print(__name__)
+        col = layout.column(align=True)
+        col.label(text='Load Timings')
+        for name, ms in timings.items():
+            col.label(text=f'{name}: {ms:.1f} ms')
 
 
 def register():
     for i in modules:
-        i.register()
+        with timed(f'Register {i.__name__.rsplit(".", 1)[-1]}'):
+            i.register()
     bpy.utils.register_class(ZenUtilsPreferences)
 
 
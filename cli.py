@@ -0,0 +1,26 @@
+"""Entry point of the batch runner, see modules/curvature_creator/batch.py:
+
+    blender --background --factory-startup --python cli.py -- tables/ output/ --jobs 4
+"""
+import importlib.util
+import os
+import sys
+
+PACKAGE = 'curvature_creator_batch'
+
+
+def load_batch():
+    # Blender runs this file as a plain script, import the add-on next to it as a package of its own, so it
+    # works whatever the add-on folder is called and does not collide with an installed copy.
+    root = os.path.dirname(os.path.abspath(__file__))
+    spec = importlib.util.spec_from_file_location(PACKAGE, os.path.join(root, '__init__.py'),
+                                                  submodule_search_locations=[root])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE] = package
+    spec.loader.exec_module(package)
+    return importlib.import_module(f'{PACKAGE}.modules.curvature_creator.batch')
+
+
+if __name__ == '__main__':
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    sys.exit(load_batch().main(argv))
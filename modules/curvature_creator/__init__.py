@@ -1,280 +1,26 @@
 import math
-import os
-import traceback
-from typing import Any
 
 import bpy
-from bpy_extras import view3d_utils
-from mathutils import Vector
-from .bezier import Bezier, lerp
-from .bezier_draw import bezier_draw
-from .draw_2d import Draw2D
-from .draw_3d import Draw3D
-from .draw_curve_comb import draw_curve_comb, CurveComb
+from bpy.app.handlers import persistent
 from ...base_panel import BasePanel
-from ...utils import update_window
-from . import export_import, properties
-
-draw: 'Draw' = None
-circle_size = .0001
-
-
-class Draw:
-    _is_enable: bool = False
-    _render: Any = None
-    _render_pixel: Any = None
-    _text_pos: Vector
-    _a: Vector = Vector((0, 0, 0))
-    _b: Vector = Vector((0, 0, 0))
-    _c: Vector = Vector((0, 0, 0))
-    _comb: CurveComb = CurveComb()
-    _circle_radius: float = 0
-    _circle_is_active: bool = False
-    vectors: list[Vector]
-    drawer_2d: Draw2D
-    drawer_3d: Draw3D
-
-    def __init__(self):
-        self.drawer_2d = Draw2D()
-        self.drawer_3d = Draw3D()
-        self._text_pos = Vector((0, 0, 0))
-        self.vectors = []
-
-    @property
-    def circle_is_active(self) -> bool:
-        return self._circle_is_active and bpy.context.scene.zenu_pruett_radius_show
-
-    def angle_to_vector(self, angle: float, dist: float):
-        return Vector(((math.sin(angle)) * dist, 0, (math.cos(angle)) * dist))
-
-    def angle_calc(self, start: Vector, target: Vector):
-        return math.atan2(target.x - start.x, target.z - start.z)
-
-    def calc(self, point, start: Vector, target: Vector) -> tuple[Vector, float]:
-        edge_angle = self.angle_calc(start, target)
-        dist = point.distance
-        angle = point.angle
-
-        if target.x > 0:
-            angle += edge_angle
-        else:
-            dist *= -1
-            angle = math.pi - angle
-            angle += edge_angle
-
-        return self.angle_to_vector(angle, dist), edge_angle
-
-    def get_pos_on_screen(self, pos: Vector):
-        for area in bpy.context.screen.areas:
-            if area.type == 'VIEW_3D':
-                region_3d = area.spaces[0].region_3d
-                for region in area.regions:
-                    if region.type == 'WINDOW':
-                        return view3d_utils.location_3d_to_region_2d(
-                            region,
-                            region_3d,
-                            pos
-                        )
-
-    def _draw_point(self, pos: Vector, text: str, color=(1, 1, 0)):
-        self.drawer_2d.draw_circle(pos, radius=20, color=color)
-        self.drawer_2d.draw_text(pos - Vector((40, 0)), text, color=color)
-
-    def _draw_pixel(self):
-        text_pos = self.get_pos_on_screen(self._text_pos)
-        point_c = bpy.context.scene.zenu_curve_point_c
-        a = self.get_pos_on_screen(self._a)
-        b = self.get_pos_on_screen(self._b)
-        c = self.get_pos_on_screen(self._c)
-
-        dist_b: float = bpy.context.scene.zenu_curve_point_b.distance
-        dist_c: float = bpy.context.scene.zenu_curve_point_c.distance
-
-        radius_a = 0
-        radius_b = 0
-        radius_c = 0
-
-        if bpy.context.object and isinstance(bpy.context.object.data, bpy.types.Curve):
-            curve = bpy.context.object.data
-            size = curve.bevel_depth
-            spline = curve.splines.active
-
-            radius_a = (size * spline.bezier_points[0].radius) * 1000
-            radius_b = (size * spline.bezier_points[1].radius) * 1000
-            radius_c = (size * spline.bezier_points[2].radius) * 1000
-
-        text_left = Vector((0, a.y))
-        self.drawer_2d.draw_text(text_left - Vector((-400, 0)), f'L = {self._comb.length * 1000:.2f} mm')
-        self.drawer_2d.draw_text(text_left - Vector((-400, 30)),
-                                 f'K = {self._comb.curvature:.2f}(A = {self._comb.curvature_abs:.2f})')
-        self.drawer_2d.draw_text(text_left - Vector((-400, 30 * 2)),
-                                 f'R = {math.fabs(self._circle_radius * 1000):.2f} mm', color=(0, 1, 0))
-
-        self.drawer_2d.draw_text(text_left - Vector((-400, 30 * 3)),
-                                 f'R = {math.fabs(self._comb.radius * 1000):.2f} mm', color=(1, 0, 0))
-
-        self.drawer_2d.draw_circle(c, radius=20)
-        self.drawer_2d.draw_text(text_pos + Vector((0, 20)), f'{round(math.degrees(point_c.angle), 2)} °')
-        self._draw_point(a, f'A{" " * 10}R = {radius_a:.2f} mm', color=(.99609375, .53125, .52734375))
-        self._draw_point(b, f'B{" " * 14}R = {radius_b:.2f} mm', color=(.8671875, .875, 1))
-        self._draw_point(c, f'C{" " * 10}R = {radius_c:.2f} mm', color=(0, 1, 0))
-
-        self.drawer_2d.draw_text(lerp(a, b, .5), f'{" " * 10}{dist_b * 1000:.2f} mm')
-        self.drawer_2d.draw_text(lerp(b, c, .5), f'{" " * 10}{dist_c * 1000:.2f} mm')
-
-    #
-    def _move_spline(self):
-        if bpy.context.object is None or not isinstance(bpy.context.object.data, bpy.types.Curve):
-            return
+from ...utils import timed
+from . import deviation, export_import, fairing, hover, profiling, properties, tube
 
-        points = bpy.context.object.data.splines.active.bezier_points
-        points[0].co = self._a
-        points[1].co = self._b
-        points[2].co = self._c
+# The overlay pulls in gpu, blf and NumPy, it is created when the view is first enabled.
+draw: 'Draw | None' = None
 
-    def _draw_curve_comb(self):
-        if bpy.context.object is None or not isinstance(bpy.context.object.data, bpy.types.Curve):
-            return
-        if not bpy.context.scene.zenu_curve_comb_show:
-            return
-        spline = bpy.context.object.data.splines.active
-        self._comb = draw_curve_comb(spline, self.drawer_3d)
-
-    def _draw_purrte(self):
-        bc_ang = self.angle_calc(self._b, self._c)
-        ab_ang = self.angle_calc(self._a, self._b)
-
-        Oa = Vector((
-            math.sin(bc_ang),
-            0,
-            math.cos(bc_ang)
-        ))
-        Ob = Vector((
-            math.sin(ab_ang),
-            0,
-            math.cos(ab_ang)
-        ))
-
-        distance = bpy.context.scene.zenu_pruett_radius
-        a = self._b - Ob * distance
-        b = self._b + Oa * distance
-        ab_center = lerp(a, b, .5)
-
-        median_ang = self.angle_calc(self._b, ab_center)
-
-        Oo = Vector((
-            math.sin(median_ang),
-            0,
-            math.cos(median_ang)
-        ))
-        point_c = bpy.context.scene.zenu_curve_point_c
-
-        gamma = point_c.angle
-        beta = math.radians(180) - gamma
-        o = distance / math.cos(beta / 2)
-        circle_radius = o * math.sin(beta / 2)
-        circle_position = self._b + Oo * o
-
-        if gamma < 0:
-            circle_position = self._b - Oo * o
-
-        self._circle_position = circle_position
-        self._circle_radius = circle_radius
-        # print(math.degrees(gamma))
-        self._circle_is_active = math.fabs(math.degrees(gamma)) > 1
-        if self._circle_is_active:
-            self.drawer_3d.draw_circle(circle_position, radius=circle_radius, segments=256, color=(0, 1, 0))
-
-    def _draw(self):
-        pointB = bpy.context.scene.zenu_curve_point_b
-        pointC = bpy.context.scene.zenu_curve_point_c
-        circle_radius = bpy.context.scene.zenu_circle_radius
-        point_a = Vector((0, 0, bpy.context.scene.zenu_curve_height))
-        point_b = self.angle_to_vector(pointB.angle, pointB.distance * -1)
-        point_b += point_a
-
-        v3, edge_angle = self.calc(pointC, point_a, point_b)
-        point_c = point_b + v3
-        v4 = self.angle_to_vector(edge_angle, pointC.distance)
-
-        circle_p1 = point_b + self.angle_to_vector(edge_angle, circle_radius)
-        circle_ang = -pointC.angle if point_b.x < 0 else pointC.angle
-        center = self.drawer_3d.draw_circle(point_b, edge_angle, circle_ang, (circle_p1 - point_b).length)
-
-        self._a = point_a
-        self._b = point_b
-        self._c = point_c
-
-        if bpy.context.scene.zenu_pruett_radius_show:
-            self._draw_purrte()
-
-        if bpy.context.scene.zenu_comb_circle_show:
-            self.drawer_3d.draw_circle(self._comb.point, radius=self._comb.radius, segments=256, color=(1, 0, 0))
-
-        self._text_pos = center + Vector((-.0005, 0, -.0005))
-        self.drawer_3d.draw_lines([
-            point_a, point_b,
-            point_b, point_b + v3,
-            point_b, point_b + v4
-        ], color=(.26171875, .546875, .828125))
-        self._draw_curve_comb()
-        self._move_spline()
-
-    def compute(self):
-        point1 = bpy.context.scene.zenu_curve_point_b
-        point2 = bpy.context.scene.zenu_curve_point_c
-        v1 = Vector((0, 0, bpy.context.scene.zenu_curve_height))
-        angle = math.radians(point1.angle)
-        dist = point1.distance * -1
-        v2 = self.angle_to_vector(angle, dist)
-        v2 += v1
-        v3, edge_angle = self.calc(point2, v1, v2)
-        self.vectors.clear()
-        self.vectors.append(v1)
-        self.vectors.append(v2)
-        self.vectors.append(v2 + v3)
-
-    def draw_pixel(self):
-        try:
-            self._draw_pixel()
-        except Exception as e:
-            print(f'Pixel View error: {traceback.format_exc()}')
-            self.disable()
 
-    def draw(self):
-        try:
-            self._draw()
-        except Exception as e:
-            print(f'3D View error: {traceback.format_exc()}')
-            self.disable()
+def get_draw() -> 'Draw':
+    global draw
+    if draw is None:
+        with timed('Curvature overlay load'):
+            from .overlay import Draw
+            draw = Draw()
+    return draw
 
-    def disable(self):
-        self._is_enable = False
-        try:
-            if self._render:
-                bpy.types.SpaceView3D.draw_handler_remove(self._render, 'WINDOW')
-                bpy.types.SpaceView3D.draw_handler_remove(self._render_pixel, 'WINDOW')
-                update_window()
-        except Exception as e:
-            print(f'Disable view error: {e}')
-
-    def enable(self):
-        if self._is_enable:
-            return
-        self._is_enable = True
-        self._render = bpy.types.SpaceView3D.draw_handler_add(self.draw, (), 'WINDOW', 'POST_VIEW')
-        self._render_pixel = bpy.types.SpaceView3D.draw_handler_add(self.draw_pixel, (), 'WINDOW', 'POST_PIXEL')
-        update_window()
-
-    def toggle(self):
-        if self._is_enable:
-            self.disable()
-        else:
-            self.enable()
 
-    @property
-    def is_enable(self):
-        return self._is_enable
+def view_enabled() -> bool:
+    return draw is not None and draw.is_enable
 
 
 class ZENU_OT_create_curve(bpy.types.Operator):
@@ -282,49 +28,61 @@ class ZENU_OT_create_curve(bpy.types.Operator):
     bl_idname = 'zenu.create_curve'
 
     def execute(self, context: bpy.types.Context):
-        draw.compute()
-
-        curve_data = bpy.data.curves.new('myCurve', type='CURVE')
-        curve_data.dimensions = '3D'
-        curve_data.resolution_u = 12
-
-        polyline = curve_data.splines.new('BEZIER')
-        polyline.bezier_points.add(len(draw.vectors) - 1)
-        for i, coord in enumerate(draw.vectors):
-            x, y, z = coord
-            polyline.bezier_points[i].co = (x, y, z)
-
-        # create Object
-        curveOB = bpy.data.objects.new('Curve Creator', curve_data)
-        curve_data.bevel_depth = 0.001
-        context.scene.collection.objects.link(curveOB)
-        bpy.context.view_layer.objects.active = curveOB
-        curveOB.select_set(True)
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.curve.select_all(action='SELECT')
-        bpy.ops.curve.handle_type_set(type='AUTOMATIC')
-        bpy.ops.object.mode_set(mode='OBJECT')
-        draw.enable()
+        from .core.construction import construct, xy2xz_array
+        from .spline_io import create_curve_objects
+
+        point_b = context.scene.zenu_curve_point_b
+        point_c = context.scene.zenu_curve_point_c
+        geometry = construct(context.scene.zenu_curve_height, point_b.angle, point_b.distance,
+                             point_c.angle, point_c.distance)
+
+        curve, = create_curve_objects(xy2xz_array(geometry.points)[None], context.scene.collection)
+        context.view_layer.objects.active = curve
+        curve.select_set(True)
+        if not bpy.app.background:
+            # There is no viewport to draw the overlay in, nor a GPU context to create it with.
+            get_draw().mark_dirty()
+            get_draw().enable()
         return {'FINISHED'}
 
 
-class ZENU_OT_enable_view(bpy.types.Operator):
-    bl_label = 'Toggle View'
-    bl_idname = 'zenu.enbale_view'
+class ZENU_OT_create_curves(bpy.types.Operator):
+    """Create a curve per row of a CSV table of height mm, B angle deg, B distance mm, C angle deg, C distance mm,
+    the first line is skipped as a header"""
+    bl_label = 'Create Curves From Table'
+    bl_idname = 'zenu.create_curves'
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(default='*.csv', options={'HIDDEN'})
+
+    def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
 
     def execute(self, context: bpy.types.Context):
-        draw.obj = context.active_object
-        draw.toggle()
+        from .core.construction import read_table, xy2xz_array
+        from .spline_io import create_curve_objects
+
+        path = bpy.path.abspath(self.filepath)
+        try:
+            geometry = read_table(path)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f'Cannot read {path}: {e}')
+            return {'CANCELLED'}
+
+        collection = bpy.data.collections.new(bpy.path.display_name_from_filepath(path))
+        context.scene.collection.children.link(collection)
+        objects = create_curve_objects(xy2xz_array(geometry.points), collection)
+        self.report({'INFO'}, f'{len(objects)} curves created in {collection.name}')
         return {'FINISHED'}
 
 
-class ZENU_OT_export_stl(bpy.types.Operator):
-    bl_label = 'Export STL'
-    bl_idname = 'zenu.export_stl'
+class ZENU_OT_enable_view(bpy.types.Operator):
+    bl_label = 'Toggle View'
+    bl_idname = 'zenu.enbale_view'
 
     def execute(self, context: bpy.types.Context):
-        path = bpy.path.abspath(os.path.splitext(context.scene.zenu_import_export_path)[0])
-        bpy.ops.export_mesh.stl(global_scale=1000, filepath=path + '_exported.stl', check_existing=False)
+        get_draw().toggle()
         return {'FINISHED'}
 
 
@@ -336,7 +94,7 @@ class ZENU_PT_curvature_creator(BasePanel):
         layout = self.layout
 
         col = layout.column_flow(align=True)
-        col.operator(ZENU_OT_enable_view.bl_idname, depress=draw.is_enable)
+        col.operator(ZENU_OT_enable_view.bl_idname, depress=view_enabled())
         col.prop(context.scene, 'zenu_curve_height', slider=True)
         col.prop(context.scene, 'zenu_circle_radius', slider=True)
         col.prop(bpy.context.scene.unit_settings, 'length_unit', text='')
@@ -368,58 +126,153 @@ class ZENU_PT_curvature_creator_curve(BasePanel):
 
         col = layout.column_flow(align=True)
         col.operator(ZENU_OT_create_curve.bl_idname)
+        col.operator(ZENU_OT_create_curves.bl_idname, icon='FILE')
+        col.operator(fairing.ZENU_OT_fair_spline.bl_idname)
+        col.operator(hover.ZENU_OT_curve_hover.bl_idname, icon='RESTRICT_SELECT_OFF')
+        col.operator(tube.ZENU_OT_build_tube.bl_idname, icon='MESH_CYLINDER')
+        col.prop(context.scene, 'zenu_tube_tolerance')
         col.prop(context.scene, 'zenu_curve_comb_show', icon='RESTRICT_VIEW_ON')
-        col.prop(context.scene, 'zenu_curve_comb_steps', slider=True)
+        col.prop(context.scene, 'zenu_comb_circle_show', icon='RESTRICT_VIEW_ON')
+        col.prop(context.scene, 'zenu_curve_comb_mode', text='')
+        if context.scene.zenu_curve_comb_mode == 'ADAPTIVE':
+            col.prop(context.scene, 'zenu_curve_comb_tolerance')
+            col.prop(context.scene, 'zenu_curve_comb_min_samples')
+            col.prop(context.scene, 'zenu_curve_comb_max_samples')
+        else:
+            col.prop(context.scene, 'zenu_curve_comb_steps', slider=True)
         col.prop(context.scene, 'zenu_curve_comb_scale', slider=True)
         col.prop(context.scene, 'zenu_active_curve_bevel', slider=True)
 
+        col.prop(context.scene, 'zenu_curve_comb_heatmap')
+        col.prop(context.scene, 'zenu_curve_g2_tolerance')
+
+        if context.scene.zenu_curve_comb_show and view_enabled():
+            from .core.comb import segment_cache
+
+            layout.label(text=f'Comb cache: {segment_cache.stats()}')
+            layout.label(text=f'G2 breaks: {draw.comb.g2_breaks} (max jump {draw.comb.g2_max_jump:.0%})',
+                         icon='ERROR' if draw.comb.g2_breaks else 'CHECKMARK')
 
-class ZENU_PT_curvature_creator_curve(BasePanel):
-    bl_label = 'Curvature'
-    bl_parent_id = 'ZENU_PT_curvature_creator'
+
+class ZENU_PT_curvature_creator_comb_table(BasePanel):
+    bl_label = 'Comb Analysis'
+    bl_parent_id = 'ZENU_PT_curvature_creator_curve'
+    bl_context = ''
+
+    def draw_header(self, context: bpy.types.Context):
+        self.layout.prop(context.scene, 'zenu_curve_comb_selected', text='')
 
     def draw(self, context: bpy.types.Context):
         layout = self.layout
+        layout.active = context.scene.zenu_curve_comb_selected
+        if not view_enabled() or not draw.spline_rows:
+            layout.label(text='Select curves and enable the comb')
+            return
 
-        col = layout.column_flow(align=True)
-        col.operator(ZENU_OT_create_curve.bl_idname)
-        col.prop(context.scene, 'zenu_curve_comb_show', icon='RESTRICT_VIEW_ON')
-        col.prop(context.scene, 'zenu_comb_circle_show', icon='RESTRICT_VIEW_ON')
-        col.prop(context.scene, 'zenu_curve_comb_steps', slider=True)
-        col.prop(context.scene, 'zenu_curve_comb_scale', slider=True)
-        col.prop(context.scene, 'zenu_active_curve_bevel', slider=True)
+        grid = layout.grid_flow(row_major=True, columns=4, even_columns=False, align=True)
+        for text in ('Spline', 'L mm', 'K', 'R min mm'):
+            grid.label(text=text)
+        for row in draw.spline_rows:
+            grid.label(text=row.name)
+            grid.label(text=f'{row.metrics.length * 1000:.2f}')
+            grid.label(text=f'{row.metrics.curvature:.2f}')
+            grid.label(text=f'{math.fabs(row.metrics.extremum.radius) * 1000:.2f}')
 
 
-class CurvePointInfo(bpy.types.PropertyGroup):
-    distance: bpy.props.FloatProperty(name='Distance', soft_min=.01, soft_max=.05, subtype='DISTANCE')
-    angle: bpy.props.FloatProperty(name='Angle', soft_max=math.pi / 2, soft_min=-math.pi / 2, subtype='ANGLE')
+class ZENU_PT_curvature_creator_deviation(BasePanel):
+    bl_label = 'Scan Deviation'
+    bl_parent_id = 'ZENU_PT_curvature_creator_curve'
+    bl_context = ''
+
+    def draw_header(self, context: bpy.types.Context):
+        self.layout.prop(context.scene, 'zenu_deviation_show', text='')
+
+    def draw(self, context: bpy.types.Context):
+        layout = self.layout
+        col = layout.column_flow(align=True)
+        col.prop(context.scene, 'zenu_deviation_target', text='')
+        col.prop(context.scene, 'zenu_deviation_steps')
+        col.prop(context.scene, 'zenu_deviation_limit')
+        col.operator(deviation.ZENU_OT_measure_deviation.bl_idname)
+
+        result = draw.scan_deviation if view_enabled() else None
+        if result is not None:
+            layout.label(text=f'Max {result.max * 1000:.3f} mm, RMS {result.rms * 1000:.3f} mm')
 
 
 reg, unreg = bpy.utils.register_classes_factory((
     ZENU_OT_enable_view,
     ZENU_OT_create_curve,
+    ZENU_OT_create_curves,
     ZENU_PT_curvature_creator,
     ZENU_PT_curvature_creator_curve,
+    ZENU_PT_curvature_creator_comb_table,
+    ZENU_PT_curvature_creator_deviation,
+    *deviation.classes,
     *export_import.classes,
+    *fairing.classes,
+    *hover.classes,
+    *tube.classes,
+    *profiling.classes,
     *properties.classes
 ))
 
-draw = Draw()
-
 
-def update_curve_radius(self, context: bpy.types.Context):
-    if bpy.context.object is None or not isinstance(bpy.context.object.data, bpy.types.Curve):
+@persistent
+def on_depsgraph_update(scene: bpy.types.Scene, depsgraph: bpy.types.Depsgraph):
+    if any(i.is_updated_geometry and isinstance(i.id, bpy.types.Mesh) for i in depsgraph.updates):
+        # An edited target mesh needs a new tree.
+        deviation.clear_trees()
+    if not view_enabled():
         return
-    curve_data = bpy.context.object.data
-    curve_data.bevel_depth = context.scene.zenu_active_curve_bevel
+    if scene.zenu_curve_comb_selected:
+        # Selection and transforms change what the multi-spline comb shows, unchanged segments stay cached.
+        draw.mark_dirty(construction=False)
+        return
+    for update in depsgraph.updates:
+        if update.is_updated_geometry and isinstance(update.id, (bpy.types.Curve, bpy.types.Object)):
+            draw.mark_dirty(construction=False)
+            return
+
+
+@persistent
+def on_load_post(*args):
+    # Subscriptions do not survive loading a file, nor do the meshes the cached trees were built from.
+    deviation.clear_trees()
+    # A file saved with profiling on loads with the property set but without its update callback running.
+    profiling.sync_profile(bpy.context.scene)
+    if view_enabled():
+        draw.mark_dirty()
+        draw._subscribe()
+
+
+@persistent
+def on_undo_redo(*args):
+    # Undo restores property values without notifying the subscriptions or running update callbacks.
+    profiling.sync_profile(bpy.context.scene)
+    if draw is not None:
+        draw.mark_dirty()
+
+
+HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, on_depsgraph_update),
+    (bpy.app.handlers.load_post, on_load_post),
+    (bpy.app.handlers.undo_post, on_undo_redo),
+    (bpy.app.handlers.redo_post, on_undo_redo),
+)
 
 
 def register():
-    global draw
     reg()
     properties.init_properties()
+    for handlers, handler in HANDLERS:
+        handlers.append(handler)
 
 
 def unregister():
-    draw.disable()
+    if draw is not None:
+        draw.disable()
+    for handlers, handler in HANDLERS:
+        if handler in handlers:
+            handlers.remove(handler)
     unreg()
@@ -0,0 +1,211 @@
+"""Create curves, tube meshes, STLs and metrics from a directory of construction tables without the UI.
+
+Every table is a CSV read like Create Curves From Table, one design per row. Run the entry script at the
+root of the add-on with Blender, it starts worker Blender processes for the tables, at most `--jobs` at once:
+
+    blender --background --factory-startup --python cli.py -- tables/ output/ --jobs 4
+
+Every design gets `<table>_<row>.stl` in millimetres, `--blend` also keeps the curves and tubes of every
+table in `<table>.blend`. The metrics of all designs are collected in `output/metrics.csv`.
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import bpy
+import numpy as np
+
+from .core import stl
+from .core.comb import CombSettings, comb_metrics, comb_samples, joint_report
+from .core.construction import read_table, xy2xz_array
+from .mesh_io import build_tube_mesh, curve_tubes
+from .spline_io import SplineBuffer, create_curve_objects
+
+CLI_SCRIPT = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'cli.py'))
+METRICS = ('table', 'row', 'length_mm', 'curvature', 'curvature_abs', 'min_radius_mm', 'g2_breaks', 'triangles',
+           'stl')
+
+
+@dataclass(frozen=True)
+class BatchSettings:
+    radius: float = 2 / 1000
+    tolerance: float = .01 / 1000
+    steps: int = 50
+    g2_tolerance: float = .05
+    blend: bool = False
+
+    def options(self) -> list[str]:
+        """Command line options that recreate these settings in a worker."""
+        options = ['--radius', repr(self.radius * 1000), '--tolerance', repr(self.tolerance * 1000),
+                   '--steps', str(self.steps), '--g2-tolerance', repr(self.g2_tolerance)]
+        return options + ['--blend'] if self.blend else options
+
+
+def design_metrics(obj: bpy.types.Object, settings: BatchSettings) -> dict:
+    segments = np.array(SplineBuffer().read(obj.data.splines[0]))
+    combs = comb_samples(segments, CombSettings(steps=settings.steps))
+    metrics = comb_metrics(segments, combs)
+    report = joint_report(combs, np.array((0, len(segments))), settings.g2_tolerance)
+    return {
+        'length_mm': metrics.length * 1000,
+        'curvature': metrics.curvature,
+        'curvature_abs': metrics.curvature_abs,
+        'min_radius_mm': abs(metrics.extremum.radius) * 1000 if metrics.extremum.curvature else float('inf'),
+        'g2_breaks': len(report.segment),
+    }
+
+
+def process_table(path: str, output: str, settings: BatchSettings) -> list[dict]:
+    """Curves, tubes and one STL per row of the table, every data-block it creates is removed again."""
+    name = bpy.path.display_name_from_filepath(path)
+    geometry = read_table(path)
+
+    collection = bpy.data.collections.new(name)
+    bpy.context.scene.collection.children.link(collection)
+    curves = create_curve_objects(xy2xz_array(geometry.points), collection, name=name)
+    created = [collection, *curves, *(i.data for i in curves)]
+    rows = []
+    try:
+        for row, obj in enumerate(curves):
+            obj.name = f'{name}_{row:03d}'
+            obj.data.bevel_depth = settings.radius
+            tubes = curve_tubes(obj, settings.tolerance, settings.radius)
+            # The curves sit at the origin, local space is world space.
+            triangles = np.concatenate([i.triangles() for i in tubes]) * 1000
+
+            filepath = os.path.join(output, f'{obj.name}.stl')
+            with open(filepath, 'wb') as file:
+                stl.write_binary(file, triangles, header=b'Curvature Creator, mm')
+            rows.append({'table': name, 'row': row, **design_metrics(obj, settings), 'triangles': len(triangles),
+                         'stl': os.path.basename(filepath)})
+
+            if settings.blend:
+                mesh = build_tube_mesh(f'{obj.name} Tube', tubes)
+                tube_obj = bpy.data.objects.new(mesh.name, mesh)
+                collection.objects.link(tube_obj)
+                created += [mesh, tube_obj]
+
+        if settings.blend:
+            bpy.data.libraries.write(os.path.join(output, f'{name}.blend'), {collection}, fake_user=True)
+    finally:
+        bpy.data.batch_remove(created)
+    return rows
+
+
+def run_worker(tables: list[str], output: str, settings: BatchSettings) -> int:
+    """Process tables one after another in this Blender, writing `<table>.json` with the metrics of each."""
+    failed = 0
+    for path in tables:
+        start = time.perf_counter()
+        try:
+            rows = process_table(path, output, settings)
+        except (OSError, ValueError) as e:
+            print(f'{path}: {e}', file=sys.stderr)
+            failed += 1
+            continue
+        with open(os.path.join(output, bpy.path.display_name_from_filepath(path) + '.json'), 'w') as file:
+            json.dump(rows, file)
+        print(f'{path}: {len(rows)} designs in {time.perf_counter() - start:.2f} s')
+    return 1 if failed else 0
+
+
+def worker_command(blender: str, tables: list[str], output: str, settings: BatchSettings) -> list[str]:
+    return [blender, '--background', '--factory-startup', '--python', CLI_SCRIPT, '--',
+            *tables, output, '--worker', *settings.options()]
+
+
+def run_workers(tables: list[str], output: str, settings: BatchSettings, jobs: int, per_worker: int,
+                blender: str) -> int:
+    """Split the tables into chunks of `per_worker` and process every chunk in its own Blender, `jobs` at once."""
+    chunks = [tables[i:i + per_worker] for i in range(0, len(tables), per_worker)]
+
+    def run(chunk: list[str]) -> subprocess.CompletedProcess:
+        return subprocess.run(worker_command(blender, chunk, output, settings), capture_output=True, text=True)
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for chunk, result in zip(chunks, executor.map(run, chunks)):
+            if result.returncode:
+                failed += 1
+                print(f'Worker for {len(chunk)} table(s) exited with {result.returncode}:\n{result.stderr[-2000:]}',
+                      file=sys.stderr)
+    return 1 if failed else 0
+
+
+def collect_metrics(tables: list[str], output: str) -> int:
+    """Merge the metrics of every table into metrics.csv, returns the number of designs."""
+    count = 0
+    with open(os.path.join(output, 'metrics.csv'), 'w', newline='') as file:
+        writer = csv.DictWriter(file, METRICS)
+        writer.writeheader()
+        for path in tables:
+            metrics = os.path.join(output, bpy.path.display_name_from_filepath(path) + '.json')
+            if not os.path.isfile(metrics):
+                continue
+            with open(metrics) as rows:
+                for row in json.load(rows):
+                    writer.writerow(row)
+                    count += 1
+    return count
+
+
+def find_tables(paths: list[str]) -> list[str]:
+    tables = []
+    for path in paths:
+        tables += sorted(glob.glob(os.path.join(path, '*.csv'))) if os.path.isdir(path) else [path]
+    return [os.path.abspath(i) for i in tables]
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='cli.py', description=__doc__.split('\n')[0])
+    parser.add_argument('tables', nargs='+', help='Directories of CSV tables or table files')
+    parser.add_argument('output', help='Directory the STLs and metrics are written to')
+    parser.add_argument('--jobs', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='Worker Blender processes running at once, 1 processes everything in this one')
+    parser.add_argument('--tables-per-worker', type=int, default=8,
+                        help='Tables a worker processes before it exits, so startup is paid once per chunk')
+    parser.add_argument('--radius', type=float, default=2, help='Tube radius in mm')
+    parser.add_argument('--tolerance', type=float, default=.01, help='Tube Tolerance in mm')
+    parser.add_argument('--steps', type=int, default=50, help='Curvature samples per segment of the metrics')
+    parser.add_argument('--g2-tolerance', type=float, default=.05,
+                        help='Curvature jump, as a fraction of the larger |K| at a joint, counted as a G2 break')
+    parser.add_argument('--blend', action='store_true', help='Also save the curves and tubes of every table')
+    parser.add_argument('--blender', default=bpy.app.binary_path, help='Blender executable of the workers')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    settings = BatchSettings(radius=args.radius / 1000, tolerance=args.tolerance / 1000, steps=args.steps,
+                             g2_tolerance=args.g2_tolerance, blend=args.blend)
+    tables = find_tables(args.tables)
+    output = os.path.abspath(args.output)
+    os.makedirs(output, exist_ok=True)
+    if args.worker:
+        return run_worker(tables, output, settings)
+    if not tables:
+        print(f'No tables found in {", ".join(args.tables)}', file=sys.stderr)
+        return 1
+
+    for path in tables:
+        # Metrics left by an earlier run would stand in for a table that fails this time.
+        metrics = os.path.join(output, bpy.path.display_name_from_filepath(path) + '.json')
+        if os.path.isfile(metrics):
+            os.remove(metrics)
+
+    start = time.perf_counter()
+    if args.jobs <= 1:
+        status = run_worker(tables, output, settings)
+    else:
+        status = run_workers(tables, output, settings, args.jobs, max(1, args.tables_per_worker), args.blender)
+    count = collect_metrics(tables, output)
+    print(f'{count} designs from {len(tables)} table(s) in {time.perf_counter() - start:.1f} s')
+    return status
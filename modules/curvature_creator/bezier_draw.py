@@ -1,7 +1,8 @@
-import math
+import numpy as np
 
 from mathutils import Vector
-from .bezier import Bezier
+from .core.comb import CombSettings, JointReport, SegmentComb, comb_samples, joint_report
+from .core.construction import xy2xz_array
 from .draw_3d import Draw3D
 
 
@@ -9,46 +10,62 @@ def xy2xz(value: list):
     return Vector((value[0], 0, value[1]))
 
 
-def bezier_draw(curve: Bezier, drawer: Draw3D, scale: float = 5, steps: int = 25, draw_circle=False):
-    coords = []
-    coords_comb = []
-    coords_comb_line = []
+def strip_to_lines(points: np.ndarray) -> np.ndarray:
+    """Turn a strip (m, d) into LINES pairs so strips of several segments go in a single draw."""
+    return np.stack((points[:-1], points[1:]), axis=1).reshape(-1, points.shape[-1])
 
-    for i in range(0, steps + 1):
-        t = i * (1 / steps)
-        p = xy2xz(curve.position(t))
-        coords.append(p)
 
-    curvature = 0
-    curvature_abs = 0
-    count = 1
-    kmax = 0
-    max_radius = 0
-    point_max = Vector((0, 0, 0))
+def curvature_colors(curvature: np.ndarray, limit: float) -> np.ndarray:
+    """RGBA per signed curvature, blue for negative through grey to red for positive, saturated at `limit`."""
+    value = np.clip(np.nan_to_num(curvature) / limit, -1, 1)[:, None] if limit > 0 else np.zeros((len(curvature), 1))
+    grey = np.array((.7, .7, .7, 1), dtype=np.float32)
+    red = np.array((.9, .15, .1, 1), dtype=np.float32)
+    blue = np.array((.15, .35, .95, 1), dtype=np.float32)
+    return (grey + np.where(value > 0, red - grey, grey - blue) * value).astype(np.float32)
 
-    for i in range(0, steps + 1):
-        t = i * (1 / steps)
-        c = curve.curvature(t)
-        p = xy2xz(curve.position(t))
-        n = xy2xz(curve.normal(t) * (c * -scale))
-        pn = p + n
 
-        coords_comb.append(pn)
-        coords_comb_line.append(p)
-        coords_comb_line.append(pn)
+def bezier_draw(segments: np.ndarray, drawer: Draw3D, settings: CombSettings, offsets: np.ndarray = None,
+                heatmap: bool = False, tolerance: float = np.inf) -> tuple[list[SegmentComb], JointReport]:
+    """Draw the spline and its comb, as three uniform color batches or one batch colored by curvature.
 
-        if math.fabs(c) > kmax:
-            kmax = math.fabs(c)
-            point_max = p - n
-            max_radius = c
+    Joints where the relative curvature jump exceeds `tolerance` are marked by a line closing the gap in the comb.
+    """
+    combs = comb_samples(segments, settings)
+    offsets = np.array((0, len(segments))) if offsets is None else offsets
+    report = joint_report(combs, offsets, tolerance)
 
-        curvature += c
-        curvature_abs += math.fabs(c)
-        count += 1
+    coords = [xy2xz_array(i.samples.position) for i in combs]
+    coords_comb = [xy2xz_array(i.comb) for i in combs]
+    coords_comb_line = np.stack((np.concatenate(coords), np.concatenate(coords_comb)), axis=1).reshape(-1, 3)
+    spline_lines = np.concatenate([strip_to_lines(i) for i in coords])
+    comb_lines = np.concatenate([strip_to_lines(i) for i in coords_comb])
+    breaks = None
+    if len(report.segment):
+        breaks = np.stack(([coords_comb[i][-1] for i in report.segment],
+                           [coords_comb[i + 1][0] for i in report.segment]), axis=1).reshape(-1, 3)
 
+    if heatmap:
+        drawer.hide('spline', 'comb', 'comb_teeth', 'g2_breaks')
+        curvature = [i.samples.curvature for i in combs]
+        limit = float(np.nanpercentile(np.abs(np.concatenate(curvature)), 98))
+        colors = [curvature_colors(i, limit) for i in curvature]
+        line_colors = np.concatenate([strip_to_lines(i) for i in colors])
+        parts = [spline_lines, comb_lines, coords_comb_line]
+        part_colors = [line_colors, line_colors, np.repeat(np.concatenate(colors), 2, axis=0)]
+        if breaks is not None:
+            parts.append(breaks)
+            part_colors.append(np.tile(np.array((1, 0, 1, 1), dtype=np.float32), (len(breaks), 1)))
+        drawer.draw_colored_lines(np.concatenate(parts), np.concatenate(part_colors), name='comb_heatmap')
+        return combs, report
+
+    drawer.hide('comb_heatmap')
     color = (.26171875, .546875, .828125)
-    drawer.draw_lines(coords, type='LINE_STRIP', color=(.82421875, .453125, .12109375))
-    drawer.draw_lines(coords_comb, type='LINE_STRIP', color=color)
-    drawer.draw_lines(coords_comb_line, color=(.7, .7, .7))
+    drawer.draw_lines(spline_lines, color=(.82421875, .453125, .12109375), name='spline')
+    drawer.draw_lines(comb_lines, color=color, name='comb')
+    drawer.draw_lines(coords_comb_line, color=(.7, .7, .7), name='comb_teeth')
+    if breaks is not None:
+        drawer.draw_lines(breaks, color=(1, 0, 1), name='g2_breaks')
+    else:
+        drawer.hide('g2_breaks')
 
-    return curvature, curvature_abs, count, point_max, max_radius
+    return combs, report
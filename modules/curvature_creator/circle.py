@@ -1,8 +1,11 @@
+import numpy as np
 from mathutils import Matrix
 
+from .circle_geometry import unit_circle
+
 
 def draw_circle(position, color, radius, *, segments=None, mat=Matrix.Identity(4)):
-    from math import sin, cos, pi, ceil, acos
+    from math import pi, ceil, acos
     import gpu
     from gpu.types import (
         GPUBatch,
@@ -24,8 +27,7 @@ def draw_circle(position, color, radius, *, segments=None, mat=Matrix.Identity(4
         gpu.matrix.load_matrix(gpu.matrix.get_model_view_matrix() @ mat)
         gpu.matrix.scale_uniform(radius)
 
-        mul = (1.0 / (segments - 1)) * (pi * 2)
-        verts = [(sin(i * mul), cos(i * mul)) for i in range(segments)]
+        verts = unit_circle(segments).astype(np.float32)
 
         fmt = GPUVertFormat()
         pos_id = fmt.attr_add(id="pos", comp_type='F32', len=2, fetch_mode='FLOAT')
@@ -0,0 +1,28 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=64)
+def unit_circle(segments: int, start: float = 0, end: float = math.pi * 2,
+                axes: tuple[int, int] = (0, 1), dims: int = 2) -> np.ndarray:
+    """Read-only (segments, dims) table with sin on the first axis and cos on the second.
+
+    `end` is the swept angle, matching the drawers: vertex i sits at start + i * end / (segments - 1).
+    """
+    if segments <= 1:
+        raise ValueError("Amount of segments must be greater than 1.")
+
+    angles = start + np.arange(segments) * (end / (segments - 1))
+    table = np.zeros((segments, dims))
+    table[:, axes[0]] = np.sin(angles)
+    table[:, axes[1]] = np.cos(angles)
+    table.flags.writeable = False
+    return table
+
+
+def circle_points(center, radius: float, segments: int = 24, start: float = 0, end: float = math.pi * 2,
+                  axes: tuple[int, int] = (0, 1)) -> np.ndarray:
+    center = np.asarray(center, dtype=float)
+    return center + radius * unit_circle(segments, float(start), float(end), axes, len(center))
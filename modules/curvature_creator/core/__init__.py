@@ -0,0 +1,12 @@
+"""Numerical core of the curvature tools.
+
+Only NumPy is required here, so it can be imported, profiled and benchmarked outside Blender.
+"""
+from .arc_length import ArcLengthTable, arc_length_table
+from .bezier import Bezier, BezierSamples, evaluate, lerp, segments_from_points
+from .cache import SegmentCache
+from .comb import (CombMetrics, CombSettings, JointReport, SegmentComb, comb_metrics, comb_samples, joint_report,
+                   merge_metrics, segment_cache, spline_metrics)
+from .construction import Construction, PruettCircle, construct, pruett_circle
+from .extrema import CurvatureExtremum, curvature_extrema, max_curvature, spline_max_curvature
+from .handles import AUTO_HANDLE_FACTOR, auto_handles
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .bezier import derivatives
+from .cache import SegmentCache
+
+GAUSS_NODES, GAUSS_WEIGHTS = np.polynomial.legendre.leggauss(8)
+# Newton steps only integrate inside one table interval, where four nodes are plenty.
+NEWTON_NODES, NEWTON_WEIGHTS = np.polynomial.legendre.leggauss(4)
+INTERVALS = 16
+
+arc_length_cache = SegmentCache()
+
+
+def gauss_length(segments: np.ndarray, lo: np.ndarray, hi: np.ndarray,
+                 nodes: np.ndarray = GAUSS_NODES, weights: np.ndarray = GAUSS_WEIGHTS) -> np.ndarray:
+    """Length of every segment between lo and hi (broadcast to (n, m)) with Gauss-Legendre quadrature."""
+    shape = np.broadcast_shapes(np.shape(lo), np.shape(hi), (1, 1))
+    if shape[0] != 1:
+        shape = np.broadcast_shapes(shape, (len(segments), 1))
+    lo, hi = np.broadcast_to(lo, shape), np.broadcast_to(hi, shape)
+    half = (hi - lo) / 2
+    t = (lo + half)[..., None] + half[..., None] * nodes
+    # Limits shared by every segment evaluate through the matrix form of `derivatives`.
+    t = t[0].reshape(-1) if shape[0] == 1 else t.reshape(len(t), -1)
+    speed = np.linalg.norm(derivatives(segments, t), axis=-1).reshape(len(segments), *half.shape[1:], len(nodes))
+    return np.sum(speed * weights, axis=-1) * half
+
+
+@dataclass
+class ArcLengthTable:
+    segments: np.ndarray
+    t: np.ndarray
+    s: np.ndarray
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self.s[:, -1]
+
+    @property
+    def length(self) -> float:
+        return float(self.lengths.sum())
+
+    def t_at(self, segment: np.ndarray, s: np.ndarray, iterations: int = 1) -> np.ndarray:
+        """Parameter of every (segment, arc length inside that segment) pair.
+
+        The table gives the interval and a linear first guess, Newton steps against the exact
+        Gauss-Legendre length refine it.
+        """
+        segment = np.asarray(segment)
+        s = np.clip(s, 0, self.lengths[segment])
+        rows = self.s[segment]
+        interval = np.clip(np.sum(rows[:, 1:-1] <= s[:, None], axis=1), 0, len(self.t) - 2)
+
+        lo_t, hi_t = self.t[interval], self.t[interval + 1]
+        lo_s, hi_s = rows[np.arange(len(rows)), interval], rows[np.arange(len(rows)), interval + 1]
+        span = np.where(hi_s > lo_s, hi_s - lo_s, 1)
+        t = lo_t + (s - lo_s) / span * (hi_t - lo_t)
+
+        curves = self.segments[segment]
+        for _ in range(iterations):
+            error = lo_s + gauss_length(curves, lo_t[:, None], t[:, None], NEWTON_NODES, NEWTON_WEIGHTS)[:, 0] - s
+            speed = np.linalg.norm(derivatives(curves, t[:, None])[:, 0], axis=-1)
+            t = np.clip(t - error / np.where(speed > 0, speed, 1), lo_t, hi_t)
+        return t
+
+
+def arc_length_table(segments: np.ndarray, cache: SegmentCache = arc_length_cache) -> ArcLengthTable:
+    """Cumulative arc length of every segment at INTERVALS + 1 evenly spaced t, cached per segment."""
+    t = np.linspace(0, 1, INTERVALS + 1)
+    keys = [segment.tobytes() for segment in segments]
+    rows = [cache.get(key) for key in keys]
+    missing = [index for index, row in enumerate(rows) if row is None]
+
+    if missing:
+        lengths = gauss_length(segments[missing], t[None, :-1], t[None, 1:])
+        cumulative = np.concatenate((np.zeros((len(missing), 1)), np.cumsum(lengths, axis=1)), axis=1)
+        for row, index in enumerate(missing):
+            rows[index] = cumulative[row]
+            cache.put(keys[index], rows[index])
+
+    return ArcLengthTable(segments=segments, t=t, s=np.array(rows).reshape(len(segments), INTERVALS + 1))
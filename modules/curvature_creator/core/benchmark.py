@@ -0,0 +1,171 @@
+"""Throughput baselines of the numerical core.
+
+Run from `modules/curvature_creator`, record a baseline and compare a later release against it:
+
+    python -m core.benchmark --output baseline.json
+    python -m core.benchmark --compare baseline.json
+
+The same cases run under pytest-benchmark in tests/test_benchmark.py, next to the correctness tests.
+"""
+import argparse
+import json
+import math
+import platform
+import tempfile
+import time
+from typing import Callable
+
+import numpy as np
+
+from . import arc_length
+from .bezier import Bezier, evaluate, segments_from_points
+from .cache import SegmentCache
+from .closest import SegmentIndex
+from .comb import CombSettings, comb_samples
+from .construction import construct, pruett_circle
+from .extrema import max_curvature
+from .fairing import fair
+from .stl import STL_DTYPE, write_binary
+from .tube import tube
+
+
+def example_segments(count: int) -> np.ndarray:
+    """Smooth wave-shaped spline in the size range the add-on works with (a few centimetres)."""
+    return segments_from_points(*example_points(count))
+
+
+def example_points(count: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    x = np.linspace(0, .05, count + 1)
+    z = .01 * np.sin(x * 400) + .02 * x
+    co = np.stack((x, z), axis=1)
+    tangent = np.gradient(co, axis=0)
+    return co, co - tangent / 3, co + tangent / 3
+
+
+def uncached_comb(segments: np.ndarray, settings: CombSettings) -> Callable:
+    def run():
+        arc_length.arc_length_cache.clear()
+        comb_samples(segments, settings, cache=SegmentCache())
+    return run
+
+
+def cases(spline_size: int) -> dict[str, tuple[Callable, int]]:
+    """Name -> (callable, items processed per call)."""
+    single = example_segments(1)
+    spline = example_segments(spline_size)
+    t = np.linspace(0, 1, 51)
+    bezier = Bezier(*single[0])
+
+    uniform = CombSettings(scale=5e-6, steps=50)
+    adaptive = CombSettings(scale=5e-6, mode='ADAPTIVE', tolerance=1e-6, min_samples=4, max_samples=200)
+    arc = CombSettings(scale=5e-6, steps=50, mode='ARC_LENGTH')
+
+    spline_3d = np.insert(spline, 1, 0, axis=2)
+    radius = np.full(spline_size + 1, .002)
+
+    index = SegmentIndex(spline)
+    queries = np.random.default_rng(0).uniform((-.005, -.02), (.055, .03), (100, 2))
+
+    def closest_query():
+        for point in queries:
+            index.query(point)
+
+    warm = SegmentCache()
+    comb_samples(spline, uniform, cache=warm)
+
+    params = np.random.default_rng(0).uniform((.01, -1.5, .001, -1.5, .001), (.05, 1.5, .05, 1.5, .05), (10000, 5))
+
+    def construction_pruett():
+        geometry = construct(*params.T)
+        pruett_circle(geometry.a, geometry.b, geometry.c, params[:, 3], .001)
+
+    # Both write cases rewrite the same temporary file, raw_write is the file write alone, for reference.
+    triangles = np.random.default_rng(0).random((500000, 3, 3)).astype(np.float32)
+    records = np.zeros(len(triangles), dtype=STL_DTYPE)
+    target = tempfile.TemporaryFile()
+
+    def stl_write():
+        target.seek(0)
+        write_binary(target, triangles)
+
+    def raw_write():
+        target.seek(0)
+        target.write(memoryview(records))
+
+    return {
+        'single_segment_scalar': (lambda: [(bezier.position(i), bezier.normal(i), bezier.curvature(i)) for i in t],
+                                  len(t)),
+        'single_segment_batch': (lambda: evaluate(single, t), len(t)),
+        'spline_uniform': (uncached_comb(spline, uniform), spline_size),
+        'spline_uniform_cached': (lambda: comb_samples(spline, uniform, cache=warm), spline_size),
+        'spline_adaptive': (uncached_comb(spline, adaptive), spline_size),
+        'spline_arc_length': (uncached_comb(spline, arc), spline_size),
+        'spline_extrema': (lambda: max_curvature(spline), spline_size),
+        'construction_pruett': (construction_pruett, len(params)),
+        'spline_fairing': (lambda: fair(*example_points(spline_size), iterations=50), spline_size),
+        'closest_query': (closest_query, len(queries)),
+        'tube_mesh': (lambda: tube(spline_3d, radius, 1e-5), spline_size),
+        'stl_write': (stl_write, len(triangles)),
+        'raw_write': (raw_write, len(triangles)),
+    }
+
+
+def measure(func: Callable, min_time: float, repeat: int) -> float:
+    """Best seconds per call over `repeat` rounds of at least `min_time` each."""
+    func()
+    best = math.inf
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+    return best
+
+
+def run(spline_size: int = 500, min_time: float = .2, repeat: int = 5) -> dict:
+    results = {}
+    for name, (func, items) in cases(spline_size).items():
+        seconds = measure(func, min_time, repeat)
+        results[name] = {'seconds': seconds, 'throughput': items / seconds}
+
+    return {
+        'numpy': np.__version__,
+        'python': platform.python_version(),
+        'spline_size': spline_size,
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='Write the results as a JSON baseline')
+    parser.add_argument('--compare', help='Baseline JSON to compare the results against')
+    parser.add_argument('--spline-size', type=int, default=500)
+    parser.add_argument('--min-time', type=float, default=.2)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    report = run(args.spline_size, args.min_time, args.repeat)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)['results']
+
+    for name, result in report['results'].items():
+        line = f'{name:<24}{result["seconds"] * 1000:>10.3f} ms{result["throughput"]:>14.0f} items/s'
+        if name in baseline:
+            line += f'{result["throughput"] / baseline[name]["throughput"]:>8.2f}x'
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+def normal(point: np.ndarray):
+    return np.array((-point[1], point[0]))
+
+
+def mag(point: np.ndarray):
+    return np.sqrt(np.sum(point ** 2))
+
+
+def normalise(point: np.ndarray):
+    return point * 1 / mag(point)
+
+
+def lerp(p1: np.ndarray, p2: np.ndarray, t: float):
+    return p1 * (1 - t) + p2 * t
+
+
+@dataclass
+class BezierSamples:
+    t: np.ndarray
+    position: np.ndarray
+    tangent: np.ndarray
+    normal: np.ndarray
+    curvature: np.ndarray
+
+
+def segments_from_points(co: np.ndarray, handle_left: np.ndarray, handle_right: np.ndarray) -> np.ndarray:
+    """Pack bezier points (n, d) into cubic segments (n - 1, 4, d)."""
+    return np.stack((co[:-1], handle_right[:-1], handle_left[1:], co[1:]), axis=1)
+
+
+def _split(segments: np.ndarray, t):
+    """Control points as (n, 1, d) and t as (n | 1, m, 1) ready for broadcasting."""
+    t = np.asarray(t, dtype=float)
+    if t.ndim < 2:
+        t = np.atleast_1d(t)[None]
+    p0, p1, p2, p3 = (segments[:, i, None, :] for i in range(4))
+    return p0, p1, p2, p3, t[..., None]
+
+
+def basis(t, derivative: int = 0) -> np.ndarray:
+    """(m, 4) weights of the control points in the position or a derivative at every t of a shared (m,) array."""
+    t = np.atleast_1d(np.asarray(t, dtype=float))[:, None]
+    mt = 1 - t
+    if derivative == 0:
+        return np.hstack((mt * mt * mt, 3 * mt * mt * t, 3 * mt * t * t, t * t * t))
+    if derivative == 1:
+        a, b, c = 3 * mt * mt, 6 * mt * t, 3 * t * t
+        return np.hstack((-a, a - b, b - c, c))
+    a, b = 6 * mt, 6 * t
+    return np.hstack((a, b - 2 * a, a - 2 * b, b))
+
+
+def positions(segments: np.ndarray, t) -> np.ndarray:
+    """Positions of every segment at every t, shape (n, m, d).
+
+    `t` is either shared by all segments (m,), evaluated as one basis matrix product, or per segment (n, m).
+    """
+    if np.ndim(t) < 2:
+        return basis(t) @ segments
+
+    p0, p1, p2, p3, t = _split(segments, t)
+    mt = 1 - t
+    return p0 * (mt * mt * mt) + p1 * (3 * mt * mt * t) + p2 * (3 * mt * t * t) + p3 * (t * t * t)
+
+
+def derivatives(segments: np.ndarray, t) -> np.ndarray:
+    if np.ndim(t) < 2:
+        return basis(t, 1) @ segments
+
+    p0, p1, p2, p3, t = _split(segments, t)
+    mt = 1 - t
+    return (p1 - p0) * (3 * mt * mt) + (p2 - p1) * (6 * mt * t) + (p3 - p2) * (3 * t * t)
+
+
+def second_derivatives(segments: np.ndarray, t) -> np.ndarray:
+    if np.ndim(t) < 2:
+        return basis(t, 2) @ segments
+
+    p0, p1, p2, p3, t = _split(segments, t)
+    return (p2 - 2 * p1 + p0) * (6 * (1 - t)) + (p3 - 2 * p2 + p1) * (6 * t)
+
+
+def signed_curvature(d1: np.ndarray, d2: np.ndarray) -> np.ndarray:
+    return (d1[..., 0] * d2[..., 1] - d1[..., 1] * d2[..., 0]) / (d1[..., 0] ** 2 + d1[..., 1] ** 2) ** (3 / 2)
+
+
+def evaluate(segments: np.ndarray, t) -> BezierSamples:
+    """Evaluate planar segments (n, 4, 2) at every t in a single vectorized pass."""
+    d1 = derivatives(segments, t)
+    d2 = second_derivatives(segments, t)
+    tangent = d1 / np.linalg.norm(d1, axis=-1, keepdims=True)
+
+    return BezierSamples(
+        t=np.broadcast_to(np.asarray(t, dtype=float), d1.shape[:-1]),
+        position=positions(segments, t),
+        tangent=tangent,
+        normal=np.stack((-tangent[..., 1], tangent[..., 0]), axis=-1),
+        curvature=signed_curvature(d1, d2),
+    )
+
+
+# Power basis coefficients (t^3, t^2, t, 1) of a cubic from its control points.
+POWER_BASIS = np.array(((-1, 3, -3, 1), (3, -6, 3, 0), (-3, 3, 0, 0), (1, 0, 0, 0)), dtype=float)
+
+
+def closest_t(segments: np.ndarray, point: np.ndarray, t: np.ndarray, iterations: int = 4) -> np.ndarray:
+    """Newton steps on (B(t) - point) . B'(t) = 0 from a start t per segment, kept inside [0, 1]."""
+    a, b, c, d = np.moveaxis(POWER_BASIS @ segments, 1, 0)
+    d = d - point
+    t = np.asarray(t, dtype=float)[:, None]
+    for _ in range(iterations):
+        offset = ((a * t + b) * t + c) * t + d
+        d1 = (3 * a * t + 2 * b) * t + c
+        d2 = 6 * a * t + 2 * b
+        slope = np.sum(d1 * d1 + offset * d2, axis=-1)
+        # Away from a minimum the slope can vanish or turn negative, step along the gradient instead.
+        step = np.sum(offset * d1, axis=-1) / np.where(slope > 0, slope, np.sum(d1 * d1, axis=-1) + 1e-300)
+        t = np.clip(t - step[:, None], 0, 1)
+    return t[:, 0]
+
+
+def _scalar(values: np.ndarray, t):
+    return values[0, 0] if np.ndim(t) == 0 else values[0]
+
+
+class Bezier:
+    p0: np.ndarray
+    p1: np.ndarray
+    p2: np.ndarray
+    p3: np.ndarray
+
+    def __init__(self, p0: np.ndarray, p1: np.ndarray, p2: np.ndarray, p3: np.ndarray):
+        self.p0 = p0
+        self.p1 = p1
+        self.p2 = p2
+        self.p3 = p3
+
+    @property
+    def segments(self) -> np.ndarray:
+        return np.stack((self.p0, self.p1, self.p2, self.p3))[None]
+
+    def _find_tangent(self, t: float):
+        return _scalar(derivatives(self.segments, t), t)
+
+    def _dd(self, t: float):
+        return _scalar(second_derivatives(self.segments, t), t)
+
+    def position(self, t: float):
+        return _scalar(positions(self.segments, t), t)
+
+    def tangent(self, t: float):
+        return normalise(self._find_tangent(t))
+
+    def normal(self, t: float):
+        return normalise(normal(self.tangent(t)))
+
+    def curvature(self, t: float) -> float:
+        return signed_curvature(self._find_tangent(t), self._dd(t))
+
+    def closest(self, point: np.ndarray, seeds: int = 16) -> float:
+        """Parameter of the point of the curve nearest to `point`, the best of `seeds` samples refined by Newton."""
+        t = np.linspace(0, 1, seeds)
+        start = t[np.argmin(np.linalg.norm(positions(self.segments, t)[0] - point, axis=-1))]
+        return float(closest_t(self.segments, np.asarray(point), np.array((start,)))[0])
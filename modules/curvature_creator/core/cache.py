@@ -0,0 +1,43 @@
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class SegmentCache:
+    """Bounded LRU of per-segment comb geometry with hit/miss counters."""
+    max_size: int
+    hits: int = 0
+    misses: int = 0
+
+    def __init__(self, max_size: int = 2048):
+        self.max_size = max_size
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key: Hashable):
+        value = self._items.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._items.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self._items.clear()
+        self.reset_stats()
+
+    def stats(self) -> str:
+        return f'{self.hits} hit / {self.misses} miss ({len(self)}/{self.max_size})'
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .arc_length import gauss_length
+from .bezier import closest_t, derivatives, positions, second_derivatives, signed_curvature
+
+# Children per node of the box hierarchy, three levels cover 512 segments.
+BRANCHING = 8
+# Samples per segment that pick the start of the Newton refinement.
+SEEDS = 9
+
+
+@dataclass
+class ClosestPoint:
+    segment: int
+    t: float
+    point: np.ndarray
+    distance: float
+
+
+def _box_distances(point: np.ndarray, low: np.ndarray, high: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Squared nearest and farthest distance from the point to every box."""
+    near = np.maximum(low - point, 0) + np.maximum(point - high, 0)
+    far = np.maximum(np.abs(point - low), np.abs(point - high))
+    return np.einsum('ij,ij->i', near, near), np.einsum('ij,ij->i', far, far)
+
+
+class SegmentIndex:
+    """Closest point queries on a spline of cubic segments (n, 4, d).
+
+    Every segment lies inside the box of its control points. Boxes of BRANCHING consecutive segments,
+    which are close to each other along a spline, merge into the next level up to a single root. A
+    query walks the levels keeping only nodes whose nearest box distance beats the best farthest box
+    distance seen, so only a handful of segments are sampled and refined with Newton steps.
+    """
+
+    def __init__(self, segments: np.ndarray):
+        self.segments = np.array(segments, dtype=np.float64)
+        low, high = self.segments.min(axis=1), self.segments.max(axis=1)
+        levels = [(low, high)]
+        while len(low) > 1:
+            pad = -len(low) % BRANCHING
+            low = np.concatenate((low, low[-1:].repeat(pad, axis=0))).reshape(-1, BRANCHING, low.shape[-1])
+            high = np.concatenate((high, high[-1:].repeat(pad, axis=0))).reshape(-1, BRANCHING, high.shape[-1])
+            low, high = low.min(axis=1), high.max(axis=1)
+            levels.append((low, high))
+        self.levels = levels[::-1]
+        self.seeds = np.linspace(0, 1, SEEDS)
+        self._seed_points = positions(self.segments, self.seeds)
+        self._starts = None
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def query(self, point: np.ndarray) -> ClosestPoint | None:
+        if not len(self.segments):
+            return None
+        point = np.asarray(point, dtype=np.float64)
+
+        nodes = np.zeros(1, dtype=int)
+        for depth, (low, high) in enumerate(self.levels):
+            if depth:
+                nodes = (nodes[:, None] * BRANCHING + np.arange(BRANCHING)).reshape(-1)
+                nodes = nodes[nodes < len(low)]
+            near, far = _box_distances(point, low[nodes], high[nodes])
+            nodes = nodes[near <= far.min()]
+
+        offset = self._seed_points[nodes] - point
+        seed_distance = np.einsum('ijk,ijk->ij', offset, offset)
+        best_seed = seed_distance.argmin(axis=1)
+        bound = seed_distance[np.arange(len(nodes)), best_seed]
+        # A segment whose box is farther than the best seed cannot hold the closest point.
+        near, _ = _box_distances(point, *(level[nodes] for level in self.levels[-1]))
+        keep = near <= bound.min()
+        nodes, best_seed = nodes[keep], best_seed[keep]
+
+        t = closest_t(self.segments[nodes], point, self.seeds[best_seed])
+        closest = positions(self.segments[nodes], t[:, None])[:, 0]
+        distance = np.linalg.norm(closest - point, axis=-1)
+        best = int(distance.argmin())
+        return ClosestPoint(segment=int(nodes[best]), t=float(t[best]), point=closest[best],
+                            distance=float(distance[best]))
+
+    def curvature(self, segment: int, t: float) -> float:
+        """Signed curvature of planar segments at t."""
+        curve = self.segments[segment:segment + 1]
+        return float(signed_curvature(derivatives(curve, t)[0, 0], second_derivatives(curve, t)[0, 0]))
+
+    def arc_length(self, segment: int, t: float) -> tuple[float, float]:
+        """Arc length from the start of the spline to t of the segment, and the total length."""
+        if self._starts is None:
+            lengths = gauss_length(self.segments, np.zeros((1, 1)), np.ones((1, 1)))[:, 0]
+            self._starts = np.concatenate(((0,), np.cumsum(lengths)))
+        partial = gauss_length(self.segments[segment:segment + 1], np.zeros((1, 1)), np.full((1, 1), t))
+        return float(self._starts[segment] + partial[0, 0]), float(self._starts[-1])
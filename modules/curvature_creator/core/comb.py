@@ -0,0 +1,136 @@
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .arc_length import arc_length_table
+from .bezier import BezierSamples
+from .cache import SegmentCache
+from .extrema import CurvatureExtremum, spline_max_curvature
+from .sampling import adaptive_samples, arc_length_samples, comb_points, uniform_samples
+
+segment_cache = SegmentCache()
+
+
+@dataclass(frozen=True)
+class CombSettings:
+    scale: float = 5
+    steps: int = 25
+    mode: str = 'UNIFORM'
+    tolerance: float = 1e-6
+    min_samples: int = 4
+    max_samples: int = 200
+
+    def used(self) -> 'CombSettings':
+        """These settings with the fields the mode ignores reset to their defaults, the part a cache key needs."""
+        if self.mode == 'ADAPTIVE':
+            return replace(self, steps=CombSettings.steps)
+        return replace(self, tolerance=CombSettings.tolerance, min_samples=CombSettings.min_samples,
+                       max_samples=CombSettings.max_samples)
+
+
+@dataclass
+class SegmentComb:
+    samples: BezierSamples
+    comb: np.ndarray
+
+
+@dataclass
+class CombMetrics:
+    length: float
+    curvature: float
+    curvature_abs: float
+    samples: int
+    extremum: CurvatureExtremum
+
+
+@dataclass
+class JointReport:
+    """Joints where the relative curvature jump exceeds the tolerance, G2 breaks.
+
+    Joint j sits between segment `segment[j]` and the one after it, `jump` is |k1 - k0| / max(|k0|, |k1|).
+    """
+    segment: np.ndarray
+    jump: np.ndarray
+
+    @property
+    def max_jump(self) -> float:
+        return float(self.jump.max()) if len(self.jump) else 0
+
+
+def sample_segments(segments: np.ndarray, settings: CombSettings) -> list[BezierSamples]:
+    if settings.mode == 'ADAPTIVE':
+        return adaptive_samples(segments, settings.scale, settings.tolerance,
+                                settings.min_samples, settings.max_samples)
+    if settings.mode == 'ARC_LENGTH':
+        return arc_length_samples(segments, settings.steps)
+    return uniform_samples(segments, settings.steps)
+
+
+def comb_samples(segments: np.ndarray, settings: CombSettings,
+                 cache: SegmentCache = segment_cache) -> list[SegmentComb]:
+    """Samples and comb points of every segment, recomputing only segments missing from the cache."""
+    # Sliders of the other modes do not change the samples, so they must not invalidate the cache either.
+    used = settings.used()
+    keys = [(segment.tobytes(), used) for segment in segments]
+    values = [cache.get(key) for key in keys]
+    missing = [index for index, value in enumerate(values) if value is None]
+
+    if missing:
+        for index, samples in zip(missing, sample_segments(segments[missing], settings)):
+            values[index] = SegmentComb(samples, comb_points(samples, settings.scale))
+            cache.put(keys[index], values[index])
+
+    return values
+
+
+def joint_report(combs: list[SegmentComb], offsets: np.ndarray, tolerance: float) -> JointReport:
+    """Relative curvature jumps over `tolerance` at the joints inside every spline, from the samples at t = 0 and 1.
+
+    Relative to the larger |k| of the two sides, so the same tolerance fits millimetre and metre sized curves.
+    """
+    start = np.array([i.samples.curvature[0] for i in combs])
+    end = np.array([i.samples.curvature[-1] for i in combs])
+    scale = np.maximum(np.abs(start[1:]), np.abs(end[:-1]))
+    jump = np.divide(np.abs(start[1:] - end[:-1]), scale, out=np.zeros_like(scale), where=scale > 0)
+
+    inside = np.ones(len(jump), dtype=bool)
+    inside[np.asarray(offsets[1:-1], dtype=int) - 1] = False
+    segment = np.flatnonzero(inside & (jump > tolerance))
+    return JointReport(segment=segment, jump=jump[segment])
+
+
+def parameter_mean(values: np.ndarray, t: np.ndarray) -> float:
+    """Mean over t in [0, 1] with the trapezoid rule, so uneven sampling does not bias it."""
+    return float(np.sum((values[1:] + values[:-1]) * np.diff(t)) / 2)
+
+
+def spline_metrics(segments: np.ndarray, combs: list[SegmentComb], offsets: np.ndarray) -> list[CombMetrics]:
+    """Metrics of every spline packed into `segments`, spline i spanning offsets[i]:offsets[i + 1]."""
+    lengths = arc_length_table(segments).lengths
+    curvature = np.array([parameter_mean(i.samples.curvature, i.samples.t) for i in combs])
+    curvature_abs = np.array([parameter_mean(np.abs(i.samples.curvature), i.samples.t) for i in combs])
+    samples = np.array([len(i.samples.t) for i in combs])
+    extrema = spline_max_curvature(segments, offsets)
+
+    return [CombMetrics(
+        length=float(lengths[start:stop].sum()),
+        curvature=float(curvature[start:stop].mean()),
+        curvature_abs=float(curvature_abs[start:stop].mean()),
+        samples=int(samples[start:stop].sum()),
+        extremum=extremum,
+    ) for start, stop, extremum in zip(offsets, offsets[1:], extrema)]
+
+
+def merge_metrics(metrics: list[CombMetrics], segment_counts: np.ndarray) -> CombMetrics:
+    """Combine per-spline metrics, weighting the means by segment count."""
+    return CombMetrics(
+        length=sum(i.length for i in metrics),
+        curvature=float(np.average([i.curvature for i in metrics], weights=segment_counts)),
+        curvature_abs=float(np.average([i.curvature_abs for i in metrics], weights=segment_counts)),
+        samples=sum(i.samples for i in metrics),
+        extremum=max(metrics, key=lambda i: abs(i.extremum.curvature)).extremum,
+    )
+
+
+def comb_metrics(segments: np.ndarray, combs: list[SegmentComb]) -> CombMetrics:
+    return spline_metrics(segments, combs, np.array((0, len(segments))))[0]
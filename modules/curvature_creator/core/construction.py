@@ -0,0 +1,94 @@
+import math
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+
+# Every function works in the XZ drawing plane as (x, z) pairs and broadcasts over arrays of parameters,
+# so the viewport and the sweeps share one implementation.
+
+
+@dataclass
+class Construction:
+    a: np.ndarray
+    b: np.ndarray
+    c: np.ndarray
+    edge_angle: np.ndarray
+    extension: np.ndarray
+
+    @property
+    def points(self) -> np.ndarray:
+        """A, B and C stacked as (..., 3, 2)."""
+        return np.stack((self.a, self.b, self.c), axis=-2)
+
+
+@dataclass
+class PruettCircle:
+    center: np.ndarray
+    radius: np.ndarray
+    active: np.ndarray
+
+
+def angle_to_vector(angle, dist) -> np.ndarray:
+    return np.stack((np.sin(angle) * dist, np.cos(angle) * dist), axis=-1)
+
+
+def angle_calc(start: np.ndarray, target: np.ndarray) -> np.ndarray:
+    return np.arctan2(target[..., 0] - start[..., 0], target[..., 1] - start[..., 1])
+
+
+def xy2xz_array(values: np.ndarray) -> np.ndarray:
+    """(x, z) pairs as float32 3D points on the XZ plane."""
+    result = np.zeros(values.shape[:-1] + (3,), dtype=np.float32)
+    result[..., 0] = values[..., 0]
+    result[..., 2] = values[..., 1]
+    return result
+
+
+def construct(height, b_angle, b_distance, c_angle, c_distance) -> Construction:
+    height, b_angle, b_distance, c_angle, c_distance = np.broadcast_arrays(
+        *(np.asarray(i, dtype=float) for i in (height, b_angle, b_distance, c_angle, c_distance)))
+
+    a = np.stack((np.zeros_like(height), height), axis=-1)
+    b = a + angle_to_vector(b_angle, -b_distance)
+    edge_angle = angle_calc(a, b)
+
+    right = b[..., 0] > 0
+    angle = np.where(right, c_angle, math.pi - c_angle) + edge_angle
+    c = b + angle_to_vector(angle, np.where(right, c_distance, -c_distance))
+
+    return Construction(a=a, b=b, c=c, edge_angle=edge_angle, extension=angle_to_vector(edge_angle, c_distance))
+
+
+def pruett_circle(a: np.ndarray, b: np.ndarray, c: np.ndarray, c_angle, distance) -> PruettCircle:
+    """Circle of the given `distance` from B tangent to both AB and BC, the way `_draw_purrte` draws it."""
+    c_angle = np.asarray(c_angle, dtype=float)
+    distance = np.asarray(distance, dtype=float)
+
+    oa = angle_to_vector(angle_calc(b, c), 1)
+    ob = angle_to_vector(angle_calc(a, b), 1)
+    middle = ((b - ob * distance[..., None]) + (b + oa * distance[..., None])) / 2
+    oo = angle_to_vector(angle_calc(b, middle), 1)
+
+    beta = math.pi - c_angle
+    o = distance / np.cos(beta / 2)
+    center = b + oo * np.where(c_angle < 0, -o, o)[..., None]
+
+    return PruettCircle(center=center, radius=o * np.sin(beta / 2), active=np.abs(np.degrees(c_angle)) > 1)
+
+
+def read_table(path: str) -> Construction:
+    """Constructions of a CSV table of height mm, B angle deg, B distance mm, C angle deg, C distance mm per row.
+
+    The first line is skipped as a header. Raises OSError or ValueError when the table cannot be used.
+    """
+    with warnings.catch_warnings():
+        # A table without rows is raised below instead of warned about.
+        warnings.simplefilter('ignore', UserWarning)
+        table = np.loadtxt(path, delimiter=',', skiprows=1, ndmin=2)
+    if not len(table):
+        raise ValueError('the table has no rows')
+    if table.shape[1] != 5:
+        raise ValueError(f'expected rows of 5 columns, got {table.shape[1]}')
+    height, b_angle, b_distance, c_angle, c_distance = table.T
+    return construct(height / 1000, np.radians(b_angle), b_distance / 1000, np.radians(c_angle), c_distance / 1000)
@@ -0,0 +1,141 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from .bezier import evaluate
+
+
+@dataclass
+class CurvatureExtremum:
+    segment: int
+    t: float
+    position: np.ndarray
+    normal: np.ndarray
+    curvature: float
+
+    @property
+    def radius(self) -> float:
+        """Signed radius of the osculating circle, infinite on a straight line."""
+        return 1 / self.curvature if self.curvature else math.inf
+
+    @property
+    def center(self) -> np.ndarray:
+        return self.position + self.normal * self.radius
+
+
+def power_basis(segments: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Coefficients (ascending, shape (n, k, 2)) of the first three derivatives of every segment."""
+    p0, p1, p2, p3 = (segments[:, i] for i in range(4))
+    a = -p0 + 3 * p1 - 3 * p2 + p3
+    b = 3 * p0 - 6 * p1 + 3 * p2
+    c = 3 * (p1 - p0)
+    return np.stack((c, 2 * b, 3 * a), axis=1), np.stack((2 * b, 6 * a), axis=1), (6 * a)[:, None]
+
+
+def polymul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    result = np.zeros((len(a), a.shape[1] + b.shape[1] - 1))
+    for i in range(a.shape[1]):
+        result[:, i:i + b.shape[1]] += a[:, i, None] * b
+    return result
+
+
+def polyval(coefficients: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Horner evaluation of (n, k) ascending coefficients at t of shape (n, m)."""
+    result = np.zeros(t.shape)
+    for i in range(coefficients.shape[1] - 1, -1, -1):
+        result = result * t + coefficients[:, i, None]
+    return result
+
+
+def curvature_derivative_numerator(segments: np.ndarray) -> np.ndarray:
+    """Degree 6 polynomial sharing its roots with dk/dt: (B' x B''') |B'|^2 - 3 (B' x B'') (B' . B'')."""
+    d1, d2, d3 = power_basis(segments)
+
+    def cross(u, v):
+        return polymul(u[..., 0], v[..., 1]) - polymul(u[..., 1], v[..., 0])
+
+    def dot(u, v):
+        return polymul(u[..., 0], v[..., 0]) + polymul(u[..., 1], v[..., 1])
+
+    first = polymul(cross(d1, d3), dot(d1, d1))
+    second = 3 * polymul(cross(d1, d2), dot(d1, d2))
+    first = np.pad(first, ((0, 0), (0, second.shape[1] - first.shape[1])))
+    return first - second
+
+
+def extrema_roots(segments: np.ndarray, grid: int = 64, iterations: int = 52) -> tuple[np.ndarray, np.ndarray]:
+    """Segment index and t in (0, 1) of every curvature extremum, ordered by segment then t.
+
+    Sign changes of dk/dt are bracketed on a grid and refined by bisection for all segments at once.
+    """
+    coefficients = curvature_derivative_numerator(segments)
+    t = np.broadcast_to(np.linspace(0, 1, grid + 1), (len(segments), grid + 1))
+    values = polyval(coefficients, t)
+    # dk/dt of a straight segment is 0 up to rounding, none of its zeros or sign changes is an extremum.
+    size = np.abs(segments - segments[:, :1]).max(axis=(1, 2))
+    values[np.abs(coefficients).max(axis=1) <= 1e-9 * size ** 4] = 1
+
+    rows, columns = np.nonzero(np.sign(values[:, :-1]) * np.sign(values[:, 1:]) < 0)
+    lo = t[rows, columns].copy()
+    hi = t[rows, columns + 1].copy()
+    lo_value = values[rows, columns]
+
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        mid_value = polyval(coefficients[rows], mid[:, None])[:, 0]
+        left = np.sign(mid_value) == np.sign(lo_value)
+        lo = np.where(left, mid, lo)
+        lo_value = np.where(left, mid_value, lo_value)
+        hi = np.where(left, hi, mid)
+
+    roots = (lo + hi) / 2
+    exact_rows, exact_columns = np.nonzero(values[:, 1:-1] == 0)
+    rows = np.concatenate((rows, exact_rows))
+    roots = np.concatenate((roots, t[exact_rows, exact_columns + 1]))
+
+    order = np.lexsort((roots, rows))
+    return rows[order], roots[order]
+
+
+def curvature_extrema(segments: np.ndarray, grid: int = 64, iterations: int = 52) -> list[np.ndarray]:
+    """Parameters t in (0, 1) of every curvature extremum, per segment."""
+    rows, roots = extrema_roots(segments, grid, iterations)
+    return np.split(roots, np.searchsorted(rows, np.arange(1, len(segments))))
+
+
+def segment_max_curvature(segments: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """t and signed curvature of the largest |k| of every segment, end points included."""
+    rows, roots = extrema_roots(segments)
+    segment = np.arange(len(segments))
+    index = np.concatenate((segment, rows, segment))
+    t = np.concatenate((np.zeros(len(segments)), roots, np.ones(len(segments))))
+
+    curvature = evaluate(segments[index], t[:, None]).curvature[:, 0]
+    curvature = np.nan_to_num(curvature, nan=0, posinf=0, neginf=0)
+
+    # Stable on the candidates of a segment, ties keep the earliest t like a scan from 0 to 1 would.
+    order = np.lexsort((-np.abs(curvature), index))
+    best = order[np.searchsorted(index[order], segment)]
+    return t[best], curvature[best]
+
+
+def spline_max_curvature(segments: np.ndarray, offsets: np.ndarray) -> list[CurvatureExtremum]:
+    """Largest |k| of every spline packed into `segments`, spline i spanning offsets[i]:offsets[i + 1]."""
+    t, curvature = segment_max_curvature(segments)
+    best = np.array([start + np.argmax(np.abs(curvature[start:stop])) for start, stop in zip(offsets, offsets[1:])],
+                    dtype=int)
+    samples = evaluate(segments[best], t[best, None])
+
+    return [CurvatureExtremum(
+        segment=int(segment),
+        t=float(t[segment]),
+        position=samples.position[row, 0],
+        normal=samples.normal[row, 0],
+        curvature=float(curvature[segment]),
+    ) for row, segment in enumerate(best)]
+
+
+def max_curvature(segments: np.ndarray) -> CurvatureExtremum:
+    """Point of the whole spline with the largest |k|, i.e. its minimum radius."""
+    return spline_max_curvature(segments, np.array((0, len(segments))))[0]
@@ -0,0 +1,145 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .bezier import basis, segments_from_points
+
+
+@dataclass
+class FairingResult:
+    co: np.ndarray
+    handle_left: np.ndarray
+    handle_right: np.ndarray
+    energy_before: float
+    energy_after: float
+    iterations: int
+
+
+def curvature_energy(segments: np.ndarray, samples: int = 24) -> tuple[float, np.ndarray]:
+    """Curvature variation energy and its gradient with respect to every control point, (n, 4, 2).
+
+    The energy is the integral of (dk/dt)^2 over every segment from `samples` values of k, plus the
+    squared curvature jump at every joint taken over the same step, so G2 breaks are penalized too.
+    """
+    t = np.linspace(0, 1, samples)
+    step = 1 / (samples - 1)
+    b1, b2 = basis(t, 1), basis(t, 2)
+    d1, d2 = b1 @ segments, b2 @ segments
+
+    speed2 = d1[..., 0] * d1[..., 0] + d1[..., 1] * d1[..., 1]
+    speed3 = speed2 * np.sqrt(speed2)
+    cross = d1[..., 0] * d2[..., 1] - d1[..., 1] * d2[..., 0]
+    k = cross / speed3
+
+    inner = np.diff(k, axis=1)
+    joints = k[1:, 0] - k[:-1, -1]
+    energy = float((np.sum(inner * inner) + np.sum(joints * joints)) / step)
+
+    dk = np.zeros_like(k)
+    dk[:, 1:] += 2 * inner / step
+    dk[:, :-1] -= 2 * inner / step
+    dk[1:, 0] += 2 * joints / step
+    dk[:-1, -1] -= 2 * joints / step
+
+    # k = cross(d1, d2) / |d1|^3, so dk/dd2 = perp(d1) / |d1|^3 and dk/dd1 = (d2y, -d2x) / |d1|^3 - 3 k d1 / |d1|^2.
+    weight = (dk / speed3)[..., None]
+    grad_d1 = weight * np.stack((d2[..., 1], -d2[..., 0]), axis=-1) - (3 * dk * k / speed2)[..., None] * d1
+    grad_d2 = weight * np.stack((-d1[..., 1], d1[..., 0]), axis=-1)
+    return energy, b1.T @ grad_d1 + b2.T @ grad_d2
+
+
+def point_gradients(gradient: np.ndarray, count: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Scatter segment control point gradients back onto co, handle_left and handle_right of `count` points."""
+    co = np.zeros((count, 2))
+    handle_left = np.zeros((count, 2))
+    handle_right = np.zeros((count, 2))
+    co[:-1] += gradient[:, 0]
+    handle_right[:-1] += gradient[:, 1]
+    handle_left[1:] += gradient[:, 2]
+    co[1:] += gradient[:, 3]
+    return co, handle_left, handle_right
+
+
+def fair(co: np.ndarray, handle_left: np.ndarray, handle_right: np.ndarray, keep_co: bool = True,
+         keep_g1: bool = True, samples: int = 24, iterations: int = 200, tolerance: float = 1e-6) -> FairingResult:
+    """Move the handles of a planar spline (n, 2) to minimize `curvature_energy` by gradient descent.
+
+    With `keep_g1` the variables are the handle lengths along the current tangents, so the handles stay
+    aligned, otherwise both handles move freely. Unless `keep_co`, interior points move as well, the end
+    points never do. Steps are chosen by backtracking until the energy decreases sufficiently.
+    """
+    co, handle_left, handle_right = (np.array(i, dtype=float) for i in (co, handle_left, handle_right))
+    count = len(co)
+    if count < 2:
+        return FairingResult(co, handle_left, handle_right, 0, 0, 0)
+    free = slice(1, -1) if not keep_co else slice(0, 0)
+
+    tangent = handle_right - handle_left
+    tangent /= np.maximum(np.linalg.norm(tangent, axis=1, keepdims=True), 1e-300)
+    left_length = np.linalg.norm(co - handle_left, axis=1)
+    right_length = np.linalg.norm(handle_right - co, axis=1)
+    min_length = 1e-3 * max(float(np.mean(np.concatenate((left_length, right_length)))), 1e-12)
+
+    def unpack(x: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        points = co.copy()
+        size = count - 2 if not keep_co else 0
+        points[free] = x[:size * 2].reshape(-1, 2)
+        rest = x[size * 2:]
+        if keep_g1:
+            return points, points - tangent * rest[:count, None], points + tangent * rest[count:, None]
+        return points, rest[:count * 2].reshape(-1, 2), rest[count * 2:].reshape(-1, 2)
+
+    def pack(points: np.ndarray, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        if keep_g1:
+            left = -np.sum(left * tangent, axis=1)
+            right = np.sum(right * tangent, axis=1)
+        return np.concatenate((points[free].reshape(-1), left.reshape(-1), right.reshape(-1)))
+
+    def evaluate(x: np.ndarray) -> tuple[float, np.ndarray]:
+        points, left, right = unpack(x)
+        energy, gradient = curvature_energy(segments_from_points(points, left, right), samples)
+        grad_co, grad_left, grad_right = point_gradients(gradient, count)
+        if keep_g1:
+            # The handles ride along with their point.
+            grad_co = grad_co + grad_left + grad_right
+        return energy, pack(grad_co, grad_left, grad_right)
+
+    def project(x: np.ndarray) -> np.ndarray:
+        if keep_g1:
+            size = (count - 2) * 2 if not keep_co else 0
+            x[size:] = np.maximum(x[size:], min_length)
+        return x
+
+    if keep_g1:
+        x = pack(co, -left_length[:, None] * tangent, right_length[:, None] * tangent)
+    else:
+        x = pack(co, handle_left, handle_right)
+
+    energy, gradient = evaluate(x)
+    before = energy
+    scale = float(np.mean(np.linalg.norm(np.diff(co, axis=0), axis=1)))
+    step = .01 * scale / max(float(np.abs(gradient).max()), 1e-300)
+
+    iteration = 0
+    for iteration in range(1, iterations + 1):
+        norm2 = float(gradient @ gradient)
+        if norm2 == 0:
+            break
+        for _ in range(40):
+            candidate = project(x - step * gradient)
+            candidate_energy, candidate_gradient = evaluate(candidate)
+            if candidate_energy <= energy - 1e-4 * step * norm2:
+                break
+            step /= 2
+        else:
+            break
+
+        improvement = energy - candidate_energy
+        x, energy, gradient = candidate, candidate_energy, candidate_gradient
+        step *= 2
+        if improvement <= tolerance * max(energy, 1e-300):
+            break
+
+    points, left, right = unpack(x)
+    return FairingResult(co=points, handle_left=left, handle_right=right, energy_before=before,
+                         energy_after=energy, iterations=iteration)
@@ -0,0 +1,28 @@
+import numpy as np
+
+# Blender's automatic handle length factor, the same as in BKE_nurb_handle_calc.
+AUTO_HANDLE_FACTOR = 2.5614
+
+
+def auto_handles(co: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Left and right handles Blender computes for AUTO points of open splines, co is (..., n, d) with n >= 2.
+
+    The end points use a neighbour mirrored through them, like Blender does for non-cyclic splines.
+    """
+    co = np.asarray(co, dtype=np.float64)
+    previous = np.concatenate((2 * co[..., :1, :] - co[..., 1:2, :], co[..., :-1, :]), axis=-2)
+    following = np.concatenate((co[..., 1:, :], 2 * co[..., -1:, :] - co[..., -2:-1, :]), axis=-2)
+
+    dvec_a = co - previous
+    dvec_b = following - co
+    len_a = np.linalg.norm(dvec_a, axis=-1, keepdims=True)
+    len_b = np.linalg.norm(dvec_b, axis=-1, keepdims=True)
+    len_a = np.where(len_a == 0, 1, len_a)
+    len_b = np.where(len_b == 0, 1, len_b)
+
+    tangent = dvec_a / len_a + dvec_b / len_b
+    length = np.linalg.norm(tangent, axis=-1, keepdims=True) * AUTO_HANDLE_FACTOR
+    # Blender leaves the handles untouched when the direction vanishes, they collapse onto the point here.
+    length = np.where(length == 0, np.inf, length)
+
+    return co - tangent * (len_a / length), co + tangent * (len_b / length)
@@ -0,0 +1,105 @@
+import numpy as np
+
+from .arc_length import arc_length_table
+from .bezier import BezierSamples, evaluate
+
+FIELDS = ('t', 'position', 'tangent', 'normal', 'curvature')
+
+
+def evaluate_flat(segments: np.ndarray, index: np.ndarray, t: np.ndarray) -> BezierSamples:
+    """Evaluate one t per entry of `index`, returning flat (k,) samples."""
+    samples = evaluate(segments[index], t[:, None])
+    return BezierSamples(*(getattr(samples, field)[:, 0] for field in FIELDS))
+
+
+def take(samples: BezierSamples, index) -> BezierSamples:
+    return BezierSamples(*(getattr(samples, field)[index] for field in FIELDS))
+
+
+def concatenate(samples: list[BezierSamples]) -> BezierSamples:
+    return BezierSamples(*(np.concatenate([getattr(i, field) for i in samples]) for field in FIELDS))
+
+
+def comb_points(samples: BezierSamples, scale: float) -> np.ndarray:
+    return samples.position - samples.normal * (samples.curvature[..., None] * scale)
+
+
+def chord_error(point: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Distance of every point from the chord between start and end.
+
+    Not from the chord midpoint, the t midpoint of a straight but unevenly parametrized curve is off that.
+    """
+    chord = end - start
+    length = np.einsum('ij,ij->i', chord, chord)
+    u = np.divide(np.einsum('ij,ij->i', point - start, chord), length, out=np.zeros_like(length), where=length > 0)
+    return np.linalg.norm(point - start - chord * np.clip(u, 0, 1)[:, None], axis=-1)
+
+
+def uniform_samples(segments: np.ndarray, steps: int) -> list[BezierSamples]:
+    samples = evaluate(segments, np.linspace(0, 1, steps + 1))
+    return [take(samples, index) for index in range(len(segments))]
+
+
+def arc_length_samples(segments: np.ndarray, steps: int) -> list[BezierSamples]:
+    """steps + 1 samples per segment, evenly spaced along the curve instead of along t."""
+    table = arc_length_table(segments)
+    index = np.repeat(np.arange(len(segments)), steps + 1)
+    s = (table.lengths[:, None] * np.linspace(0, 1, steps + 1)).ravel()
+    t = table.t_at(index, s).reshape(len(segments), steps + 1)
+    t[:, 0], t[:, -1] = 0, 1
+    samples = evaluate(segments, t)
+    return [take(samples, row) for row in range(len(segments))]
+
+
+def adaptive_samples(segments: np.ndarray, scale: float, tolerance: float,
+                     min_samples: int = 4, max_samples: int = 200, max_depth: int = 24) -> list[BezierSamples]:
+    """Sample each segment densely only where the curve or its comb bends.
+
+    An interval is split at its midpoint while either the chord error of the curve or the
+    error of the linearly interpolated comb exceeds `tolerance`, until a segment reaches
+    `max_samples`. All segments are refined together, one vectorized evaluation per level.
+    """
+    n = len(segments)
+    min_samples = max(min_samples, 2)
+    max_samples = max(max_samples, min_samples)
+
+    index = np.repeat(np.arange(n), min_samples)
+    samples = evaluate_flat(segments, index, np.tile(np.linspace(0, 1, min_samples), n))
+    comb = comb_points(samples, scale)
+    counts = np.full(n, min_samples)
+
+    lo = np.arange(len(index)).reshape(n, min_samples)[:, :-1].ravel()
+    hi = lo + 1
+
+    for _ in range(max_depth):
+        if not len(lo):
+            break
+
+        mid_index = index[lo]
+        mid = evaluate_flat(segments, mid_index, (samples.t[lo] + samples.t[hi]) / 2)
+        mid_comb = comb_points(mid, scale)
+        error = np.maximum(chord_error(mid.position, samples.position[lo], samples.position[hi]),
+                           chord_error(mid_comb, comb[lo], comb[hi]))
+
+        refine = error > tolerance
+        # Spend the remaining per-segment budget on the intervals with the largest error first.
+        order = np.lexsort((-error, mid_index))
+        rank = np.empty_like(order)
+        starts = np.searchsorted(mid_index[order], mid_index[order])
+        rank[order] = np.arange(len(order)) - starts
+        refine &= rank < (max_samples - counts)[mid_index]
+
+        if not refine.any():
+            break
+
+        new = np.arange(len(index), len(index) + int(refine.sum()))
+        index = np.concatenate((index, mid_index[refine]))
+        samples = concatenate([samples, take(mid, refine)])
+        comb = np.concatenate((comb, mid_comb[refine]))
+        counts += np.bincount(mid_index[refine], minlength=n)
+
+        lo, hi = np.concatenate((lo[refine], new)), np.concatenate((new, hi[refine]))
+
+    order = np.lexsort((samples.t, index))
+    bounds = np.cumsum(counts)[:-1]
+    return [take(samples, rows) for rows in np.split(order, bounds)]
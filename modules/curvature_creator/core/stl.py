@@ -0,0 +1,152 @@
+import os
+from typing import BinaryIO
+
+import numpy as np
+
+HEADER_SIZE = 80
+# One binary STL facet: normal, three vertices and the attribute byte count, 50 bytes without padding.
+STL_DTYPE = np.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
+# Facets per chunk, small enough that the normal scratch rows stay in cache between passes.
+CHUNK_SIZE = 1 << 14
+
+
+def facet_normals(triangles: np.ndarray, out: np.ndarray = None, scratch: np.ndarray = None) -> np.ndarray:
+    """Unit normals (n, 3) of (n, 3, 3) triangles by their winding, zero for degenerate ones.
+
+    Every step writes into `scratch` (10, >= n) and `out`, so a caller that reuses them allocates nothing.
+    `out` may be strided, like the normal field of STL records, it is only written once at the end.
+    """
+    count = len(triangles)
+    if scratch is None:
+        scratch = np.empty((10, count), dtype=np.result_type(triangles.dtype, np.float32))
+    if out is None:
+        out = np.empty((count, 3), dtype=scratch.dtype)
+    edges, normal, length = scratch[:6, :count], scratch[6:9, :count], scratch[9, :count]
+
+    # One contiguous row per edge component, read straight from the (n, 3, 3) layout without a transpose.
+    for i in range(3):
+        np.subtract(triangles[:, 1, i], triangles[:, 0, i], out=edges[i])
+        np.subtract(triangles[:, 2, i], triangles[:, 0, i], out=edges[3 + i])
+    for i, j, k in ((0, 1, 2), (1, 2, 0), (2, 0, 1)):
+        np.multiply(edges[j], edges[3 + k], out=normal[i])
+        np.multiply(edges[k], edges[3 + j], out=length)
+        np.subtract(normal[i], length, out=normal[i])
+
+    square = edges[0]
+    np.multiply(normal[0], normal[0], out=length)
+    for i in (1, 2):
+        np.multiply(normal[i], normal[i], out=square)
+        np.add(length, square, out=length)
+    np.sqrt(length, out=length)
+    length[length == 0] = np.inf
+    for i in range(3):
+        np.divide(normal[i], length, out=out[:, i])
+    return out
+
+
+def write_binary(file: BinaryIO, triangles: np.ndarray | list[np.ndarray], header: bytes = b'',
+                 chunk_size: int = CHUNK_SIZE) -> int:
+    """Stream (n, 3, 3) triangles, or a list of them written one after another, as binary STL records.
+
+    Records and the normal scratch rows are allocated once for a chunk and reused, so memory stays flat
+    however large the mesh is, and the normals are written straight into the records. Returns the number
+    of facets written.
+    """
+    parts = [triangles] if isinstance(triangles, np.ndarray) else triangles
+    count = sum(len(i) for i in parts)
+
+    file.write(header[:HEADER_SIZE].ljust(HEADER_SIZE, b'\0'))
+    file.write(np.uint32(count).tobytes())
+
+    records = np.zeros(min(chunk_size, count), dtype=STL_DTYPE)
+    scratch = np.empty((10, len(records)), dtype=np.float32)
+    for part in parts:
+        for start in range(0, len(part), chunk_size):
+            chunk = part[start:start + chunk_size]
+            view = records[:len(chunk)]
+            view['vertices'] = chunk
+            facet_normals(chunk, view['normal'], scratch)
+            file.write(memoryview(view))
+    return count
+
+
+def read_binary(path: str) -> np.ndarray | None:
+    """Memory-mapped (n, 3, 3) vertices of a binary STL, None when the size does not match a binary file."""
+    size = os.path.getsize(path)
+    if size < HEADER_SIZE + 4:
+        return None
+    with open(path, 'rb') as file:
+        file.seek(HEADER_SIZE)
+        count = int(np.frombuffer(file.read(4), dtype='<u4')[0])
+    if size != HEADER_SIZE + 4 + count * STL_DTYPE.itemsize:
+        return None
+    if not count:
+        return np.empty((0, 3, 3), dtype=np.float32)
+    return np.memmap(path, dtype=STL_DTYPE, mode='r', offset=HEADER_SIZE + 4, shape=(count,))['vertices']
+
+
+def read_ascii(path: str) -> np.ndarray:
+    """(n, 3, 3) vertices of an ASCII STL, taken from the three numbers after every `vertex` keyword."""
+    with open(path, 'rb') as file:
+        words = np.array(file.read().split())
+    index = np.flatnonzero(words == b'vertex')
+    return words[index[:, None] + np.arange(1, 4)].astype(np.float32).reshape(-1, 3, 3)
+
+
+def read(path: str) -> np.ndarray:
+    triangles = read_binary(path)
+    return read_ascii(path) if triangles is None else triangles
+
+
+def weld(triangles: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Unique (m, 3) vertices and (n, 3) faces indexing them, merging bit-identical corners.
+
+    Corners are grouped by a 64-bit hash of their coordinates, an exact comparison afterwards falls back
+    to sorting the full coordinates if two different corners ever share a hash.
+    """
+    # Adding zero turns -0.0 into 0.0 so both weld together.
+    points = np.ascontiguousarray(triangles, dtype=np.float32).reshape(-1, 3) + np.float32(0)
+    bits = points.view(np.uint32)
+    wide = bits.astype(np.uint64)
+    keys = ((wide[:, 0] << np.uint64(32)) | wide[:, 1]) ^ (wide[:, 2] * np.uint64(0x9E3779B97F4A7C15))
+
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    if not np.array_equal(bits[first][inverse.reshape(-1)], bits):
+        _, first, inverse = np.unique(bits.view(np.dtype((np.void, 12))).reshape(-1), return_index=True,
+                                      return_inverse=True)
+    return points[first], inverse.reshape(-1, 3).astype(np.int32)
+
+
+def cluster(vertices: np.ndarray, faces: np.ndarray, resolution: int) -> tuple[np.ndarray, np.ndarray]:
+    """Vertex clustering decimation on a grid of `resolution` cells along the longest side of the bounds.
+
+    Every cell collapses to the mean of its vertices, faces that collapse or repeat are dropped.
+    """
+    if not len(vertices):
+        return vertices, faces
+    low = vertices.min(axis=0)
+    size = float((vertices.max(axis=0) - low).max()) / resolution
+    if size <= 0:
+        return vertices, faces
+
+    cells = np.minimum(((vertices - low) / size).astype(np.int64), resolution)
+    keys = (cells[:, 0] * (resolution + 1) + cells[:, 1]) * (resolution + 1) + cells[:, 2]
+    _, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    counts = np.bincount(inverse)
+    merged = np.stack([np.bincount(inverse, weights=vertices[:, i]) for i in range(3)], axis=1) / counts[:, None]
+
+    faces = inverse[faces]
+    faces = faces[(faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])]
+    _, first = np.unique(np.sort(faces, axis=1), axis=0, return_index=True)
+    return merged.astype(np.float32), faces[np.sort(first)].astype(np.int32)
+
+
+def load(path: str, scale: float = 1, resolution: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Welded and scaled (vertices, faces) of an STL file, clustered when `resolution` is set."""
+    vertices, faces = weld(read(path))
+    vertices *= np.float32(scale)
+    if resolution:
+        vertices, faces = cluster(vertices, faces, resolution)
+    return vertices, faces
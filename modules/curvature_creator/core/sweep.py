@@ -0,0 +1,244 @@
+"""Parameter sweeps of the construction, evaluated in vectorized chunks across a process pool.
+
+Every sample builds A, B and C like the overlay does, fits the auto-handle spline through them and
+records its comb metrics and the Pruett circle. Run from `modules/curvature_creator`, ranges are
+`low:high:count` in mm and degrees, a single number keeps the parameter fixed:
+
+    python -m core.sweep --b-angle=-60:60:121 --c-angle=-60:60:121 --output sweep
+    python -m core.sweep --random 1000000 --b-distance 5:40 --c-distance 5:40 --output sweep
+
+The output directory holds one raw little-endian file per column and `schema.json` describing them,
+`read_columns` maps them back as arrays.
+"""
+import argparse
+import json
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from .arc_length import INTERVALS, gauss_length
+from .bezier import derivatives, second_derivatives, signed_curvature
+from .construction import construct, pruett_circle
+from .extrema import segment_max_curvature
+from .handles import auto_handles
+
+PARAMETERS = ('height', 'b_angle', 'b_distance', 'c_angle', 'c_distance', 'pruett_radius')
+# Scene units of every parameter and the factor from the CLI units (mm, degrees) to them.
+UNITS = {
+    'height': ('m', .001),
+    'b_angle': ('rad', math.pi / 180),
+    'b_distance': ('m', .001),
+    'c_angle': ('rad', math.pi / 180),
+    'c_distance': ('m', .001),
+    'pruett_radius': ('m', .001),
+}
+DEFAULTS = {'height': 30, 'b_angle': 0, 'b_distance': 20, 'c_angle': 0, 'c_distance': 20, 'pruett_radius': 1}
+COLUMNS = {
+    **{name: ('<f8', UNITS[name][0]) for name in PARAMETERS},
+    'a_x': ('<f8', 'm'), 'a_z': ('<f8', 'm'),
+    'b_x': ('<f8', 'm'), 'b_z': ('<f8', 'm'),
+    'c_x': ('<f8', 'm'), 'c_z': ('<f8', 'm'),
+    'length': ('<f8', 'm'),
+    'curvature': ('<f8', '1/m'),
+    'curvature_abs': ('<f8', '1/m'),
+    'max_curvature': ('<f8', '1/m'),
+    'min_radius': ('<f8', 'm'),
+    'pruett_circle_radius': ('<f8', 'm'),
+    'pruett_active': ('|u1', ''),
+}
+
+
+@dataclass(frozen=True)
+class SweepSpace:
+    """(low, high, count) per parameter in scene units, a full grid or `samples` uniform random draws."""
+    ranges: tuple[tuple[float, float, int], ...]
+    samples: int = 0
+    seed: int = 0
+    chunk_size: int = 4096
+
+    @property
+    def size(self) -> int:
+        return self.samples or math.prod(i[2] for i in self.ranges)
+
+    @property
+    def chunks(self) -> int:
+        return -(-self.size // self.chunk_size)
+
+    def chunk(self, index: int) -> np.ndarray:
+        """(m, len(PARAMETERS)) parameters of chunk `index`, generated without materializing the whole space."""
+        start = index * self.chunk_size
+        stop = min(start + self.chunk_size, self.size)
+        low, high, count = (np.array(i) for i in zip(*self.ranges))
+
+        if self.samples:
+            rng = np.random.default_rng((self.seed, index))
+            return rng.uniform(low, high, (stop - start, len(self.ranges)))
+
+        grid = np.unravel_index(np.arange(start, stop), count)
+        return np.stack([np.linspace(*limits)[i] for limits, i in zip(self.ranges, grid)], axis=1)
+
+
+def evaluate_parameters(parameters: np.ndarray, steps: int = 50) -> dict[str, np.ndarray]:
+    """Columns of COLUMNS for every row of `parameters`, all rows evaluated together."""
+    height, b_angle, b_distance, c_angle, c_distance, pruett_radius = parameters.T
+    geometry = construct(height, b_angle, b_distance, c_angle, c_distance)
+    co = geometry.points
+    handle_left, handle_right = auto_handles(co)
+    segments = np.stack((co[:, :-1], handle_right[:, :-1], handle_left[:, 1:], co[:, 1:]), axis=2).reshape(-1, 4, 2)
+    splines = len(parameters)
+
+    t = np.linspace(0, 1, steps + 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        curvature = signed_curvature(derivatives(segments, t), second_derivatives(segments, t))
+    curvature = np.nan_to_num(curvature, nan=0, posinf=0, neginf=0)
+    t = np.linspace(0, 1, INTERVALS + 1)
+    length = gauss_length(segments, t[None, :-1], t[None, 1:]).sum(axis=1).reshape(splines, -1).sum(axis=1)
+    mean = ((curvature[:, 1:] + curvature[:, :-1]).sum(axis=1) / (2 * steps)).reshape(splines, -1).mean(axis=1)
+    mean_abs = ((np.abs(curvature[:, 1:]) + np.abs(curvature[:, :-1])).sum(axis=1) / (2 * steps)).reshape(
+        splines, -1).mean(axis=1)
+
+    _, segment_curvature = segment_max_curvature(segments)
+    segment_curvature = segment_curvature.reshape(splines, -1)
+    max_curvature = np.take_along_axis(segment_curvature, np.abs(segment_curvature).argmax(axis=1)[:, None], 1)[:, 0]
+
+    circle = pruett_circle(geometry.a, geometry.b, geometry.c, c_angle, pruett_radius)
+
+    with np.errstate(divide='ignore'):
+        min_radius = np.abs(1 / max_curvature)
+    return {
+        **dict(zip(PARAMETERS, parameters.T)),
+        'a_x': co[:, 0, 0], 'a_z': co[:, 0, 1],
+        'b_x': co[:, 1, 0], 'b_z': co[:, 1, 1],
+        'c_x': co[:, 2, 0], 'c_z': co[:, 2, 1],
+        'length': length,
+        'curvature': mean,
+        'curvature_abs': mean_abs,
+        'max_curvature': max_curvature,
+        'min_radius': min_radius,
+        'pruett_circle_radius': circle.radius,
+        'pruett_active': circle.active,
+    }
+
+
+def run_chunk(space: SweepSpace, index: int, steps: int) -> dict[str, np.ndarray]:
+    return evaluate_parameters(space.chunk(index), steps)
+
+
+class ColumnWriter:
+    """Appends chunks of columns to one raw file per column, `close` writes the schema."""
+
+    def __init__(self, directory: str, metadata: dict = None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.metadata = metadata or {}
+        self.rows = 0
+        self._files = {name: open(os.path.join(directory, f'{name}.bin'), 'wb') for name in COLUMNS}
+
+    def write(self, columns: dict[str, np.ndarray]):
+        for name, (dtype, _) in COLUMNS.items():
+            np.ascontiguousarray(columns[name], dtype=dtype).tofile(self._files[name])
+        self.rows += len(columns['length'])
+
+    def close(self):
+        for file in self._files.values():
+            file.close()
+        schema = {
+            'rows': self.rows,
+            'columns': [{'name': name, 'file': f'{name}.bin', 'dtype': dtype, 'unit': unit}
+                        for name, (dtype, unit) in COLUMNS.items()],
+            **self.metadata,
+        }
+        with open(os.path.join(self.directory, 'schema.json'), 'w') as file:
+            json.dump(schema, file, indent=2)
+
+
+def read_columns(directory: str) -> dict[str, np.ndarray]:
+    """Memory-mapped columns of a sweep written by ColumnWriter."""
+    with open(os.path.join(directory, 'schema.json')) as file:
+        schema = json.load(file)
+    return {i['name']: np.memmap(os.path.join(directory, i['file']), dtype=i['dtype'], mode='r',
+                                 shape=(schema['rows'],)) for i in schema['columns']}
+
+
+def run_sweep(space: SweepSpace, directory: str, workers: int = None, steps: int = 50, progress=None) -> int:
+    """Evaluate every chunk of `space` and stream the results, in order, to `directory`. Returns the row count.
+
+    `workers=0` evaluates in this process, otherwise at most twice as many chunks as workers are in flight
+    so memory stays bounded however large the sweep is.
+    """
+    metadata = {'ranges': dict(zip(PARAMETERS, space.ranges)), 'samples': space.samples, 'seed': space.seed,
+                'steps': steps}
+    writer = ColumnWriter(directory, metadata)
+    try:
+        if workers == 0:
+            for index in range(space.chunks):
+                writer.write(run_chunk(space, index, steps))
+                if progress:
+                    progress(index + 1, space.chunks)
+            return writer.rows
+
+        with ProcessPoolExecutor(workers) as executor:
+            _stream(executor, space, steps, writer, 2 * (workers or os.cpu_count()), progress)
+        return writer.rows
+    finally:
+        writer.close()
+
+
+def _stream(executor: Executor, space: SweepSpace, steps: int, writer: ColumnWriter, window: int, progress):
+    pending = deque()
+    chunks = iter(range(space.chunks))
+    for index in chunks:
+        pending.append(executor.submit(run_chunk, space, index, steps))
+        if len(pending) >= window:
+            break
+
+    done = 0
+    while pending:
+        writer.write(pending.popleft().result())
+        done += 1
+        if progress:
+            progress(done, space.chunks)
+        index = next(chunks, None)
+        if index is not None:
+            pending.append(executor.submit(run_chunk, space, index, steps))
+
+
+def parse_range(name: str, text: str) -> tuple[float, float, int]:
+    """`low:high:count` or a fixed `value`, from CLI units to scene units. `low:high` samples 2 values."""
+    scale = UNITS[name][1]
+    parts = [float(i) for i in text.split(':')]
+    if len(parts) == 1:
+        return parts[0] * scale, parts[0] * scale, 1
+    count = int(parts[2]) if len(parts) > 2 else 2
+    return parts[0] * scale, parts[1] * scale, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    for name in PARAMETERS:
+        parser.add_argument(f'--{name.replace("_", "-")}', default=str(DEFAULTS[name]),
+                            help=f'low:high:count or a fixed value, default {DEFAULTS[name]}')
+    parser.add_argument('--random', type=int, default=0, help='Draw this many uniform samples instead of the grid')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--steps', type=int, default=50, help='Curvature samples per segment, like Comb Steps')
+    parser.add_argument('--chunk-size', type=int, default=4096)
+    parser.add_argument('--workers', type=int, default=None, help='Processes, 0 to run in this process')
+    parser.add_argument('--output', required=True, help='Directory for the columns and schema.json')
+    args = parser.parse_args()
+
+    space = SweepSpace(ranges=tuple(parse_range(name, getattr(args, name)) for name in PARAMETERS),
+                       samples=args.random, seed=args.seed, chunk_size=args.chunk_size)
+    start = time.perf_counter()
+    rows = run_sweep(space, args.output, args.workers, args.steps,
+                     progress=lambda done, total: print(f'\r{done}/{total} chunks', end='', flush=True))
+    elapsed = time.perf_counter() - start
+    print(f'\n{rows} samples in {elapsed:.2f} s ({rows / elapsed:.0f}/s) written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .bezier import basis
+
+# Curvature and radius samples per segment used to place the rings.
+DENSE_STEPS = 32
+# Rings never turn more than this between each other, however loose the tolerance is.
+MAX_RING_ANGLE = np.pi / 4
+
+
+@dataclass
+class TubeMesh:
+    """Quads around the tube and one n-gon cap at every open end, all indexing `vertices`."""
+    vertices: np.ndarray
+    quads: np.ndarray
+    caps: np.ndarray
+
+    @property
+    def sides(self) -> int:
+        return self.caps.shape[1]
+
+    def polygons(self) -> tuple[np.ndarray, np.ndarray]:
+        """Vertex index of every loop and loop_start of every polygon, the layout of a Blender mesh."""
+        loops = np.concatenate((self.quads.reshape(-1), self.caps.reshape(-1)))
+        sizes = np.concatenate((np.full(len(self.quads), 4), np.full(len(self.caps), self.sides)))
+        return loops.astype(np.int32), (np.cumsum(sizes) - sizes).astype(np.int32)
+
+    def triangles(self) -> np.ndarray:
+        """(n, 3, 3) triangles with the same winding, quads split in two and caps as fans."""
+        quads = self.quads
+        faces = [quads[:, (0, 1, 2)], quads[:, (0, 2, 3)]]
+        for cap in self.caps:
+            faces.append(np.stack((np.full(self.sides - 2, cap[0]), cap[1:-1], cap[2:]), axis=1))
+        return self.vertices[np.concatenate(faces)]
+
+
+def ring_sides(radius: float, tolerance: float, min_sides: int = 6, max_sides: int = 64) -> int:
+    """Sides of a polygon within `tolerance` of a circle of `radius`, r (1 - cos(pi / n)) <= tolerance."""
+    if radius <= tolerance:
+        return min_sides
+    return int(np.clip(np.ceil(np.pi / np.arccos(1 - tolerance / radius)), min_sides, max_sides))
+
+
+def interpolate_radius(radius: np.ndarray, segment: np.ndarray, t: np.ndarray, ease: bool = True) -> np.ndarray:
+    """Radius at local `t` of `segment` between the point radii, eased or linear."""
+    if ease:
+        t = t * t * (3 - 2 * t)
+    return radius[segment] * (1 - t) + radius[segment + 1] * t
+
+
+def ring_parameters(segments: np.ndarray, radius: np.ndarray, tolerance: float,
+                    ease: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """Segment index and local t of every ring, the closing ring at t = 1 of the last segment with a length included.
+
+    The tolerance bounds the chord error of the outer surface, (1 / k + r)(1 - cos(a / 2)) for rings `a`
+    apart on a bend of curvature k, and the error of the radius between two rings, so straight runs of
+    constant radius get a single span and tight bends get as many rings as they need.
+    """
+    count = len(segments)
+    t = np.linspace(0, 1, DENSE_STEPS + 1)
+    d1, d2 = basis(t, 1) @ segments, basis(t, 2) @ segments
+    speed = np.linalg.norm(d1, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        curvature = np.nan_to_num(np.linalg.norm(np.cross(d1, d2), axis=-1) / speed ** 3)
+    # A handle on its point stops the curve, the curvature from the rounding left of its speed is no bend.
+    curvature[speed <= 1e-9 * speed.max(axis=1, keepdims=True)] = 0
+
+    dense_segment = np.repeat(np.arange(count), len(t)).reshape(count, -1)
+    r = interpolate_radius(radius, dense_segment, t[None], ease)
+    sagitta = np.clip(tolerance * curvature / (1 + r * curvature), 0, 2)
+    angle = np.minimum(2 * np.arccos(1 - sagitta), MAX_RING_ANGLE)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        density = np.nan_to_num(curvature * speed / angle)
+
+    # Linear rings between radii r0 and r1 miss the eased profile by at most |r''| dt^2 / 8.
+    change = np.abs(radius[1:] - radius[:-1])[:, None]
+    bend = 6 * np.abs(1 - 2 * t[None]) * change if ease else np.zeros_like(density)
+    density = np.maximum(density, np.sqrt(bend / (8 * tolerance)))
+
+    cumulative = np.concatenate((np.zeros((count, 1)), np.cumsum((density[:, 1:] + density[:, :-1]) / 2, axis=1)),
+                                axis=1) / DENSE_STEPS
+    total = cumulative[:, -1]
+    spans = np.maximum(np.ceil(total - 1e-9).astype(int), 1)
+    # Segments collapsed to a point get no rings, they would only stack faces of no area on each other.
+    moving = speed.max(axis=1) > 1e-9 * np.abs(segments - segments[:1, :1]).max()
+    if moving.any():
+        spans[~moving] = 0
+    last = np.flatnonzero(spans)[-1]
+
+    # Each segment's cumulative density is normalized and shifted by its index, which makes one monotonic
+    # table for the whole spline, a little uniform share keeps it strictly increasing on straight runs.
+    table = .999 * cumulative / np.where(total > 0, total, 1)[:, None] + .001 * t[None]
+    table += np.arange(count)[:, None]
+    segment = np.repeat(np.arange(count), spans)
+    levels = segment + (np.arange(len(segment)) - np.repeat(np.cumsum(spans) - spans, spans)) / spans[segment]
+    local = np.interp(levels, table.reshape(-1), (np.arange(count)[:, None] + t[None]).reshape(-1)) - segment
+
+    return np.append(segment, last), np.append(local, 1)
+
+
+def rotation_minimizing_frames(positions: np.ndarray, tangents: np.ndarray, cyclic: bool = False) -> np.ndarray:
+    """Unit normals along the curve by the double reflection method, (m, 3).
+
+    Each frame is reflected onto the next sample through the bisecting plane of the chord, then through
+    the plane that aligns the reflected tangent with the actual one, which keeps the twist minimal. Both
+    reflections only depend on the samples, so every step is a known rotation and the frames are their
+    running products, computed by prefix doubling instead of a Python loop. For cyclic curves the angle
+    left over between the last and the first frame is spread along the curve.
+    """
+    first = tangents[0]
+    normal = np.cross(first, np.eye(3)[np.argmin(np.abs(first))])
+
+    v1 = np.diff(positions, axis=0)
+    c1 = np.einsum('ij,ij->i', v1, v1)
+    a1 = np.divide(2, c1, out=np.zeros_like(c1), where=c1 > 0)[:, None]
+    reflected = tangents[:-1] - a1 * np.einsum('ij,ij->i', v1, tangents[:-1])[:, None] * v1
+    v2 = tangents[1:] - reflected
+    c2 = np.einsum('ij,ij->i', v2, v2)
+    a2 = np.divide(2, c2, out=np.zeros_like(c2), where=c2 > 0)[:, None]
+
+    eye = np.eye(3)
+    h1 = eye - a1[..., None] * v1[:, :, None] * v1[:, None, :]
+    h2 = eye - a2[..., None] * v2[:, :, None] * v2[:, None, :]
+    steps = h2 @ h1
+    shift = 1
+    while shift < len(steps):
+        steps[shift:] = steps[shift:] @ steps[:-shift]
+        shift *= 2
+
+    normals = np.vstack((normal, steps @ normal))
+    # Orthogonalize against the tangent so rounding never skews a frame.
+    normals -= np.einsum('ij,ij->i', normals, tangents)[:, None] * tangents
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+
+    if cyclic and len(positions) > 1:
+        binormal = np.cross(tangents[0], normals[0])
+        twist = np.arctan2(normals[-1] @ binormal, normals[-1] @ normals[0])
+        distance = np.concatenate(((0,), np.cumsum(np.linalg.norm(v1, axis=1))))
+        angle = -twist * distance / distance[-1]
+        binormals = np.cross(tangents, normals)
+        normals = normals * np.cos(angle)[:, None] + binormals * np.sin(angle)[:, None]
+    return normals
+
+
+def tube(segments: np.ndarray, radius: np.ndarray, tolerance: float, cyclic: bool = False, ease: bool = True,
+         min_sides: int = 6, max_sides: int = 64) -> TubeMesh:
+    """Watertight tube swept along cubic segments (n, 4, 3) with a radius per bezier point (n + 1,).
+
+    For `cyclic` splines the last segment closes the loop, `radius` then has n values and the ends join
+    instead of being capped.
+    """
+    segments = np.asarray(segments, dtype=np.float64)
+    radius = np.asarray(radius, dtype=np.float64)
+    if cyclic:
+        radius = np.append(radius, radius[:1])
+    sides = ring_sides(float(radius.max()), tolerance, min_sides, max_sides)
+
+    segment, t = ring_parameters(segments, radius, tolerance, ease)
+    if cyclic:
+        segment, t = segment[:-1], t[:-1]
+    weights = basis(t)
+    positions = np.einsum('rk,rkd->rd', weights, segments[segment])
+    tangents = np.einsum('rk,rkd->rd', basis(t, 1), segments[segment])
+    # Where a handle sits on its point the curve stops, it leaves along the second derivative.
+    size = np.abs(segments[segment] - segments[segment, :1]).max(axis=(1, 2))
+    stopped = np.linalg.norm(tangents, axis=1) <= 1e-9 * size
+    if stopped.any():
+        second = np.einsum('rk,rkd->rd', basis(t[stopped], 2), segments[segment[stopped]])
+        tangents[stopped] = second * np.where(t[stopped] < .5, 1, -1)[:, None]
+    length = np.linalg.norm(tangents, axis=1, keepdims=True)
+    tangents /= np.where(length > 0, length, 1)
+
+    closed = np.vstack((positions, positions[:1])) if cyclic else positions
+    closed_tangents = np.vstack((tangents, tangents[:1])) if cyclic else tangents
+    normals = rotation_minimizing_frames(closed, closed_tangents, cyclic)[:len(positions)]
+    binormals = np.cross(tangents, normals)
+
+    angle = np.linspace(0, 2 * np.pi, sides, endpoint=False)
+    r = interpolate_radius(radius, segment, t, ease)[:, None, None]
+    vertices = positions[:, None] + r * (np.cos(angle)[:, None] * normals[:, None] +
+                                         np.sin(angle)[:, None] * binormals[:, None])
+
+    rings = len(positions)
+    ring = np.arange(rings if cyclic else rings - 1)[:, None] * sides
+    following = (ring + sides) % (rings * sides)
+    side = np.arange(sides)
+    next_side = (side + 1) % sides
+    # Around the tangent the sides run counterclockwise, so this order puts every normal outwards.
+    quads = np.stack((ring + side, ring + next_side, following + next_side, following + side), axis=-1)
+
+    caps = np.empty((0, sides), dtype=np.int32) if cyclic else np.stack((side[::-1], (rings - 1) * sides + side))
+    return TubeMesh(vertices=vertices.reshape(-1, 3).astype(np.float32), quads=quads.reshape(-1, 4).astype(np.int32),
+                    caps=caps.astype(np.int32))
@@ -0,0 +1,36 @@
+import sys
+
+import bpy
+
+
+def clear_trees():
+    """Drop the cached target trees, nothing to do while the analysis has not been loaded."""
+    analysis = sys.modules.get(f'{__package__}.deviation_analysis')
+    if analysis is not None:
+        analysis.tree_cache.clear()
+
+
+class ZENU_OT_measure_deviation(bpy.types.Operator):
+    """Report the largest and RMS distance of the active spline from the deviation target"""
+    bl_label = 'Measure Deviation'
+    bl_idname = 'zenu.measure_deviation'
+
+    @classmethod
+    def poll(cls, context: bpy.types.Context):
+        return context.scene.zenu_deviation_target is not None
+
+    def execute(self, context: bpy.types.Context):
+        from .deviation_analysis import active_deviation
+
+        deviation = active_deviation(context)
+        if deviation is None:
+            self.report({'WARNING'}, 'Make a bezier curve active to measure it')
+            return {'CANCELLED'}
+        self.report({'INFO'}, f'Max {deviation.max * 1000:.3f} mm, RMS {deviation.rms * 1000:.3f} mm '
+                              f'over {len(deviation.distance)} samples')
+        return {'FINISHED'}
+
+
+classes = (
+    ZENU_OT_measure_deviation,
+)
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+
+import bpy
+import numpy as np
+from mathutils.bvhtree import BVHTree
+
+from .core.bezier import positions
+from .spline_io import SplineBuffer
+
+
+@dataclass
+class Deviation:
+    points: np.ndarray
+    distance: np.ndarray
+    max: float
+    rms: float
+
+
+class TreeCache:
+    """World space BVH tree of every target object, rebuilt only when its mesh or transform changes."""
+
+    def __init__(self):
+        self._trees: dict[str, tuple[tuple, BVHTree]] = {}
+        self.builds = 0
+
+    def get(self, obj: bpy.types.Object, depsgraph: bpy.types.Depsgraph) -> BVHTree:
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.data
+        key = (obj.data.as_pointer(), len(mesh.vertices), len(mesh.polygons), tuple(map(tuple, obj.matrix_world)))
+        cached = self._trees.get(obj.name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        mesh.calc_loop_triangles()
+        triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('vertices', triangles)
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+        mesh.vertices.foreach_get('co', co)
+        matrix = np.array(obj.matrix_world)
+        co = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+
+        tree = BVHTree.FromPolygons(co.tolist(), triangles.reshape(-1, 3).tolist(), all_triangles=True)
+        self._trees[obj.name] = (key, tree)
+        self.builds += 1
+        return tree
+
+    def clear(self):
+        self._trees.clear()
+
+
+tree_cache = TreeCache()
+
+
+def spline_deviation(obj: bpy.types.Object, spline: bpy.types.Spline, tree: BVHTree, steps: int) -> Deviation:
+    """Distance from `steps` world space samples per segment of the spline to the nearest surface of the tree.
+
+    The RMS weights every sample by the curve length around it, so dense parts of the spline do not dominate.
+    """
+    buffer = SplineBuffer()
+    buffer.read(spline, np.array(obj.matrix_world))
+    handle_left, co, handle_right = (buffer.points[:, i] for i in range(3))
+    segments = np.stack((co[:-1], handle_right[:-1], handle_left[1:], co[1:]), axis=1)
+    points = positions(segments, np.linspace(0, 1, steps + 1)[:-1]).reshape(-1, 3)
+    points = np.vstack((points, co[-1:]))
+
+    find_nearest = tree.find_nearest
+    distance = np.array([find_nearest(i)[3] for i in points.tolist()], dtype=np.float64)
+
+    chords = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    weights = np.concatenate(((0,), chords)) + np.concatenate((chords, (0,)))
+    total = weights.sum()
+    rms = float(np.sqrt(np.sum(weights * distance * distance) / total)) if total else float(distance[0])
+    return Deviation(points=points, distance=distance, max=float(distance.max()), rms=rms)
+
+
+def deviation_colors(distance: np.ndarray, limit: float) -> np.ndarray:
+    """RGBA per distance, green on the surface through yellow to red at `limit` and beyond."""
+    value = np.clip(distance / limit, 0, 1)[:, None] if limit > 0 else np.ones((len(distance), 1))
+    green = np.array((.1, .85, .2, 1), dtype=np.float32)
+    yellow = np.array((.95, .85, .1, 1), dtype=np.float32)
+    red = np.array((.95, .15, .1, 1), dtype=np.float32)
+    low = green + (yellow - green) * np.minimum(value * 2, 1)
+    return np.where(value > .5, yellow + (red - yellow) * (value * 2 - 1), low).astype(np.float32)
+
+
+def active_deviation(context: bpy.types.Context) -> Deviation | None:
+    """Deviation of the active spline from the scene's target, None when either is missing."""
+    scene = context.scene
+    obj, target = context.object, scene.zenu_deviation_target
+    if target is None or obj is None or not isinstance(obj.data, bpy.types.Curve):
+        return None
+    spline = obj.data.splines.active
+    if spline is None or spline.type != 'BEZIER' or len(spline.bezier_points) < 2:
+        return None
+    tree = tree_cache.get(target, context.evaluated_depsgraph_get())
+    return spline_deviation(obj, spline, tree, scene.zenu_deviation_steps)
@@ -4,40 +4,58 @@ from typing import Any
 import blf
 import bpy
 import gpu
+import numpy as np
 from gpu_extras.batch import batch_for_shader
 from mathutils import Vector
 
+from .circle_geometry import circle_points
+from .labels import Label, LabelBlock, LabelCache
+from .retained import RetainedGeometry
+
 
 class Draw2D:
     _shader: Any = None
+    geometry: RetainedGeometry
+    labels: LabelCache
+    label_block: LabelBlock
 
     def __init__(self):
         self._shader = gpu.shader.from_builtin('2D_UNIFORM_COLOR')
+        self.geometry = RetainedGeometry()
+        self.labels = LabelCache()
+        self.label_block = LabelBlock()
+
+    def draw_lines(self, coords: list[Vector] | np.ndarray, type: str = 'LINES', color=(1, 1, 0), name: str = None):
+        if name is not None:
+            self.geometry.submit(name, self._shader, coords, type, (*color, 1))
+            return
 
-    def draw_lines(self, coords: list[Vector], type: str = 'LINES'):
-        self._shader.uniform_float("color", (1, 1, 0, 1))
+        self._shader.uniform_float("color", (*color, 1))
         batch = batch_for_shader(self._shader, type, {"pos": coords})
         gpu.state.line_width_set(2)
         batch.draw(self._shader)
 
-    def draw_circle(self, pos: Vector, start=0, end=math.pi * 2, radius: float = 1, color=(1, 1, 0)):
-        segments = 24
-        coords = []
-        for i in range(0, segments):
-            mul = (1.0 / (segments - 1)) * end
-
-            prev = (
-                math.sin(start + i * mul) * radius + pos.x,
-                math.cos(start + i * mul) * radius + pos.y
-            )
-            coords.append(prev)
-
-        self._shader.uniform_float("color", (*color, 1))
-        gpu.state.line_width_set(2)
-        self.draw_lines(coords, type='LINE_STRIP')
+    def draw_circle(self, pos: Vector, start=0, end=math.pi * 2, radius: float = 1, color=(1, 1, 0),
+                    name: str = None):
+        coords = circle_points((pos.x, pos.y), radius, 24, start, end)
+        self.draw_lines(coords, type='LINE_STRIP', color=color, name=name)
 
     def draw_text(self, pos: Vector, text: str, size: int = 18, font: int = 0, color=(1, 1, 1)):
         blf.position(font, pos.x, pos.y, 0)
         blf.size(font, size)
         blf.color(font, *color, 1)
         blf.draw(font, text)
+
+    def draw_label(self, pos: Vector, label: Label):
+        self.labels.draw(pos, label)
+
+    def draw_label_block(self, origin: Vector, lines: list[tuple[float, float, Label]], cached: bool = True):
+        if cached:
+            self.label_block.draw(origin, lines)
+            return
+        for dx, dy, label in lines:
+            self.labels.draw((origin.x + dx, origin.y + dy), label)
+
+    def flush(self):
+        self.geometry.flush()
+        self.labels.flush()
@@ -2,35 +2,46 @@ import math
 from typing import Any
 
 import gpu
+import numpy as np
 from gpu_extras.batch import batch_for_shader
 from mathutils import Vector
 
+from .circle_geometry import circle_points
+from .retained import RetainedGeometry
+
 
 class Draw3D:
     _shader: Any = None
+    _flat_shader: Any = None
+    geometry: RetainedGeometry
 
     def __init__(self):
         self._shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+        self._flat_shader = gpu.shader.from_builtin('3D_FLAT_COLOR')
+        self.geometry = RetainedGeometry()
+
+    def draw_lines(self, coords: list[Vector] | np.ndarray, type: str = 'LINES', color=(1, 1, 1), name: str = None):
+        if name is not None:
+            self.geometry.submit(name, self._shader, coords, type, (*color, 1))
+            return
 
-    def draw_lines(self, coords: list[Vector], type: str = 'LINES', color=(1, 1, 1)):
         self._shader.uniform_float("color", (*color, 1))
         batch = batch_for_shader(self._shader, type, {"pos": coords})
         gpu.state.line_width_set(2)
         batch.draw(self._shader)
 
+    def draw_colored_lines(self, coords: np.ndarray, colors: np.ndarray, name: str, type: str = 'LINES'):
+        """Retained lines with an RGBA color per vertex, all in one batch."""
+        self.geometry.submit(name, self._flat_shader, coords, type, colors=colors)
+
     def draw_circle(self, pos: Vector, start=0, end=math.pi * 2, radius: float = 1, segments: int = 24,
-                    color: tuple[float, float, float] = (1, 1, 1)):
-        coords = []
-        for i in range(0, segments):
-            mul = (1.0 / (segments - 1)) * end
-
-            prev = (
-                math.sin(start + i * mul) * radius + pos.x,
-                pos.y,
-                math.cos(start + i * mul) * radius + pos.z
-            )
-            coords.append(prev)
-
-        # self._shader.uniform_float("color", (*color, 1))
-        self.draw_lines(coords, type='LINE_STRIP', color=color)
-        return Vector(coords[int(len(coords) / 2)])
+                    color: tuple[float, float, float] = (1, 1, 1), name: str = None):
+        coords = circle_points(pos, radius, segments, start, end, axes=(0, 2))
+        self.draw_lines(coords, type='LINE_STRIP', color=color, name=name)
+        return Vector(coords[segments // 2])
+
+    def hide(self, *names: str):
+        self.geometry.hide(*names)
+
+    def flush(self):
+        self.geometry.flush()
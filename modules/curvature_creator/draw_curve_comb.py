@@ -3,11 +3,14 @@ from dataclasses import dataclass
 import numpy as np
 
 from mathutils import Vector
-from . import Draw3D
-from .bezier import Bezier
-from .bezier_draw import bezier_draw
+from .draw_3d import Draw3D
+from .bezier_draw import bezier_draw, xy2xz
+from .core.comb import CombMetrics, CombSettings, JointReport, comb_metrics, merge_metrics, spline_metrics
+from .spline_io import SplineBuffer
 import bpy
 
+spline_buffer = SplineBuffer()
+
 
 @dataclass
 class CurveComb:
@@ -16,38 +19,82 @@ class CurveComb:
     curvature_abs: float = 0
     point: Vector = Vector((0, 0, 0))
     radius: float = 0
+    samples: int = 0
+    g2_breaks: int = 0
+    g2_max_jump: float = 0
 
 
-def draw_curve_comb(spline: bpy.types.Spline, draw: Draw3D):
-    points = spline.bezier_points
-
-    comb = CurveComb()
-    count = 0
-
-    for index, i in enumerate(points):
-        if index + 1 >= len(points):
-            break
-        p0 = i.co
-        p1 = i.handle_right
-        p2 = points[index + 1].handle_left
-        p3 = points[index + 1].co
-        curve = Bezier(*np.array((
-            (p0[0], p0[2]),
-            (p1[0], p1[2]),
-            (p2[0], p2[2]),
-            (p3[0], p3[2]),
-        )))
-        k, ka, c, max_point, max_radius = bezier_draw(curve, draw, scale=bpy.context.scene.zenu_curve_comb_scale,
-                                          steps=bpy.context.scene.zenu_curve_comb_steps, draw_circle=index == 1)
-        count += c
-        comb.curvature += k
-        comb.curvature_abs += ka
-        if index == 1:
-            comb.point = max_point
-            comb.radius = max_radius * bpy.context.scene.zenu_curve_comb_scale
-
-
-    comb.length = spline.calc_length()
-    comb.curvature /= count
-    comb.curvature_abs /= count
+@dataclass
+class SplineRow:
+    name: str
+    metrics: CombMetrics
+
+
+def spline_segments(spline: bpy.types.Spline, matrix: np.ndarray = None) -> np.ndarray:
+    """Segments of the spline in the XZ drawing plane, optionally transformed by a 4x4 matrix first.
+
+    The result is a view into the shared buffer and is overwritten by the next call.
+    """
+    return spline_buffer.read(spline, matrix)
+
+
+def pack_splines(objects: list[bpy.types.Object]) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """World space segments of every bezier spline of the objects in one buffer, with per-spline offsets."""
+    segments = []
+    names = []
+    for obj in objects:
+        matrix = np.array(obj.matrix_world)
+        for index, spline in enumerate(obj.data.splines):
+            if spline.type != 'BEZIER' or len(spline.bezier_points) < 2:
+                continue
+            segments.append(np.array(spline_segments(spline, matrix)))
+            names.append(f'{obj.name}[{index}]')
+
+    offsets = np.cumsum([0, *(len(i) for i in segments)])
+    return (np.concatenate(segments) if segments else np.empty((0, 4, 2))), offsets, names
+
+
+def comb_settings(scene: bpy.types.Scene) -> CombSettings:
+    return CombSettings(
+        scale=scene.zenu_curve_comb_scale,
+        steps=scene.zenu_curve_comb_steps,
+        mode=scene.zenu_curve_comb_mode,
+        tolerance=scene.zenu_curve_comb_tolerance,
+        min_samples=scene.zenu_curve_comb_min_samples,
+        max_samples=scene.zenu_curve_comb_max_samples,
+    )
+
+
+def curve_comb(metrics: CombMetrics, report: JointReport) -> CurveComb:
+    comb = CurveComb(length=metrics.length, curvature=metrics.curvature, curvature_abs=metrics.curvature_abs,
+                     samples=metrics.samples, g2_breaks=len(report.segment), g2_max_jump=report.max_jump)
+    if metrics.extremum.curvature:
+        comb.point = xy2xz(metrics.extremum.center)
+        comb.radius = metrics.extremum.radius
     return comb
+
+
+def draw_combs(segments: np.ndarray, offsets: np.ndarray, draw: Draw3D) -> tuple[list, JointReport]:
+    scene = bpy.context.scene
+    return bezier_draw(segments, draw, comb_settings(scene), offsets, heatmap=scene.zenu_curve_comb_heatmap,
+                       tolerance=scene.zenu_curve_g2_tolerance)
+
+
+def draw_curve_comb(spline: bpy.types.Spline, draw: Draw3D):
+    segments = spline_segments(spline)
+    if not len(segments):
+        return CurveComb()
+
+    combs, report = draw_combs(segments, np.array((0, len(segments))), draw)
+    return curve_comb(comb_metrics(segments, combs), report)
+
+
+def draw_selected_combs(objects: list[bpy.types.Object], draw: Draw3D) -> tuple[CurveComb, list[SplineRow]]:
+    """Comb of every spline of the objects, evaluated and drawn as one buffer, with a metrics row per spline."""
+    segments, offsets, names = pack_splines(objects)
+    if not len(segments):
+        return CurveComb(), []
+
+    combs, report = draw_combs(segments, offsets, draw)
+    metrics = spline_metrics(segments, combs, offsets)
+    return curve_comb(merge_metrics(metrics, np.diff(offsets)), report), [SplineRow(*i) for i in zip(names, metrics)]
@@ -1,26 +1,97 @@
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import bpy
+
 from ...base_panel import BasePanel
 
+DECIMATE_RESOLUTION = {'OFF': 0, 'FINE': 512, 'MEDIUM': 256, 'COARSE': 96}
+
 
 class ZENU_OT_import_stl(bpy.types.Operator):
+    """Parse the STL on a worker thread and build the mesh on the main thread once it is done"""
     bl_label = 'Import STL'
     bl_idname = 'zenu.import_stl'
 
+    _executor: ThreadPoolExecutor = None
+    _future: Future = None
+    _timer = None
+
     def execute(self, context: bpy.types.Context):
+        from .core import stl
+
         path = bpy.path.abspath(context.scene.zenu_import_export_path)
-        bpy.ops.import_mesh.stl(global_scale=.001, filepath=path)
+        if not os.path.isfile(path):
+            self.report({'ERROR'}, f'{path} not found')
+            return {'CANCELLED'}
+
+        self._path = path
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        resolution = DECIMATE_RESOLUTION[context.scene.zenu_import_decimate]
+        self._future = self._executor.submit(stl.load, path, .001, resolution)
+        self._timer = context.window_manager.event_timer_add(.1, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        context.workspace.status_text_set(f'Importing {os.path.basename(path)}, Esc to cancel')
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context: bpy.types.Context, event: bpy.types.Event):
+        if event.type == 'ESC':
+            self._finish(context)
+            return {'CANCELLED'}
+        if event.type != 'TIMER' or not self._future.done():
+            return {'PASS_THROUGH'}
+
+        from .mesh_io import build_mesh
+
+        self._finish(context)
+        try:
+            vertices, faces = self._future.result()
+        except Exception as e:
+            self.report({'ERROR'}, f'Import failed: {e}')
+            return {'CANCELLED'}
+
+        name = bpy.path.display_name_from_filepath(self._path)
+        obj = bpy.data.objects.new(name, build_mesh(name, vertices, faces))
+        context.collection.objects.link(obj)
+        for i in context.selected_objects:
+            i.select_set(False)
+        obj.select_set(True)
+        context.view_layer.objects.active = obj
+        self.report({'INFO'}, f'{len(vertices)} vertices, {len(faces)} faces imported')
         return {'FINISHED'}
 
+    def _finish(self, context: bpy.types.Context):
+        context.window_manager.event_timer_remove(self._timer)
+        context.workspace.status_text_set(None)
+        # A cancelled parse keeps running until it returns, its result is dropped.
+        self._executor.shutdown(wait=False)
+
 
 class ZENU_OT_export_stl(bpy.types.Operator):
     bl_label = 'Export STL'
     bl_idname = 'zenu.export_stl'
 
     def execute(self, context: bpy.types.Context):
+        from .core import stl
+        from .mesh_io import export_objects, export_triangles
+
         path = bpy.path.abspath(os.path.splitext(context.scene.zenu_import_export_path)[0])
-        bpy.ops.export_mesh.stl(global_scale=1000, filepath=path + '_exported.stl', check_existing=False)
+        objects = export_objects(context)
+        if not objects:
+            self.report({'WARNING'}, 'Nothing to export')
+            return {'CANCELLED'}
+
+        if context.scene.zenu_export_separate:
+            files = {f'{path}_{bpy.path.clean_name(i.name)}.stl': [i] for i in objects}
+        else:
+            files = {path + '_exported.stl': objects}
+
+        count = 0
+        for filepath, items in files.items():
+            with open(filepath, 'wb') as file:
+                count += stl.write_binary(file, [export_triangles(i, context, 1000) for i in items],
+                                      header=b'Curvature Creator, mm')
+        self.report({'INFO'}, f'{count} triangles written to {len(files)} file(s)')
         return {'FINISHED'}
 
 
@@ -34,7 +105,10 @@ class ZENU_PT_curvature_export_import(BasePanel):
         col.prop(bpy.context.scene, 'zenu_import_export_path', text='')
         if bpy.context.scene.zenu_import_export_path:
             col.operator(ZENU_OT_import_stl.bl_idname)
+            col.prop(bpy.context.scene, 'zenu_import_decimate', text='')
             col.operator(ZENU_OT_export_stl.bl_idname)
+            col.prop(bpy.context.scene, 'zenu_export_separate')
+            col.prop(bpy.context.scene, 'zenu_export_tubes')
 
 
 classes = (
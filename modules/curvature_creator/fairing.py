@@ -0,0 +1,51 @@
+import bpy
+
+
+class ZENU_OT_fair_spline(bpy.types.Operator):
+    """Move the handles of the active spline to even out its curvature"""
+    bl_label = 'Fair Spline'
+    bl_idname = 'zenu.fair_spline'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    keep_co: bpy.props.BoolProperty(name='Keep Points', default=True,
+                                    description='Only move handles, otherwise interior points move too')
+    keep_g1: bpy.props.BoolProperty(name='Keep Tangents', default=True,
+                                    description='Only change handle lengths so tangents stay continuous')
+    iterations: bpy.props.IntProperty(name='Iterations', default=200, min=1, soft_max=1000)
+    samples: bpy.props.IntProperty(name='Samples', default=24, min=3, soft_max=100,
+                                   description='Curvature samples per segment of the energy')
+
+    @classmethod
+    def poll(cls, context: bpy.types.Context):
+        obj = context.object
+        return (obj is not None and obj.mode == 'OBJECT' and isinstance(obj.data, bpy.types.Curve)
+                and obj.data.splines.active is not None and obj.data.splines.active.type == 'BEZIER')
+
+    def execute(self, context: bpy.types.Context):
+        from .core.fairing import fair
+        from .spline_io import SplineBuffer, write_points
+
+        spline = context.object.data.splines.active
+        buffer = SplineBuffer()
+        buffer.read(spline)
+        handle_left, co, handle_right = (buffer.points[:, i] for i in range(3))
+
+        # The construction lives in the XZ plane, Y stays as it is.
+        result = fair(co[:, ::2], handle_left[:, ::2], handle_right[:, ::2], keep_co=self.keep_co,
+                      keep_g1=self.keep_g1, samples=self.samples, iterations=self.iterations)
+        co[:, ::2] = result.co
+        handle_left[:, ::2] = result.handle_left
+        handle_right[:, ::2] = result.handle_right
+
+        write_points(spline, co, handle_left, handle_right, 'ALIGNED' if self.keep_g1 else 'FREE')
+        context.object.data.update_tag()
+
+        reduction = 1 - result.energy_after / result.energy_before if result.energy_before else 0
+        self.report({'INFO'}, f'Curvature energy {result.energy_before:.4g} -> {result.energy_after:.4g} '
+                              f'({reduction:.1%} lower, {result.iterations} iterations)')
+        return {'FINISHED'}
+
+
+classes = (
+    ZENU_OT_fair_spline,
+)
@@ -0,0 +1,75 @@
+import bpy
+
+
+def view_region(context: bpy.types.Context, x: int, y: int) -> tuple[bpy.types.Area | None, bpy.types.Region | None]:
+    """3D view area and its main region under the window coordinates x, y."""
+    for area in context.screen.areas:
+        if area.type != 'VIEW_3D':
+            continue
+        for region in area.regions:
+            if (region.type == 'WINDOW' and region.x <= x < region.x + region.width
+                    and region.y <= y < region.y + region.height):
+                return area, region
+    return None, None
+
+
+class ZENU_OT_curve_hover(bpy.types.Operator):
+    """Show curvature, radius and arc length at the point of the active spline under the mouse, Esc to stop"""
+    bl_label = 'Hover Readout'
+    bl_idname = 'zenu.curve_hover'
+
+    @classmethod
+    def poll(cls, context: bpy.types.Context):
+        obj = context.object
+        return (context.area is not None and context.area.type == 'VIEW_3D' and obj is not None
+                and isinstance(obj.data, bpy.types.Curve) and obj.data.splines.active is not None
+                and obj.data.splines.active.type == 'BEZIER' and len(obj.data.splines.active.bezier_points) > 1)
+
+    def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
+        from .hover_readout import HoverReadout
+
+        self._readout = HoverReadout()
+        self._areas = set()
+        self._handler = bpy.types.SpaceView3D.draw_handler_add(self._readout.draw, (), 'WINDOW', 'POST_PIXEL')
+        context.window_manager.modal_handler_add(self)
+        context.workspace.status_text_set('Hover over the active spline, Esc or right click to stop')
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context: bpy.types.Context, event: bpy.types.Event):
+        if event.type in {'ESC', 'RIGHTMOUSE'} and event.value == 'PRESS':
+            self.cancel(context)
+            return {'FINISHED'}
+
+        if event.type == 'MOUSEMOVE':
+            # The context keeps the region the operator was started from, the sidebar, not the viewport.
+            area, region = view_region(context, event.mouse_x, event.mouse_y)
+            point = None
+            if region is not None:
+                mouse = (event.mouse_x - region.x, event.mouse_y - region.y)
+                point = self._readout.query(context.object, region, region.data, mouse)
+            if point is not None or self._readout.point is not None:
+                self._readout.point = point
+                if area is not None:
+                    self._areas.add(area.as_pointer())
+                self._redraw(context)
+        return {'PASS_THROUGH'}
+
+    def cancel(self, context: bpy.types.Context):
+        # Also called by Blender when the modal is aborted, by loading a file or closing the window.
+        bpy.types.SpaceView3D.draw_handler_remove(self._handler, 'WINDOW')
+        if context.workspace is not None:
+            context.workspace.status_text_set(None)
+        self._readout.point = None
+        self._redraw(context)
+
+    def _redraw(self, context: bpy.types.Context):
+        if context.screen is None:
+            return
+        for area in context.screen.areas:
+            if area.as_pointer() in self._areas:
+                area.tag_redraw()
+
+
+classes = (
+    ZENU_OT_curve_hover,
+)
@@ -0,0 +1,102 @@
+import traceback
+from dataclasses import dataclass
+
+import bpy
+import numpy as np
+from bpy_extras import view3d_utils
+from mathutils import Vector
+
+from .core.closest import SegmentIndex
+from .draw_2d import Draw2D
+from .projection import Projection
+from .spline_io import SplineBuffer
+
+# The readout shows while the nearest point of the curve is within this many pixels of the mouse.
+HOVER_DISTANCE = 40
+
+
+@dataclass
+class HoverPoint:
+    position: Vector
+    curvature: float
+    arc_length: float
+    length: float
+
+
+class SplineIndex:
+    """Closest point index of a spline in the XZ drawing plane, rebuilt only when its points change."""
+    index: SegmentIndex = None
+    plane: float = 0
+
+    def __init__(self):
+        self.buffer = SplineBuffer()
+        self._key = None
+
+    def update(self, spline: bpy.types.Spline, matrix: np.ndarray) -> SegmentIndex:
+        segments = self.buffer.read(spline, matrix)
+        key = segments.tobytes()
+        if key != self._key:
+            self._key = key
+            self.index = SegmentIndex(segments)
+            self.plane = float(self.buffer.points[0, 1, 1])
+        return self.index
+
+
+class HoverReadout:
+    """Nearest point of the active spline to the mouse and its readout, drawn in every 3D view."""
+    point: HoverPoint | None = None
+
+    def __init__(self):
+        self.spline = SplineIndex()
+        self.drawer = Draw2D()
+        self.projection = Projection()
+
+    def query(self, obj: bpy.types.Object, region: bpy.types.Region, region_3d: bpy.types.RegionView3D,
+              mouse: tuple[float, float]) -> HoverPoint | None:
+        """Point of the active spline of `obj` near `mouse`, in the coordinates of the 3D view `region`."""
+        if (obj is None or not isinstance(obj.data, bpy.types.Curve) or obj.data.splines.active is None
+                or not isinstance(region_3d, bpy.types.RegionView3D)):
+            return None
+        spline = obj.data.splines.active
+        if spline.type != 'BEZIER' or len(spline.bezier_points) < 2:
+            return None
+
+        index = self.spline.update(spline, np.array(obj.matrix_world))
+        mouse = Vector(mouse)
+        origin = view3d_utils.region_2d_to_origin_3d(region, region_3d, mouse)
+        direction = view3d_utils.region_2d_to_vector_3d(region, region_3d, mouse)
+        if abs(direction.y) < 1e-9:
+            return None
+        # The spline is drawn in the XZ plane through its first point, the mouse ray meets it there.
+        hit = origin + direction * ((self.spline.plane - origin.y) / direction.y)
+        closest = index.query((hit.x, hit.z))
+
+        position = Vector((closest.point[0], self.spline.plane, closest.point[1]))
+        pixel = view3d_utils.location_3d_to_region_2d(region, region_3d, position)
+        if pixel is None or (pixel - mouse).length > HOVER_DISTANCE:
+            return None
+        arc_length, length = index.arc_length(closest.segment, closest.t)
+        return HoverPoint(position, index.curvature(closest.segment, closest.t), arc_length, length)
+
+    def draw(self):
+        try:
+            if self.point is None or not self.projection.update(bpy.context):
+                return
+            pos = self.projection.project_vectors((self.point.position,))[0]
+            if pos is None:
+                return
+
+            point = self.point
+            labels = self.drawer.labels
+            radius = abs(1 / point.curvature) * 1000 if point.curvature else float('inf')
+            self.drawer.draw_circle(pos, radius=8, color=(1, 1, 1), name='hover')
+            for offset, label in enumerate((
+                labels.label('hover_k', 'K = {:.2f}', point.curvature, size=14),
+                labels.label('hover_r', 'R = {:.2f} mm', radius, size=14),
+                labels.label('hover_s', 'S = {:.2f} / {:.2f} mm', point.arc_length * 1000, point.length * 1000,
+                             size=14),
+            )):
+                self.drawer.draw_label(pos + Vector((16, 4 - offset * 18)), label)
+            self.drawer.flush()
+        except Exception:
+            print(f'Hover readout error: {traceback.format_exc()}')
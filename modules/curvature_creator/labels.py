@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+from typing import Any
+
+import blf
+import gpu
+from gpu.types import GPUOffScreen
+from gpu_extras.batch import batch_for_shader
+from mathutils import Matrix
+
+
+@dataclass
+class Label:
+    text: str
+    font: int
+    size: int
+    color: tuple
+    width: float
+    height: float
+
+
+class LabelCache:
+    """Label texts formatted and measured only when their value changes at display precision.
+
+    Drawn labels are queued and `flush` sets the blf font, size and color once per group.
+    """
+    formats: int = 0
+
+    def __init__(self):
+        self._labels: dict[str, tuple[tuple, Label]] = {}
+        self._queue: dict[tuple, list[tuple[float, float, str]]] = {}
+
+    def label(self, name: str, template: str, *values, precision: int = 2, size: int = 18, font: int = 0,
+              color=(1, 1, 1)) -> Label:
+        """`template.format(*values)`, reused while every float value rounds the same at `precision`."""
+        color = tuple(color)
+        key = (template, font, size, color, *(round(i, precision) if isinstance(i, float) else i for i in values))
+        cached = self._labels.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        text = template.format(*values)
+        blf.size(font, size)
+        label = Label(text, font, size, color, *blf.dimensions(font, text))
+        self._labels[name] = (key, label)
+        self.formats += 1
+        return label
+
+    def draw(self, pos, label: Label):
+        self._queue.setdefault((label.font, label.size, label.color), []).append((pos[0], pos[1], label.text))
+
+    def flush(self):
+        for (font, size, color), items in self._queue.items():
+            blf.size(font, size)
+            blf.color(font, *color, 1)
+            for x, y, text in items:
+                blf.position(font, x, y, 0)
+                blf.draw(font, text)
+        self._queue.clear()
+
+    def clear(self):
+        self._labels.clear()
+        self._queue.clear()
+
+
+def pixel_projection(width: int, height: int) -> Matrix:
+    return Matrix(((2 / width, 0, 0, -1), (0, 2 / height, 0, -1), (0, 0, 1, 0), (0, 0, 0, 1)))
+
+
+class LabelBlock:
+    """Labels placed relative to one origin, rendered into a texture only when one of their texts changes.
+
+    Every other frame costs a single textured quad instead of a blf draw per label.
+    """
+    renders: int = 0
+    _offscreen: GPUOffScreen = None
+    _batch: Any = None
+    _signature: tuple = None
+
+    def __init__(self):
+        self._shader = gpu.shader.from_builtin('2D_IMAGE')
+        self._corner = (0, 0)
+
+    def draw(self, origin, lines: list[tuple[float, float, Label]]):
+        """Draw `lines` of (dx, dy, label) with their baselines at origin + (dx, dy)."""
+        signature = tuple((dx, dy, label.text, label.font, label.size, label.color) for dx, dy, label in lines)
+        if signature != self._signature:
+            self._render(lines)
+            self._signature = signature
+
+        gpu.state.blend_set('ALPHA_PREMULT')
+        with gpu.matrix.push_pop():
+            gpu.matrix.translate((origin[0] + self._corner[0], origin[1] + self._corner[1]))
+            self._shader.bind()
+            self._shader.uniform_sampler('image', self._offscreen.texture_color)
+            self._batch.draw(self._shader)
+        gpu.state.blend_set('NONE')
+
+    def _render(self, lines: list[tuple[float, float, Label]]):
+        pad = max(label.size for _, _, label in lines) // 2
+        left = min(dx for dx, _, _ in lines) - pad
+        bottom = min(dy for _, dy, _ in lines) - pad
+        width = int(max(dx + label.width for dx, _, label in lines) - left + pad)
+        height = int(max(dy + label.size for _, dy, label in lines) - bottom + pad)
+
+        if self._offscreen is None or (self._offscreen.width, self._offscreen.height) != (width, height):
+            self.free()
+            self._offscreen = GPUOffScreen(width, height)
+            self._batch = batch_for_shader(self._shader, 'TRI_FAN', {
+                'pos': ((0, 0), (width, 0), (width, height), (0, height)),
+                'texCoord': ((0, 0), (1, 0), (1, 1), (0, 1)),
+            })
+        self._corner = (left, bottom)
+
+        with self._offscreen.bind():
+            gpu.state.active_framebuffer_get().clear(color=(0, 0, 0, 0))
+            with gpu.matrix.push_pop(), gpu.matrix.push_pop_projection():
+                gpu.matrix.load_matrix(Matrix.Identity(4))
+                gpu.matrix.load_projection_matrix(pixel_projection(width, height))
+                for dx, dy, label in lines:
+                    blf.size(label.font, label.size)
+                    blf.color(label.font, *label.color, 1)
+                    blf.position(label.font, dx - left, dy - bottom, 0)
+                    blf.draw(label.font, label.text)
+        self.renders += 1
+
+    def free(self):
+        if self._offscreen is not None:
+            self._offscreen.free()
+        self._offscreen = None
+        self._signature = None
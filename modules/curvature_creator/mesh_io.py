@@ -0,0 +1,111 @@
+import bpy
+import numpy as np
+
+from .core.tube import TubeMesh, tube
+from .spline_io import SplineBuffer, read_radius
+
+EXPORT_TYPES = {'MESH', 'CURVE', 'SURFACE', 'META', 'FONT'}
+
+
+def object_triangles(obj: bpy.types.Object, depsgraph: bpy.types.Depsgraph, scale: float = 1) -> np.ndarray:
+    """World space (n, 3, 3) float32 triangles of the evaluated object, modifiers and curve bevel applied."""
+    evaluated = obj.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    try:
+        mesh.calc_loop_triangles()
+        indices = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('vertices', indices)
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', co)
+    finally:
+        evaluated.to_mesh_clear()
+
+    matrix = np.array(obj.matrix_world, dtype=np.float32) * scale
+    co = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    indices = indices.reshape(-1, 3)
+    if np.linalg.det(matrix[:3, :3]) < 0:
+        # A mirroring transform flips the winding, restore it so the normals keep pointing outwards.
+        indices = indices[:, ::-1]
+    return co[indices]
+
+
+def build_mesh(name: str, vertices: np.ndarray, faces: np.ndarray) -> bpy.types.Mesh:
+    """Triangle mesh written with foreach_set, no per-element Python work."""
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set('co', vertices.reshape(-1))
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set('vertex_index', faces.reshape(-1))
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set('loop_start', np.arange(0, faces.size, 3, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set('loop_total', np.full(len(faces), 3, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+def export_triangles(obj: bpy.types.Object, context: bpy.types.Context, scale: float = 1) -> np.ndarray:
+    scene = context.scene
+    if scene.zenu_export_tubes and obj.type == 'CURVE':
+        return curve_triangles(obj, scene.zenu_tube_tolerance, scene.zenu_active_curve_bevel, scale)
+    return object_triangles(obj, context.evaluated_depsgraph_get(), scale)
+
+
+def export_objects(context: bpy.types.Context) -> list[bpy.types.Object]:
+    objects = context.selected_objects or context.visible_objects
+    return [i for i in objects if i.type in EXPORT_TYPES]
+
+
+def curve_tubes(obj: bpy.types.Object, tolerance: float, bevel: float) -> list[TubeMesh]:
+    """Tube of every bezier spline of the curve object in its local space.
+
+    The radius is the bevel depth, or `bevel` when the curve has none, scaled by the point radii.
+    """
+    curve = obj.data
+    depth = curve.bevel_depth or bevel
+    buffer = SplineBuffer()
+    tubes = []
+    for spline in curve.splines:
+        if spline.type != 'BEZIER' or len(spline.bezier_points) < 2:
+            continue
+        buffer.read(spline)
+        handle_left, co, handle_right = (buffer.points[:, i] for i in range(3))
+        if spline.use_cyclic_u:
+            co, handle_left, handle_right = (np.vstack((i, i[:1])) for i in (co, handle_left, handle_right))
+        segments = np.stack((co[:-1], handle_right[:-1], handle_left[1:], co[1:]), axis=1)
+        tubes.append(tube(segments, depth * read_radius(spline), tolerance, cyclic=spline.use_cyclic_u,
+                          ease=spline.radius_interpolation != 'LINEAR'))
+    return tubes
+
+
+def curve_triangles(obj: bpy.types.Object, tolerance: float, bevel: float, scale: float = 1) -> np.ndarray:
+    """World space (n, 3, 3) float32 triangles of the tubes of a curve object, like `object_triangles`."""
+    tubes = curve_tubes(obj, tolerance, bevel)
+    if not tubes:
+        return np.empty((0, 3, 3), dtype=np.float32)
+    matrix = np.array(obj.matrix_world, dtype=np.float32) * scale
+    triangles = np.concatenate([i.triangles() for i in tubes]) @ matrix[:3, :3].T + matrix[:3, 3]
+    if np.linalg.det(matrix[:3, :3]) < 0:
+        triangles = triangles[:, ::-1]
+    return triangles
+
+
+def build_tube_mesh(name: str, tubes: list[TubeMesh]) -> bpy.types.Mesh:
+    """One mesh holding every tube, written with foreach_set."""
+    offsets = np.cumsum([0, *(len(i.vertices) for i in tubes)])
+    polygons = [i.polygons() for i in tubes]
+    loop_offsets = np.cumsum([0, *(len(i[0]) for i in polygons)])
+    loops = np.concatenate([i[0] + offset for i, offset in zip(polygons, offsets)])
+    loop_start = np.concatenate([i[1] + offset for i, offset in zip(polygons, loop_offsets)])
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(offsets[-1])
+    mesh.vertices.foreach_set('co', np.concatenate([i.vertices for i in tubes]).reshape(-1))
+    mesh.loops.add(len(loops))
+    mesh.loops.foreach_set('vertex_index', loops.astype(np.int32))
+    mesh.polygons.add(len(loop_start))
+    mesh.polygons.foreach_set('loop_start', loop_start.astype(np.int32))
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set('loop_total', np.diff(np.append(loop_start, len(loops))).astype(np.int32))
+    mesh.update(calc_edges=True)
+    return mesh
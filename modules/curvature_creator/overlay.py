@@ -0,0 +1,325 @@
+import math
+import traceback
+from typing import Any
+
+import bpy
+from mathutils import Vector
+
+from .bezier_draw import strip_to_lines, xy2xz
+from .core.bezier import lerp
+from .core.construction import Construction, construct, pruett_circle
+from .deviation_analysis import Deviation, active_deviation, deviation_colors
+from .draw_2d import Draw2D
+from .draw_3d import Draw3D
+from .draw_curve_comb import CurveComb, SplineRow, draw_curve_comb, draw_selected_combs, spline_buffer
+from .labels import Label
+from .profiling import profiler
+from .projection import Projection
+from . import properties
+from ...utils import update_window
+
+CONSTRUCTION_PROPERTIES = (
+    'zenu_curve_height',
+    'zenu_circle_radius',
+    'zenu_pruett_radius',
+    'zenu_pruett_radius_show',
+)
+COMB_PROPERTIES = (
+    'zenu_curve_comb_show',
+    'zenu_curve_comb_selected',
+    'zenu_curve_comb_steps',
+    'zenu_curve_comb_scale',
+    'zenu_curve_comb_mode',
+    'zenu_curve_comb_tolerance',
+    'zenu_curve_comb_min_samples',
+    'zenu_curve_comb_max_samples',
+    'zenu_curve_comb_heatmap',
+    'zenu_curve_g2_tolerance',
+    'zenu_comb_circle_show',
+    'zenu_deviation_show',
+    'zenu_deviation_target',
+    'zenu_deviation_steps',
+    'zenu_deviation_limit',
+)
+
+
+class Draw:
+    _is_enable: bool = False
+    _render: Any = None
+    _render_pixel: Any = None
+    _text_pos: Vector
+    _a: Vector = Vector((0, 0, 0))
+    _b: Vector = Vector((0, 0, 0))
+    _c: Vector = Vector((0, 0, 0))
+    _comb: CurveComb = CurveComb()
+    _deviation: Deviation = None
+    _construction: Construction = None
+    _circle_radius: float = 0
+    _circle_is_active: bool = False
+    _construction_dirty: bool = True
+    _comb_dirty: bool = True
+    spline_rows: list[SplineRow] = []
+    drawer_2d: Draw2D
+    drawer_3d: Draw3D
+    projection: Projection
+
+    def __init__(self):
+        self.drawer_2d = Draw2D()
+        self.drawer_3d = Draw3D()
+        self.projection = Projection()
+        self._text_pos = Vector((0, 0, 0))
+
+    @property
+    def circle_is_active(self) -> bool:
+        return self._circle_is_active and bpy.context.scene.zenu_pruett_radius_show
+
+    def get_pos_on_screen(self, pos: Vector):
+        """Pixel position in the region being drawn, valid after `projection.update` in this draw call."""
+        return self.projection.project_vectors((pos,))[0]
+
+    def _draw_point(self, pos: Vector, label: Label, name: str = None):
+        self.drawer_2d.draw_circle(pos, radius=20, color=label.color, name=name)
+        self.drawer_2d.draw_label(pos - Vector((40, 0)), label)
+
+    def _draw_profile(self):
+        lines = profiler.overlay_lines()
+        self.drawer_2d.draw_text(Vector((20, 40 + len(lines) * 16)), f'{"stage":<18}{"p50":>7}{"p95":>7}{"max":>7}',
+                                 size=12)
+        for index, line in enumerate(lines):
+            self.drawer_2d.draw_text(Vector((20, 40 + (len(lines) - 1 - index) * 16)), line, size=12)
+
+    def _draw_labels(self, text_pos: Vector, a: Vector, b: Vector, c: Vector):
+        point_c = bpy.context.scene.zenu_curve_point_c
+        dist_b: float = bpy.context.scene.zenu_curve_point_b.distance
+        dist_c: float = bpy.context.scene.zenu_curve_point_c.distance
+
+        radius_a = 0
+        radius_b = 0
+        radius_c = 0
+
+        if bpy.context.object and isinstance(bpy.context.object.data, bpy.types.Curve):
+            curve = bpy.context.object.data
+            size = curve.bevel_depth
+            spline = curve.splines.active
+
+            radius_a = (size * spline.bezier_points[0].radius) * 1000
+            radius_b = (size * spline.bezier_points[1].radius) * 1000
+            radius_c = (size * spline.bezier_points[2].radius) * 1000
+
+        labels = self.drawer_2d.labels
+        self.drawer_2d.draw_label_block(Vector((400, a.y)), [
+            (0, 0, labels.label('length', 'L = {:.2f} mm', self._comb.length * 1000)),
+            (0, -30, labels.label('curvature', 'K = {:.2f}(A = {:.2f})', self._comb.curvature,
+                                  self._comb.curvature_abs)),
+            (0, -30 * 2, labels.label('circle_radius', 'R = {:.2f} mm', math.fabs(self._circle_radius * 1000),
+                                      color=(0, 1, 0))),
+            (0, -30 * 3, labels.label('comb_radius', 'R = {:.2f} mm', math.fabs(self._comb.radius * 1000),
+                                      color=(1, 0, 0))),
+            (0, -30 * 4, labels.label('samples', 'Samples = {}', self._comb.samples)),
+        ], cached=bpy.context.scene.zenu_label_block_cache)
+
+        self.drawer_2d.draw_circle(c, radius=20, name='angle_c')
+        self.drawer_2d.draw_label(text_pos + Vector((0, 20)),
+                                  labels.label('angle_c', '{} °', round(math.degrees(point_c.angle), 2)))
+        self._draw_point(a, labels.label('point_a', f'A{" " * 10}R = {{:.2f}} mm', radius_a,
+                                         color=(.99609375, .53125, .52734375)), name='point_a')
+        self._draw_point(b, labels.label('point_b', f'B{" " * 14}R = {{:.2f}} mm', radius_b,
+                                         color=(.8671875, .875, 1)), name='point_b')
+        self._draw_point(c, labels.label('point_c', f'C{" " * 10}R = {{:.2f}} mm', radius_c, color=(0, 1, 0)),
+                         name='point_c')
+
+        self.drawer_2d.draw_label(lerp(a, b, .5), labels.label('dist_b', f'{" " * 10}{{:.2f}} mm', dist_b * 1000))
+        self.drawer_2d.draw_label(lerp(b, c, .5), labels.label('dist_c', f'{" " * 10}{{:.2f}} mm', dist_c * 1000))
+
+    def _draw_pixel(self):
+        with profiler.stage('projection'):
+            if not self.projection.update(bpy.context):
+                return
+            points = self.projection.project_vectors((self._text_pos, self._a, self._b, self._c))
+            if any(i is None for i in points):
+                return
+            text_pos, a, b, c = points
+
+        with profiler.stage('text'):
+            self._draw_labels(text_pos, a, b, c)
+
+        with profiler.stage('flush_2d'):
+            self.drawer_2d.flush()
+
+    def _move_spline(self):
+        """Write A, B and C into the active spline, touching only points that moved."""
+        if bpy.context.object is None or not isinstance(bpy.context.object.data, bpy.types.Curve):
+            return False
+
+        return spline_buffer.write_co(bpy.context.object.data.splines.active, (self._a, self._b, self._c))
+
+    def _draw_curve_comb(self):
+        self.spline_rows = []
+        if not bpy.context.scene.zenu_curve_comb_show:
+            self.drawer_3d.hide('spline', 'comb', 'comb_teeth', 'comb_heatmap', 'g2_breaks')
+            return
+
+        if bpy.context.scene.zenu_curve_comb_selected:
+            objects = [i for i in bpy.context.selected_objects if isinstance(i.data, bpy.types.Curve)]
+            self._comb, self.spline_rows = draw_selected_combs(objects, self.drawer_3d)
+            return
+
+        if bpy.context.object is None or not isinstance(bpy.context.object.data, bpy.types.Curve):
+            self.drawer_3d.hide('spline', 'comb', 'comb_teeth', 'comb_heatmap', 'g2_breaks')
+            return
+        spline = bpy.context.object.data.splines.active
+        self._comb = draw_curve_comb(spline, self.drawer_3d)
+
+    def _draw_comb_circle(self):
+        if not bpy.context.scene.zenu_comb_circle_show:
+            self.drawer_3d.hide('comb_circle')
+            return
+        self.drawer_3d.draw_circle(self._comb.point, radius=self._comb.radius, segments=256, color=(1, 0, 0),
+                                   name='comb_circle')
+
+    def _draw_deviation(self):
+        scene = bpy.context.scene
+        self._deviation = active_deviation(bpy.context) if scene.zenu_deviation_show else None
+        if self._deviation is None:
+            self.drawer_3d.hide('deviation')
+            return
+        colors = deviation_colors(self._deviation.distance, scene.zenu_deviation_limit)
+        self.drawer_3d.draw_colored_lines(strip_to_lines(self._deviation.points), strip_to_lines(colors),
+                                          name='deviation')
+
+    def _draw_purrte(self):
+        geometry = self._construction
+        circle = pruett_circle(geometry.a, geometry.b, geometry.c, bpy.context.scene.zenu_curve_point_c.angle,
+                               bpy.context.scene.zenu_pruett_radius)
+
+        self._circle_position = xy2xz(circle.center)
+        self._circle_radius = float(circle.radius)
+        self._circle_is_active = bool(circle.active)
+        if self._circle_is_active:
+            self.drawer_3d.draw_circle(self._circle_position, radius=self._circle_radius, segments=256,
+                                       color=(0, 1, 0), name='pruett_circle')
+        else:
+            self.drawer_3d.hide('pruett_circle')
+
+    def _update_construction(self):
+        pointB = bpy.context.scene.zenu_curve_point_b
+        pointC = bpy.context.scene.zenu_curve_point_c
+        geometry = construct(bpy.context.scene.zenu_curve_height, pointB.angle, pointB.distance,
+                             pointC.angle, pointC.distance)
+        point_a, point_b, point_c = (xy2xz(i) for i in geometry.points)
+        v4 = xy2xz(geometry.extension)
+
+        circle_ang = -pointC.angle if point_b.x < 0 else pointC.angle
+        center = self.drawer_3d.draw_circle(point_b, float(geometry.edge_angle), circle_ang,
+                                            math.fabs(bpy.context.scene.zenu_circle_radius), name='angle_circle')
+
+        self._construction = geometry
+        self._a = point_a
+        self._b = point_b
+        self._c = point_c
+
+        if bpy.context.scene.zenu_pruett_radius_show:
+            with profiler.stage('_draw_purrte'):
+                self._draw_purrte()
+        else:
+            self.drawer_3d.hide('pruett_circle')
+
+        self._text_pos = center + Vector((-.0005, 0, -.0005))
+        self.drawer_3d.draw_lines([
+            point_a, point_b,
+            point_b, point_c,
+            point_b, point_b + v4
+        ], color=(.26171875, .546875, .828125), name='construction')
+
+        with profiler.stage('_move_spline'):
+            if self._move_spline():
+                self._comb_dirty = True
+
+    def _draw(self):
+        if self._construction_dirty:
+            self._construction_dirty = False
+            self._update_construction()
+
+        if self._comb_dirty:
+            self._comb_dirty = False
+            with profiler.stage('_draw_curve_comb'):
+                self._draw_curve_comb()
+            self._draw_comb_circle()
+            with profiler.stage('_draw_deviation'):
+                self._draw_deviation()
+
+        with profiler.stage('flush_3d'):
+            self.drawer_3d.flush()
+
+    def mark_dirty(self, construction: bool = True, comb: bool = True):
+        self._construction_dirty |= construction
+        self._comb_dirty |= comb
+
+    def _subscribe(self):
+        """Recompute derived state only when one of its inputs changes."""
+        subscriptions = (
+            *(((bpy.types.Scene, key), True, False) for key in CONSTRUCTION_PROPERTIES),
+            *(((properties.CurvePointInfo, key), True, False) for key in ('angle', 'distance')),
+            *(((bpy.types.Scene, key), False, True) for key in COMB_PROPERTIES),
+            ((bpy.types.LayerObjects, 'active'), True, True),
+        )
+        for key, construction, comb in subscriptions:
+            bpy.msgbus.subscribe_rna(key=key, owner=self, args=(construction, comb), notify=self.mark_dirty)
+
+    def draw_pixel(self):
+        try:
+            with profiler.stage('draw_pixel'):
+                self._draw_pixel()
+            if profiler.enabled:
+                self._draw_profile()
+        except Exception as e:
+            print(f'Pixel View error: {traceback.format_exc()}')
+            self.disable()
+
+    def draw(self):
+        try:
+            with profiler.stage('draw'):
+                self._draw()
+        except Exception as e:
+            print(f'3D View error: {traceback.format_exc()}')
+            self.disable()
+
+    def disable(self):
+        self._is_enable = False
+        bpy.msgbus.clear_by_owner(self)
+        try:
+            if self._render:
+                bpy.types.SpaceView3D.draw_handler_remove(self._render, 'WINDOW')
+                bpy.types.SpaceView3D.draw_handler_remove(self._render_pixel, 'WINDOW')
+                self.drawer_2d.label_block.free()
+                update_window()
+        except Exception as e:
+            print(f'Disable view error: {e}')
+
+    def enable(self):
+        if self._is_enable:
+            return
+        self._is_enable = True
+        self.mark_dirty()
+        self._subscribe()
+        self._render = bpy.types.SpaceView3D.draw_handler_add(self.draw, (), 'WINDOW', 'POST_VIEW')
+        self._render_pixel = bpy.types.SpaceView3D.draw_handler_add(self.draw_pixel, (), 'WINDOW', 'POST_PIXEL')
+        update_window()
+
+    def toggle(self):
+        if self._is_enable:
+            self.disable()
+        else:
+            self.enable()
+
+    @property
+    def is_enable(self):
+        return self._is_enable
+
+    @property
+    def comb(self) -> CurveComb:
+        return self._comb
+
+    @property
+    def scan_deviation(self) -> Deviation | None:
+        return self._deviation
@@ -0,0 +1,130 @@
+import json
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import bpy
+
+from ...base_panel import BasePanel
+
+_disabled = nullcontext()
+
+
+class _Stage:
+    __slots__ = ('_profiler', '_name', '_start')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+
+    def __exit__(self, *args):
+        self._profiler.record(self._name, self._start, time.perf_counter_ns())
+
+
+class Profiler:
+    """Opt-in per stage timings of the draw handlers with rolling percentiles and a Chrome trace."""
+    enabled: bool = False
+
+    def __init__(self, window: int = 240, max_events: int = 100000):
+        self.window = window
+        self._durations: dict[str, deque[int]] = {}
+        self._events: deque[tuple[str, int, int]] = deque(maxlen=max_events)
+        self._origin = time.perf_counter_ns()
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _disabled
+        return _Stage(self, name)
+
+    def record(self, name: str, start: int, end: int):
+        durations = self._durations.get(name)
+        if durations is None:
+            durations = self._durations[name] = deque(maxlen=self.window)
+        durations.append(end - start)
+        self._events.append((name, start, end))
+
+    def stats(self) -> dict[str, tuple[float, float, float]]:
+        """Stage -> (p50, p95, max) in milliseconds over the rolling window."""
+        import numpy as np
+
+        result = {}
+        for name, durations in self._durations.items():
+            values = np.fromiter(durations, dtype=np.int64, count=len(durations)) / 1e6
+            p50, p95 = np.percentile(values, (50, 95))
+            result[name] = (float(p50), float(p95), float(values.max()))
+        return result
+
+    def overlay_lines(self) -> list[str]:
+        return [f'{name:<18}{p50:>7.2f}{p95:>7.2f}{peak:>7.2f} ms' for name, (p50, p95, peak) in self.stats().items()]
+
+    def dump_chrome_trace(self, path: str) -> int:
+        """Write the recorded events as a Chrome trace (chrome://tracing, Perfetto)."""
+        events = [{
+            'name': name,
+            'ph': 'X',
+            'ts': (start - self._origin) / 1000,
+            'dur': (end - start) / 1000,
+            'pid': os.getpid(),
+            'tid': 0,
+        } for name, start, end in self._events]
+
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+        return len(events)
+
+    def reset(self):
+        self._durations.clear()
+        self._events.clear()
+        self._origin = time.perf_counter_ns()
+
+
+profiler = Profiler()
+
+
+def sync_profile(scene: bpy.types.Scene):
+    profiler.enabled = scene.zenu_profile_show
+    if not profiler.enabled:
+        profiler.reset()
+
+
+def update_profile(self, context: bpy.types.Context):
+    sync_profile(context.scene)
+
+
+class ZENU_OT_profile_dump(bpy.types.Operator):
+    bl_label = 'Dump Trace'
+    bl_idname = 'zenu.profile_dump'
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH', default='curvature_trace.json')
+
+    def invoke(self, context: bpy.types.Context, event: bpy.types.Event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context: bpy.types.Context):
+        path = bpy.path.abspath(self.filepath)
+        count = profiler.dump_chrome_trace(path)
+        self.report({'INFO'}, f'{count} events written to {path}')
+        return {'FINISHED'}
+
+
+class ZENU_PT_curvature_profile(BasePanel):
+    bl_label = 'Profiling'
+    bl_parent_id = 'ZENU_PT_curvature_creator'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context: bpy.types.Context):
+        col = self.layout.column_flow(align=True)
+        col.prop(context.scene, 'zenu_profile_show', icon='RESTRICT_VIEW_ON')
+        col.prop(context.scene, 'zenu_label_block_cache')
+        col.operator(ZENU_OT_profile_dump.bl_idname)
+
+
+classes = (
+    ZENU_OT_profile_dump,
+    ZENU_PT_curvature_profile,
+)
@@ -0,0 +1,36 @@
+import bpy
+import numpy as np
+from mathutils import Vector
+
+
+class Projection:
+    """World to pixel projection of the region being drawn, matrices read once per draw call."""
+    matrix: np.ndarray = None
+    size: np.ndarray = None
+
+    def update(self, context: bpy.types.Context = None) -> bool:
+        """Cache the perspective matrix and size of the context region, False outside a 3D region."""
+        context = context or bpy.context
+        region, region_3d = context.region, context.region_data
+        if region is None or not isinstance(region_3d, bpy.types.RegionView3D):
+            self.matrix = None
+            return False
+
+        self.matrix = np.array(region_3d.perspective_matrix, dtype=np.float64)
+        self.size = np.array((region.width, region.height), dtype=np.float64)
+        return True
+
+    def project(self, points) -> np.ndarray:
+        """(N, 3) world points to (N, 2) region pixels in one multiply, NaN for points behind the view."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        clip = points @ self.matrix[:, :3].T + self.matrix[:, 3]
+        w = clip[:, 3:]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pixels = self.size / 2 * (1 + clip[:, :2] / w)
+        pixels[w[:, 0] <= 0] = np.nan
+        return pixels
+
+    def project_vectors(self, points) -> list[Vector | None]:
+        """Same as `project` for a few points, as Vectors or None like location_3d_to_region_2d."""
+        return [None if np.isnan(i[0]) else Vector(i) for i in self.project(points)]
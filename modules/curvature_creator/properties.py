@@ -2,6 +2,8 @@ import math
 
 import bpy
 
+from .profiling import update_profile
+
 
 class CurvePointInfo(bpy.types.PropertyGroup):
     distance: bpy.props.FloatProperty(name='Distance', soft_min=.1 / 1000, soft_max=50 / 1000, subtype='DISTANCE')
@@ -15,6 +17,10 @@ def update_curve_radius(self, context: bpy.types.Context):
     curve_data.bevel_depth = context.scene.zenu_active_curve_bevel
 
 
+def poll_mesh(self, obj: bpy.types.Object) -> bool:
+    return obj.type == 'MESH'
+
+
 def init_properties():
     divide = 1000
 
@@ -33,17 +39,65 @@ def init_properties():
                                                                     subtype='DISTANCE', default=.005 / divide)
 
     bpy.types.Scene.zenu_curve_comb_show = bpy.props.BoolProperty(name='Comb Show', default=False)
+    bpy.types.Scene.zenu_curve_comb_selected = bpy.props.BoolProperty(
+        name='All Selected', default=False, description='Analyze every spline of every selected curve object')
+    bpy.types.Scene.zenu_curve_comb_mode = bpy.props.EnumProperty(name='Comb Sampling', items=(
+        ('UNIFORM', 'Uniform', 'Sample every segment at Comb Steps'),
+        ('ADAPTIVE', 'Adaptive', 'Subdivide every segment until the curve and comb are within the tolerance'),
+        ('ARC_LENGTH', 'Arc Length', 'Space Comb Steps teeth evenly along the length of every segment'),
+    ))
+    bpy.types.Scene.zenu_curve_comb_heatmap = bpy.props.BoolProperty(
+        name='Heatmap', default=False, description='Color the spline and comb by signed curvature in a single batch')
+    bpy.types.Scene.zenu_curve_g2_tolerance = bpy.props.FloatProperty(
+        name='G2 Tolerance', min=0, soft_max=1, default=.05, subtype='FACTOR',
+        description='Mark joints where the curvature jumps by more than this fraction of the larger |K| at the joint')
+    bpy.types.Scene.zenu_curve_comb_tolerance = bpy.props.FloatProperty(name='Comb Tolerance', min=.0001 / divide,
+                                                                        soft_max=.01 / divide, subtype='DISTANCE',
+                                                                        default=.001 / divide, precision=5)
+    bpy.types.Scene.zenu_curve_comb_min_samples = bpy.props.IntProperty(name='Min Samples', min=2, soft_max=50,
+                                                                        default=4)
+    bpy.types.Scene.zenu_curve_comb_max_samples = bpy.props.IntProperty(name='Max Samples', min=2, soft_max=500,
+                                                                        default=200)
 
     bpy.types.Scene.zenu_active_curve_bevel = bpy.props.FloatProperty(name='Curve Radius', soft_min=.1 / divide,
                                                                       soft_max=10 / divide, update=update_curve_radius,
                                                                       subtype='DISTANCE', default=2 / 1000)
 
+    bpy.types.Scene.zenu_tube_tolerance = bpy.props.FloatProperty(
+        name='Tube Tolerance', min=.0001 / divide, soft_max=.1 / divide, subtype='DISTANCE', default=.01 / divide,
+        precision=5, description='Largest distance of the tube mesh from the exact swept surface')
+
+    bpy.types.Scene.zenu_deviation_show = bpy.props.BoolProperty(name='Deviation Show', default=False)
+    bpy.types.Scene.zenu_deviation_target = bpy.props.PointerProperty(
+        name='Target', type=bpy.types.Object, poll=poll_mesh, description='Mesh, usually a scan, to measure against')
+    bpy.types.Scene.zenu_deviation_steps = bpy.props.IntProperty(name='Deviation Samples', min=1, soft_max=200,
+                                                                 default=32, description='Samples per segment')
+    bpy.types.Scene.zenu_deviation_limit = bpy.props.FloatProperty(
+        name='Deviation Limit', min=.001 / divide, soft_max=2 / divide, subtype='DISTANCE', default=.5 / divide,
+        description='Distance colored fully red')
+
     bpy.types.Scene.zenu_import_export_path = bpy.props.StringProperty(name='File Path', subtype='FILE_PATH')
+    bpy.types.Scene.zenu_import_decimate = bpy.props.EnumProperty(name='Decimate', items=(
+        ('OFF', 'Full Resolution', 'Import every vertex'),
+        ('FINE', 'Fine Preview', 'Cluster vertices on a 512 cell grid'),
+        ('MEDIUM', 'Medium Preview', 'Cluster vertices on a 256 cell grid'),
+        ('COARSE', 'Coarse Preview', 'Cluster vertices on a 96 cell grid'),
+    ))
+    bpy.types.Scene.zenu_export_separate = bpy.props.BoolProperty(
+        name='Separate Files', default=False, description='Write every exported object to its own STL file')
+    bpy.types.Scene.zenu_export_tubes = bpy.props.BoolProperty(
+        name='Native Tubes', default=False,
+        description='Export curves as tubes built at Tube Tolerance instead of converting their bevel')
     bpy.types.Scene.zenu_pruett_radius = bpy.props.FloatProperty(name='Pruett Radius',
                                                                  soft_min=.1 / divide, soft_max=50 / divide, default=1 / divide,
                                                                  subtype='DISTANCE')
     bpy.types.Scene.zenu_pruett_radius_show = bpy.props.BoolProperty(name='Pruett Radius Show', default=True)
     bpy.types.Scene.zenu_comb_circle_show = bpy.props.BoolProperty(name='Comb Circle', default=False)
+    bpy.types.Scene.zenu_label_block_cache = bpy.props.BoolProperty(
+        name='Cache Readout', default=False, description='Render the L, K, R and Samples readout into a texture '
+                                                           'and redraw it only when one of the values changes')
+    bpy.types.Scene.zenu_profile_show = bpy.props.BoolProperty(name='Frame Timing', default=False,
+                                                               update=update_profile)
 
 
 classes = (
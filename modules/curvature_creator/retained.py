@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from typing import Any
+
+import gpu
+import numpy as np
+from gpu.types import GPUBatch, GPUVertBuf, GPUVertFormat
+
+
+@dataclass
+class RetainedBatch:
+    data: np.ndarray
+    type: str
+    batch: GPUBatch
+    shader: Any
+    color: tuple = (1, 1, 1, 1)
+    line_width: float = 2
+    colors: np.ndarray = None
+
+
+def _same(a: np.ndarray | None, b: np.ndarray | None) -> bool:
+    return a is b or (a is not None and b is not None and np.array_equal(a, b))
+
+
+class RetainedGeometry:
+    """Named persistent batches, uploaded again only when their vertex data changes.
+
+    Submitted geometry stays visible until it is hidden, `flush` draws everything visible grouped by
+    shader so every shader is bound once per frame.
+    """
+    uploads: int = 0
+
+    def __init__(self):
+        self._items: dict[str, RetainedBatch] = {}
+        self._visible: dict[str, None] = {}
+
+    def submit(self, name: str, shader, coords, type: str = 'LINES', color=(1, 1, 1, 1), line_width: float = 2,
+               colors=None):
+        """Keep `name` visible with these vertices, `colors` gives an RGBA per vertex for FLAT_COLOR shaders."""
+        data = np.asarray(coords, dtype=np.float32)
+        colors = None if colors is None else np.asarray(colors, dtype=np.float32)
+        item = self._items.get(name)
+
+        if (item is None or item.type != type or item.shader is not shader or not np.array_equal(item.data, data)
+                or not _same(item.colors, colors)):
+            item = self._upload(name, shader, data, type, colors)
+
+        item.color = color
+        item.line_width = line_width
+        self._visible[name] = None
+
+    def hide(self, *names: str):
+        for name in names:
+            self._visible.pop(name, None)
+
+    def _upload(self, name: str, shader, data: np.ndarray, type: str, colors: np.ndarray = None) -> RetainedBatch:
+        data = np.array(data, dtype=np.float32, order='C')
+        fmt = GPUVertFormat()
+        fmt.attr_add(id='pos', comp_type='F32', len=data.shape[-1], fetch_mode='FLOAT')
+        if colors is not None:
+            colors = np.array(colors, dtype=np.float32, order='C')
+            fmt.attr_add(id='color', comp_type='F32', len=4, fetch_mode='FLOAT')
+        vbo = GPUVertBuf(fmt, len(data))
+        vbo.attr_fill('pos', data)
+        if colors is not None:
+            vbo.attr_fill('color', colors)
+
+        item = RetainedBatch(data=data, type=type, batch=GPUBatch(type=type, buf=vbo), shader=shader, colors=colors)
+        self._items[name] = item
+        self.uploads += 1
+        return item
+
+    def flush(self):
+        """Draw every visible batch."""
+        items = [self._items[name] for name in self._visible]
+        shader = None
+
+        for item in sorted(items, key=lambda i: id(i.shader)):
+            if item.shader is not shader:
+                shader = item.shader
+                shader.bind()
+            if item.colors is None:
+                shader.uniform_float('color', item.color)
+            gpu.state.line_width_set(item.line_width)
+            item.batch.draw(shader)
+
+    def clear(self):
+        self._items.clear()
+        self._visible.clear()
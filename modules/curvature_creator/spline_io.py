@@ -0,0 +1,111 @@
+import bpy
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from .core.handles import auto_handles
+
+ATTRIBUTES = ('handle_left', 'co', 'handle_right')
+# Values of the BezierSplinePoint handle type enum, as read and written by foreach_get/foreach_set.
+HANDLE_TYPES = {'FREE': 0, 'AUTO': 1, 'VECTOR': 2, 'ALIGNED': 3}
+
+
+def write_points(spline: bpy.types.Spline, co: np.ndarray, handle_left: np.ndarray, handle_right: np.ndarray,
+                 handle_type: str = 'AUTO'):
+    """Set (n, 3) points, handles and handle types of a bezier spline, adding points it lacks, one foreach_set each.
+
+    Nothing recalculates the handles afterwards, so they stay exactly as given.
+    """
+    points = spline.bezier_points
+    points.add(len(co) - len(points))
+
+    types = np.full(len(co), HANDLE_TYPES[handle_type], dtype=np.int32)
+    points.foreach_set('handle_left_type', types)
+    points.foreach_set('handle_right_type', types)
+    for attribute, values in zip(ATTRIBUTES, (handle_left, co, handle_right)):
+        points.foreach_set(attribute, np.asarray(values, dtype=np.float32).reshape(-1))
+
+
+def read_radius(spline: bpy.types.Spline) -> np.ndarray:
+    """Radius of every bezier point, the factor Blender scales the bevel by."""
+    radius = np.empty(len(spline.bezier_points), dtype=np.float32)
+    spline.bezier_points.foreach_get('radius', radius)
+    return radius
+
+
+class SplineBuffer:
+    """Preallocated buffers for reading and writing the bezier points of a spline.
+
+    The points are kept interleaved as handle_left, co, handle_right per point, which puts the four
+    control points of segment i (co_i, handle_right_i, handle_left_i+1, co_i+1) next to each other,
+    so the (n - 1, 4, 2) XZ segment array is a strided view instead of a copy.
+    """
+    size: int = -1
+
+    def __init__(self):
+        self._resize(0)
+
+    def _resize(self, count: int):
+        if count == self.size:
+            return
+
+        self.size = count
+        self._raw = np.empty(count * 3, dtype=np.float32)
+        self.points = np.empty((count, 3, 3), dtype=np.float64)
+
+        flat = self.points.reshape(-1)
+        item = flat.itemsize
+        self.segments = as_strided(flat[3:], shape=(max(count - 1, 0), 4, 2), strides=(9 * item, 3 * item, 2 * item),
+                                   writeable=False)
+
+    def read(self, spline: bpy.types.Spline, matrix: np.ndarray = None) -> np.ndarray:
+        """Read every point with foreach_get and return the segment view, valid until the next read."""
+        points = spline.bezier_points
+        self._resize(len(points))
+
+        for index, attribute in enumerate(ATTRIBUTES):
+            points.foreach_get(attribute, self._raw)
+            self.points[:, index] = self._raw.reshape(-1, 3)
+
+        if matrix is not None:
+            self.points[:] = self.points @ matrix[:3, :3].T + matrix[:3, 3]
+        return self.segments
+
+    def write_co(self, spline: bpy.types.Spline, co: np.ndarray, tolerance: float = 0) -> bool:
+        """Set the first len(co) point locations, writing nothing when none of them moved.
+
+        Blender stores float32, so `co` is rounded to float32 before the comparison, otherwise the rounding
+        alone would count as a move on every call.
+        """
+        points = spline.bezier_points
+        self._resize(len(points))
+        points.foreach_get('co', self._raw)
+
+        co = np.asarray(co, dtype=np.float32)[:len(points)]
+        current = self._raw.reshape(-1, 3)[:len(co)]
+        if np.all(np.abs(current - co) <= tolerance):
+            return False
+
+        current[:] = co
+        points.foreach_set('co', self._raw)
+        # foreach_set skips the RNA update, assigning one point runs it once for the whole spline:
+        # handles are recalculated for their types and the curve is tagged for the depsgraph.
+        points[0].co = points[0].co
+        return True
+
+
+def create_curve_objects(points: np.ndarray, collection: bpy.types.Collection,
+                         name: str = 'Curve Creator') -> list[bpy.types.Object]:
+    """A curve object with AUTO handles per (n, 3) row of `points`, the handles of all rows computed at once."""
+    handle_left, handle_right = auto_handles(points)
+    objects = []
+    for co, left, right in zip(points, handle_left, handle_right):
+        curve_data = bpy.data.curves.new('myCurve', type='CURVE')
+        curve_data.dimensions = '3D'
+        curve_data.resolution_u = 12
+        curve_data.bevel_depth = 0.001
+        write_points(curve_data.splines.new('BEZIER'), co, left, right)
+
+        obj = bpy.data.objects.new(name, curve_data)
+        collection.objects.link(obj)
+        objects.append(obj)
+    return objects
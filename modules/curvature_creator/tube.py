@@ -0,0 +1,44 @@
+import bpy
+
+
+class ZENU_OT_build_tube(bpy.types.Operator):
+    """Sweep a mesh tube along every selected curve, with rings placed by curvature and Tube Tolerance"""
+    bl_label = 'Build Tube Mesh'
+    bl_idname = 'zenu.build_tube'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context: bpy.types.Context):
+        return context.mode == 'OBJECT' and any(i.type == 'CURVE' for i in context.selected_objects)
+
+    def execute(self, context: bpy.types.Context):
+        from .mesh_io import build_tube_mesh, curve_tubes
+
+        scene = context.scene
+        created = []
+        for obj in [i for i in context.selected_objects if i.type == 'CURVE']:
+            tubes = curve_tubes(obj, scene.zenu_tube_tolerance, scene.zenu_active_curve_bevel)
+            if not tubes:
+                continue
+            name = f'{obj.name} Tube'
+            mesh_obj = bpy.data.objects.new(name, build_tube_mesh(name, tubes))
+            mesh_obj.matrix_world = obj.matrix_world
+            for collection in obj.users_collection:
+                collection.objects.link(mesh_obj)
+            obj.select_set(False)
+            created.append(mesh_obj)
+
+        if not created:
+            self.report({'WARNING'}, 'No bezier splines to build tubes from')
+            return {'CANCELLED'}
+        for obj in created:
+            obj.select_set(True)
+        context.view_layer.objects.active = created[-1]
+        faces = sum(len(i.data.polygons) for i in created)
+        self.report({'INFO'}, f'{len(created)} tube(s), {faces} faces')
+        return {'FINISHED'}
+
+
+classes = (
+    ZENU_OT_build_tube,
+)
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# The numerical core needs only NumPy, import it as a top-level package instead of through the add-on, whose
+# __init__ imports bpy.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'modules',
+                                'curvature_creator'))
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    return np.random.default_rng(0)
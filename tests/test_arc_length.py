@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from core.arc_length import arc_length_table, gauss_length
+from core.bezier import positions
+from core.cache import SegmentCache
+from core.sampling import arc_length_samples
+
+SEGMENTS = np.array((
+    ((0, 0), (.01, .02), (.03, -.01), (.04, .01)),
+    # Straight, with uneven handles, 4 cm long.
+    ((0, 0), (.005, 0), (.03, 0), (.04, 0)),
+    # Self-intersecting loop, the speed varies a lot.
+    ((0, 0), (.03, .02), (-.01, .02), (.02, 0)),
+    # Handles on the end points, the speed drops to 0 at both ends.
+    ((0, 0), (0, 0), (.02, .01), (.02, .01)),
+))
+
+
+def polyline_lengths(segments: np.ndarray, steps: int = 20000) -> np.ndarray:
+    points = positions(segments, np.linspace(0, 1, steps + 1))
+    return np.linalg.norm(np.diff(points, axis=1), axis=-1).sum(axis=1)
+
+
+def test_lengths_match_dense_polyline():
+    table = arc_length_table(SEGMENTS, cache=SegmentCache())
+    np.testing.assert_allclose(table.lengths, polyline_lengths(SEGMENTS), rtol=1e-7)
+    np.testing.assert_allclose(table.lengths[1], .04)
+    np.testing.assert_allclose(table.lengths[3], np.hypot(.02, .01))
+    assert table.length == table.lengths.sum()
+
+
+def test_t_at_inverts_length():
+    table = arc_length_table(SEGMENTS, cache=SegmentCache())
+    segment = np.repeat(np.arange(len(SEGMENTS)), 9)
+    s = (table.lengths[:, None] * np.linspace(0, 1, 9)).ravel()
+    t = table.t_at(segment, s, iterations=3)
+    for index in range(len(segment)):
+        curve = SEGMENTS[segment[index]:segment[index] + 1]
+        partial = positions(curve, np.linspace(0, t[index], 4001))
+        np.testing.assert_allclose(np.linalg.norm(np.diff(partial, axis=1), axis=-1).sum(), s[index], rtol=1e-6,
+                                   atol=1e-12)
+
+
+def test_t_at_clamps_to_the_segment():
+    table = arc_length_table(SEGMENTS, cache=SegmentCache())
+    np.testing.assert_array_equal(table.t_at(np.array((1, 1)), np.array((-1, 1))), (0, 1))
+
+
+def test_collapsed_segment_has_no_length():
+    point = np.full((1, 4, 2), .01)
+    table = arc_length_table(point, cache=SegmentCache())
+    np.testing.assert_allclose(table.length, 0, atol=1e-15)
+    assert table.t_at(np.array((0,)), np.array((0.,)))[0] == 0
+
+
+# The tangent at a handle sitting on its end point is 0 / 0.
+@pytest.mark.filterwarnings('ignore:invalid value:RuntimeWarning')
+@pytest.mark.parametrize('steps', (1, 10))
+def test_arc_length_samples_are_even(steps):
+    for segment, samples in zip(SEGMENTS, arc_length_samples(SEGMENTS, steps)):
+        assert samples.t[0] == 0 and samples.t[-1] == 1
+        s = gauss_length(segment[None], np.zeros((1, len(samples.t))), samples.t[None])[0]
+        # A single Newton step per sample, the loop is off by about 1e-4 of its length.
+        np.testing.assert_allclose(s / s[-1], np.linspace(0, 1, steps + 1), atol=2e-4)
@@ -0,0 +1,23 @@
+"""The cases of core.benchmark as pytest-benchmark runs, compare against a saved run with
+
+    python -m pytest tests/test_benchmark.py --benchmark-autosave
+    python -m pytest tests/test_benchmark.py --benchmark-compare --benchmark-compare-fail=mean:20%
+"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from core.benchmark import cases  # noqa: E402
+
+SPLINE_SIZE = 500
+CASES = cases(SPLINE_SIZE)
+# raw_write is the file write of stl_write alone, they go in one table.
+GROUPS = {'raw_write': 'stl'}
+
+
+@pytest.mark.parametrize('name', CASES)
+def test_benchmark(benchmark, name):
+    func, items = CASES[name]
+    benchmark.group = GROUPS.get(name, name.split('_')[0])
+    benchmark.extra_info['items'] = items
+    benchmark(func)
@@ -0,0 +1,34 @@
+import numpy as np
+
+from core.bezier import Bezier, evaluate
+
+SEGMENTS = np.array((
+    ((0, 0), (.01, .02), (.03, -.01), (.04, .01)),
+    # Straight, with uneven handles.
+    ((0, 0), (.005, 0), (.03, 0), (.04, 0)),
+    # Self-intersecting loop, the curvature peaks sharply.
+    ((0, 0), (.03, .02), (-.01, .02), (.02, 0)),
+))
+
+
+def test_batch_matches_scalar():
+    t = np.linspace(0, 1, 11)
+    samples = evaluate(SEGMENTS, t)
+    for index, segment in enumerate(SEGMENTS):
+        bezier = Bezier(*segment)
+        for column, value in enumerate(t):
+            np.testing.assert_allclose(samples.position[index, column], bezier.position(value), atol=1e-12)
+            np.testing.assert_allclose(samples.curvature[index, column], bezier.curvature(value), rtol=1e-9,
+                                       atol=1e-9)
+
+
+def test_straight_segment_has_no_curvature():
+    np.testing.assert_array_equal(evaluate(SEGMENTS[1:2], np.linspace(0, 1, 11)).curvature, 0)
+
+
+def test_quarter_circle_curvature():
+    # Cubic approximation of a unit quarter circle, its curvature stays within a few percent of 1.
+    k = 4 / 3 * (np.sqrt(2) - 1)
+    segment = np.array((((1, 0), (1, k), (k, 1), (0, 1)),), dtype=float)
+    curvature = evaluate(segment, np.linspace(0, 1, 101)).curvature
+    np.testing.assert_allclose(curvature, 1, rtol=.025)
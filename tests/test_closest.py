@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from core.bezier import Bezier, closest_t, positions
+from core.closest import SegmentIndex
+
+
+def spiral(count: int, turns: float = 2) -> np.ndarray:
+    """Planar spiral of `count` segments, radius growing from 1 to 3 cm, so far apart segments pass close by."""
+    angle = np.linspace(0, 2 * np.pi * turns, count + 1)
+    radius = np.linspace(.01, .03, count + 1)
+    co = np.stack((np.cos(angle), np.sin(angle)), axis=1) * radius[:, None]
+    tangent = np.gradient(co, axis=0) / 3
+    return np.stack((co[:-1], co[:-1] + tangent[:-1], co[1:] - tangent[1:], co[1:]), axis=1)
+
+
+def with_degenerate(segments: np.ndarray) -> np.ndarray:
+    """Insert a segment collapsed to a point and a straight one with handles on its points."""
+    joint = segments[0, -1]
+    collapsed = np.repeat(joint[None], 4, axis=0)
+    end = joint + (.01, 0)
+    straight = np.array((joint, joint, end, end))
+    return np.concatenate((segments[:1], collapsed[None], straight[None], segments[1:] - segments[1, 0] + end))
+
+
+def dense_distance(segments: np.ndarray, point: np.ndarray) -> float:
+    return float(np.linalg.norm(positions(segments, np.linspace(0, 1, 4001)) - point, axis=-1).min())
+
+
+@pytest.mark.parametrize('segments', (spiral(1), spiral(7), spiral(100, turns=5), with_degenerate(spiral(20))),
+                         ids=('single', 'few', 'many', 'degenerate'))
+def test_query_matches_dense_scan(segments, rng):
+    index = SegmentIndex(segments)
+    low, high = segments.min(axis=(0, 1)) - .01, segments.max(axis=(0, 1)) + .01
+    for point in rng.uniform(low, high, (30, 2)):
+        closest = index.query(point)
+        brute = dense_distance(segments, point)
+        assert brute - 1e-6 <= closest.distance <= brute + 1e-12
+        np.testing.assert_allclose(positions(segments[closest.segment:closest.segment + 1], closest.t)[0, 0],
+                                   closest.point)
+        np.testing.assert_allclose(np.linalg.norm(closest.point - point), closest.distance)
+
+
+def test_points_on_the_curve_and_far_away():
+    segments = spiral(50, turns=3)
+    index = SegmentIndex(segments)
+    for segment, t in ((0, 0), (17, .3), (49, 1)):
+        point = positions(segments[segment:segment + 1], t)[0, 0]
+        assert index.query(point).distance < 1e-12
+    # From far away only the outer end of the spiral is near.
+    closest = index.query(segments[-1, -1] * 100)
+    assert closest.segment == len(segments) - 1 and closest.t == 1
+
+
+def test_space_curve():
+    angle = np.linspace(0, 4 * np.pi, 17)
+    co = np.stack((np.cos(angle), np.sin(angle), angle / 10), axis=1) * .02
+    tangent = np.gradient(co, axis=0) / 3
+    segments = np.stack((co[:-1], co[:-1] + tangent[:-1], co[1:] - tangent[1:], co[1:]), axis=1)
+    index = SegmentIndex(segments)
+    # On the axis of the helix every turn is about as close, the index must still find the best.
+    for point in ((0, 0, .01), (0, 0, .03), (.01, .01, .02)):
+        point = np.array(point)
+        assert index.query(point).distance <= dense_distance(segments, point) + 1e-12
+
+
+def test_closest_t_matches_dense_scan(rng):
+    segments = with_degenerate(spiral(4))
+    dense = np.linspace(0, 1, 20001)
+    samples = positions(segments, dense)
+    for point in rng.uniform(-.03, .03, (20, 2)):
+        distance = np.linalg.norm(samples - point, axis=-1)
+        segment, column = np.unravel_index(distance.argmin(), distance.shape)
+        bezier = Bezier(*segments[segment])
+        t = closest_t(segments[segment:segment + 1], point, np.array((dense[column],)))[0]
+        assert np.linalg.norm(bezier.position(t) - point) <= distance.min() + 1e-12
+        assert np.linalg.norm(bezier.position(bezier.closest(point)) - point) <= distance.min() + 1e-12
+
+
+def test_arc_length_and_curvature():
+    straight = np.array((((0, 0), (.01, 0), (.02, 0), (.03, 0)), ((.03, 0), (.04, 0), (.05, 0), (.06, 0))))
+    index = SegmentIndex(straight)
+    np.testing.assert_allclose(index.arc_length(1, .5), (.045, .06))
+    assert index.arc_length(0, 0)[0] == 0
+    assert index.curvature(1, .5) == 0
+
+    k = 4 / 3 * (np.sqrt(2) - 1) * .02
+    arc = SegmentIndex(np.array((((.02, 0), (.02, k), (k, .02), (0, .02)),)))
+    np.testing.assert_allclose(arc.curvature(0, .5), 50, rtol=.025)
+
+
+def test_empty():
+    index = SegmentIndex(np.empty((0, 4, 2)))
+    assert len(index) == 0 and index.query((0, 0)) is None
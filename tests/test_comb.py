@@ -0,0 +1,66 @@
+import numpy as np
+
+from core.cache import SegmentCache
+from core.comb import CombSettings, comb_samples, joint_report
+
+SEGMENTS = np.array((
+    ((0, 0), (.01, .02), (.03, -.01), (.04, .01)),
+    ((.04, .01), (.05, .03), (.06, .02), (.07, .02)),
+))
+
+
+def test_cache_ignores_settings_of_other_modes():
+    cache = SegmentCache()
+    comb_samples(SEGMENTS, CombSettings(scale=5e-6), cache=cache)
+    comb_samples(SEGMENTS, CombSettings(scale=5e-6, tolerance=1e-5, min_samples=6, max_samples=50), cache=cache)
+    assert len(cache) == len(SEGMENTS)
+    comb_samples(SEGMENTS, CombSettings(scale=5e-6, mode='ADAPTIVE'), cache=cache)
+    comb_samples(SEGMENTS, CombSettings(scale=5e-6, mode='ADAPTIVE', steps=10), cache=cache)
+    assert len(cache) == 2 * len(SEGMENTS)
+
+
+def test_cache_hits_only_unchanged_segments():
+    cache = SegmentCache()
+    settings = CombSettings(scale=5e-6)
+    first = comb_samples(SEGMENTS, settings, cache=cache)
+    moved = SEGMENTS.copy()
+    moved[1, 2] += .001
+    second = comb_samples(moved, settings, cache=cache)
+    assert second[0] is first[0] and second[1] is not first[1]
+    assert len(cache) == 3
+
+
+def quarter_arc(radius: float, start: float) -> np.ndarray:
+    """Cubic of a quarter circle around the origin from angle `start`, counter-clockwise."""
+    angle = np.array((start, start + np.pi / 2))
+    co = np.stack((np.cos(angle), np.sin(angle)), axis=1) * radius
+    tangent = np.stack((-np.sin(angle), np.cos(angle)), axis=1) * radius * 4 / 3 * (np.sqrt(2) - 1)
+    return np.array((co[0], co[0] + tangent[0], co[1] - tangent[1], co[1]))
+
+
+def test_joint_report():
+    arc = np.array((quarter_arc(.02, 0), quarter_arc(.02, np.pi / 2)))
+    end = arc[-1, -1]
+    # Straight on along the tangent at the end of the arcs, then once more.
+    straight = end + np.outer(np.arange(4), (0, -.01))
+    segments = np.concatenate((arc, straight[None], straight[None] + (0, -.03), arc))
+    combs = comb_samples(segments, CombSettings(scale=5e-6), cache=SegmentCache())
+
+    # The second arc starts a new spline, its joint with the straight segments is no G2 break.
+    report = joint_report(combs, np.array((0, 4, len(segments))), .01)
+    # Arc into arc keeps the curvature, arc into straight loses all of it, straight into straight is 0 / 0.
+    assert report.segment.tolist() == [1]
+    np.testing.assert_allclose(report.jump, 1)
+    assert report.max_jump == report.jump.max()
+    assert len(joint_report(combs, np.array((0, 4, len(segments))), 1).segment) == 0
+
+
+def test_joint_report_is_relative():
+    segments = np.array((quarter_arc(.02, 0), quarter_arc(.01, np.pi / 2) + (-.01, .01)))
+    offsets = np.array((0, len(segments)))
+    small = joint_report(comb_samples(segments, CombSettings(scale=5e-6), cache=SegmentCache()), offsets, 0)
+    # Half the radius doubles the curvature, a jump of half the larger |k|.
+    np.testing.assert_allclose(small.jump, .5, rtol=1e-3)
+    # Scaling the curve scales every curvature, not the relative jumps.
+    large = joint_report(comb_samples(segments * 1000, CombSettings(scale=5e-3), cache=SegmentCache()), offsets, 0)
+    np.testing.assert_allclose(large.jump, small.jump, rtol=1e-9)
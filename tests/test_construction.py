@@ -0,0 +1,63 @@
+import math
+
+import numpy as np
+import pytest
+
+from core.construction import construct, pruett_circle, read_table, xy2xz_array
+
+
+def test_construct_distances():
+    geometry = construct(.03, math.radians(20), .02, math.radians(30), .015)
+    np.testing.assert_allclose(geometry.a, (0, .03))
+    np.testing.assert_allclose(np.linalg.norm(geometry.b - geometry.a), .02)
+    np.testing.assert_allclose(np.linalg.norm(geometry.c - geometry.b), .015)
+
+
+def test_construct_broadcasts(rng):
+    params = rng.uniform((.01, -1, .005, -1, .005), (.05, 1, .04, 1, .04), (50, 5))
+    batch = construct(*params.T).points
+    for row, values in zip(batch, params):
+        np.testing.assert_allclose(row, construct(*values).points)
+
+
+def test_pruett_circle_is_tangent():
+    geometry = construct(.03, .3, .02, .5, .02)
+    circle = pruett_circle(geometry.a, geometry.b, geometry.c, .5, .001)
+    for start, end in ((geometry.a, geometry.b), (geometry.b, geometry.c)):
+        direction = (end - start) / np.linalg.norm(end - start)
+        offset = circle.center - start
+        distance = abs(offset[0] * direction[1] - offset[1] * direction[0])
+        np.testing.assert_allclose(distance, circle.radius)
+
+
+def test_read_table(tmp_path):
+    path = tmp_path / 'table.csv'
+    # Blank lines are skipped.
+    path.write_text('height,b angle,b distance,c angle,c distance\n30,20,20,30,15\n\n25,0,10,-10,12\n')
+    geometry = read_table(str(path))
+    assert geometry.points.shape == (2, 3, 2)
+    np.testing.assert_allclose(geometry.points[0], construct(.03, math.radians(20), .02, math.radians(30),
+                                                             .015).points)
+    np.testing.assert_allclose(geometry.points[1], construct(.025, 0, .01, math.radians(-10), .012).points)
+    assert xy2xz_array(geometry.points).shape == (2, 3, 3)
+
+    path.write_text('height,b angle,b distance,c angle,c distance\n30,20,20,30,15\n')
+    assert read_table(str(path)).points.shape == (1, 3, 2)
+
+
+@pytest.mark.parametrize('text, message', (
+    ('height\n', 'no rows'),
+    ('height\n1,2\n', '5 columns'),
+    ('height\n1,2,3,4,5\n1,2,3\n', 'columns'),
+    ('height\n1,x,3,4,5\n', 'convert'),
+))
+def test_read_table_rejects(tmp_path, text, message):
+    path = tmp_path / 'table.csv'
+    path.write_text(text)
+    with pytest.raises(ValueError, match=message):
+        read_table(str(path))
+
+
+def test_read_missing_table(tmp_path):
+    with pytest.raises(OSError):
+        read_table(str(tmp_path / 'missing.csv'))
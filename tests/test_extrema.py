@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from core.bezier import evaluate
+from core.extrema import curvature_extrema, max_curvature, segment_max_curvature, spline_max_curvature
+
+SEGMENTS = np.array((
+    ((0, 0), (.01, .02), (.03, -.01), (.04, .01)),
+    # Self-intersecting loop, the curvature peaks sharply.
+    ((0, 0), (.03, .02), (-.01, .02), (.02, 0)),
+    # Symmetric arch, pointed at t = 0.5.
+    ((0, 0), (.019, .02), (.021, .02), (.04, 0)),
+    # Parabola y = 50 x^2 from its vertex, the largest |k| is at t = 0 and not at a root.
+    ((0, 0), (.02 / 3, 0), (.04 / 3, .02 / 3), (.02, .02)),
+    # Straight, with uneven handles.
+    ((0, 0), (.005, 0), (.03, 0), (.04, 0)),
+))
+
+
+def dense_curvature(segments: np.ndarray) -> np.ndarray:
+    return evaluate(segments, np.linspace(0, 1, 20001)).curvature
+
+
+def test_segment_maximum_beats_dense_scan():
+    t, curvature = segment_max_curvature(SEGMENTS)
+    dense = np.abs(dense_curvature(SEGMENTS)).max(axis=1)
+    # The roots are exact, a dense scan can only come close from below.
+    assert np.all(np.abs(curvature) >= dense * (1 - 1e-12))
+    np.testing.assert_allclose(np.abs(curvature), dense, rtol=1e-6)
+    np.testing.assert_allclose(evaluate(SEGMENTS[:, None][np.arange(len(t)), 0], t[:, None]).curvature[:, 0],
+                               curvature)
+
+
+def test_known_extrema():
+    t, curvature = segment_max_curvature(SEGMENTS)
+    np.testing.assert_allclose(t[2], .5)
+    np.testing.assert_allclose(curvature_extrema(SEGMENTS[2:3])[0], (.5,))
+    assert t[3] == 0
+    np.testing.assert_allclose(curvature[3], 100)
+    assert curvature[4] == 0 and len(curvature_extrema(SEGMENTS[4:])[0]) == 0
+
+
+def test_straight_segments_have_no_extrema():
+    angle = .7
+    rotation = np.array(((np.cos(angle), -np.sin(angle)), (np.sin(angle), np.cos(angle))))
+    # Rotated, dk/dt is rounding noise instead of exactly 0.
+    for segment in (SEGMENTS[4], SEGMENTS[4] @ rotation.T + (.013, .021)):
+        assert len(curvature_extrema(segment[None])[0]) == 0
+
+
+@pytest.mark.filterwarnings('ignore:invalid value:RuntimeWarning')
+def test_collapsed_segment_has_no_curvature():
+    # The tangent of a segment collapsed to a point is 0 / 0, it must not win over a real maximum.
+    segments = np.concatenate((SEGMENTS[2:3], np.full((1, 4, 2), .01)))
+    assert segment_max_curvature(segments)[1][1] == 0
+    assert max_curvature(segments).segment == 0
+
+
+def test_spline_maximum():
+    extremum = max_curvature(SEGMENTS)
+    assert extremum.segment == 1
+    assert abs(extremum.curvature) == np.abs(segment_max_curvature(SEGMENTS)[1]).max()
+    np.testing.assert_allclose(abs(extremum.curvature), np.abs(dense_curvature(SEGMENTS)).max(), rtol=1e-6)
+    np.testing.assert_allclose(extremum.radius, 1 / abs(extremum.curvature))
+
+
+def test_packed_splines_stay_separate():
+    # The loop is in the middle spline, the last spline is only the straight segment.
+    offsets = np.array((0, 1, 4, len(SEGMENTS)))
+    extrema = spline_max_curvature(SEGMENTS, offsets)
+    assert [i.segment for i in extrema] == [0, 1, 4]
+    for (start, stop), extremum in zip(zip(offsets, offsets[1:]), extrema):
+        assert extremum.curvature == max_curvature(SEGMENTS[start:stop]).curvature
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from core.bezier import segments_from_points
+from core.fairing import curvature_energy, fair
+
+
+def cross(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+def wobbly_spline(count: int = 8) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Points on a gentle arc with aligned handles of uneven length, plenty to fair."""
+    x = np.linspace(0, .04, count)
+    co = np.stack((x, .2 * x * (.04 - x) * 50), axis=1)
+    tangent = np.gradient(co, axis=0) / 3
+    uneven = np.linspace(.5, 1.5, count)[:, None]
+    return co, co - tangent * uneven[::-1], co + tangent * uneven
+
+
+def test_energy_gradient_matches_finite_differences(rng):
+    segments = segments_from_points(*wobbly_spline())
+    _, gradient = curvature_energy(segments)
+    step = 1e-9
+    for _ in range(10):
+        index = tuple(rng.integers(0, i) for i in segments.shape)
+        moved = segments.copy()
+        moved[index] += step
+        forward = curvature_energy(moved)[0]
+        moved[index] -= 2 * step
+        backward = curvature_energy(moved)[0]
+        np.testing.assert_allclose(gradient[index], (forward - backward) / (2 * step), rtol=1e-4,
+                                   atol=1e-6 * np.abs(gradient).max())
+
+
+@pytest.mark.parametrize('keep_co, keep_g1', ((True, True), (True, False), (False, True), (False, False)))
+def test_fairing_lowers_energy(keep_co, keep_g1):
+    co, handle_left, handle_right = wobbly_spline()
+    result = fair(co, handle_left, handle_right, keep_co=keep_co, keep_g1=keep_g1, iterations=50)
+
+    assert result.energy_after < result.energy_before
+    energy, _ = curvature_energy(segments_from_points(result.co, result.handle_left, result.handle_right))
+    np.testing.assert_allclose(energy, result.energy_after)
+    np.testing.assert_array_equal(result.co[[0, -1]], co[[0, -1]])
+    if keep_co:
+        np.testing.assert_array_equal(result.co, co)
+    if keep_g1:
+        left = result.co - result.handle_left
+        right = result.handle_right - result.co
+        np.testing.assert_allclose(cross(left, right), 0, atol=1e-12)
+        assert np.all(np.einsum('ij,ij->i', left, right) > 0)
+
+
+def test_straight_spline_stays():
+    co = np.stack((np.linspace(0, .03, 4), np.zeros(4)), axis=1)
+    step = np.array((.01 / 3, 0))
+    result = fair(co, co - step, co + step)
+    assert result.energy_before == result.energy_after == 0
+    np.testing.assert_array_equal(result.handle_right, co + step)
+
+
+def test_single_segment_and_single_point():
+    co, handle_left, handle_right = (i[[0, -1]] for i in wobbly_spline())
+    result = fair(co, handle_left, handle_right, keep_co=False)
+    assert result.energy_after <= result.energy_before
+    np.testing.assert_array_equal(result.co, co)
+
+    result = fair(co[:1], handle_left[:1], handle_right[:1])
+    assert result.iterations == 0
+    np.testing.assert_array_equal(result.handle_left, handle_left[:1])
@@ -0,0 +1,43 @@
+import numpy as np
+
+from core.handles import AUTO_HANDLE_FACTOR, auto_handles
+
+
+def cross(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+def test_handles_are_aligned():
+    co = np.array(((0, 0), (1, 1), (2, 0), (3, 2)), dtype=float)
+    left, right = auto_handles(co)
+    np.testing.assert_allclose(cross(co - left, right - co), 0, atol=1e-12)
+    assert np.all(np.einsum('ij,ij->i', co - left, right - co) > 0)
+
+
+def test_straight_line():
+    # Two points are a straight segment too, the ends mirror their neighbour.
+    for co in (np.array(((0, 0), (3, 0))), np.array(((0, 0), (1, 0), (2, 0), (3, 0)))):
+        left, right = auto_handles(co)
+        step = (co[1, 0] - co[0, 0]) / AUTO_HANDLE_FACTOR
+        np.testing.assert_allclose(left, co - (step, 0))
+        np.testing.assert_allclose(right, co + (step, 0))
+
+
+def test_coincident_points_collapse_handles():
+    co = np.array(((0, 0), (1, 0), (1, 0), (2, 1)), dtype=float)
+    left, right = auto_handles(co)
+    assert np.all(np.isfinite(left)) and np.all(np.isfinite(right))
+    # Back and forth cancels the direction, the handles of a reversal sit on the point.
+    reversal = np.array(((0, 0), (1, 0), (0, 0)), dtype=float)
+    left, right = auto_handles(reversal)
+    np.testing.assert_array_equal(left[1], reversal[1])
+    np.testing.assert_array_equal(right[1], reversal[1])
+
+
+def test_splines_are_handled_independently(rng):
+    co = rng.random((5, 6, 3))
+    left, right = auto_handles(co)
+    for index in range(len(co)):
+        single = auto_handles(co[index])
+        np.testing.assert_allclose(left[index], single[0])
+        np.testing.assert_allclose(right[index], single[1])
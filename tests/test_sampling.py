@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from core.bezier import evaluate
+from core.sampling import adaptive_samples, chord_error, comb_points, uniform_samples
+
+SCALE = 5e-6
+
+SEGMENTS = np.array((
+    ((0, 0), (.01, .02), (.03, -.01), (.04, .01)),
+    # Straight, with uneven handles.
+    ((0, 0), (.005, 0), (.03, 0), (.04, 0)),
+    # Self-intersecting loop, the curvature peaks sharply.
+    ((0, 0), (.03, .02), (-.01, .02), (.02, 0)),
+))
+
+
+def test_uniform_samples():
+    samples = uniform_samples(SEGMENTS, 8)
+    assert len(samples) == len(SEGMENTS)
+    for segment, sample in zip(SEGMENTS, samples):
+        np.testing.assert_array_equal(sample.t, np.linspace(0, 1, 9))
+        np.testing.assert_allclose(sample.position, evaluate(segment[None], sample.t).position[0])
+
+
+def test_adaptive_samples_within_tolerance():
+    tolerance = 1e-6
+    for segment, sample in zip(SEGMENTS, adaptive_samples(SEGMENTS, SCALE, tolerance, max_samples=1000)):
+        assert sample.t[0] == 0 and sample.t[-1] == 1 and np.all(np.diff(sample.t) > 0)
+        # Midpoints of every interval are within the tolerance of the chord, for the curve and its comb.
+        mid = evaluate(segment[None], (sample.t[1:] + sample.t[:-1]) / 2)
+        assert chord_error(mid.position[0], sample.position[:-1], sample.position[1:]).max() <= tolerance
+        comb = comb_points(sample, SCALE)
+        assert chord_error(comb_points(mid, SCALE)[0], comb[:-1], comb[1:]).max() <= tolerance
+
+
+def test_adaptive_samples_follow_curvature():
+    counts = [len(i.t) for i in adaptive_samples(SEGMENTS, SCALE, 1e-6, min_samples=4, max_samples=1000)]
+    # Nothing bends on the straight segment, the loop needs the most samples.
+    assert counts[1] == 4
+    assert counts[2] == max(counts)
+
+
+def test_chord_error():
+    start, end = np.array(((0., 0), (0, 0))), np.array(((2., 0), (0, 0)))
+    np.testing.assert_allclose(chord_error(np.array(((1.5, 0), (3, 4))), start, end), (0, 5))
+    # Past the end of the chord the distance is to its end point.
+    np.testing.assert_allclose(chord_error(np.array(((5., 4),)), start[:1], end[:1]), 5)
+
+
+# The tangent of a segment collapsed to a point is 0 / 0.
+@pytest.mark.filterwarnings('ignore:invalid value:RuntimeWarning')
+def test_collapsed_segment_is_not_refined():
+    point = np.full((1, 4, 2), .01)
+    assert len(adaptive_samples(point, SCALE, 1e-12, min_samples=4).pop().t) == 4
+
+
+@pytest.mark.parametrize('min_samples, max_samples', ((3, 40), (2, 2), (10, 5)))
+def test_adaptive_samples_respect_limits(min_samples, max_samples):
+    for sample in adaptive_samples(SEGMENTS, SCALE, 1e-12, min_samples=min_samples, max_samples=max_samples):
+        assert min_samples <= len(sample.t) <= max(min_samples, max_samples)
@@ -0,0 +1,146 @@
+import io
+
+import numpy as np
+import pytest
+
+from core import stl
+
+# Unit cube, two triangles per side wound counter-clockwise seen from outside.
+CUBE = np.array([
+    [corners[0], corners[1], corners[2]] for side in (
+        ((0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)), ((0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)),
+        ((0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)), ((0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0)),
+        ((0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0)), ((1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)),
+    ) for corners in (side[:3], side[2:] + side[:1])
+], dtype=np.float32)
+CUBE_NORMALS = np.repeat(((0, 0, -1), (0, 0, 1), (0, -1, 0), (0, 1, 0), (-1, 0, 0), (1, 0, 0)), 2, axis=0)
+# Collinear corners and a triangle collapsed to a point have no normal.
+DEGENERATE = np.array((((0, 0, 0), (1, 1, 1), (2, 2, 2)), ((1, 2, 3), (1, 2, 3), (1, 2, 3))), dtype=np.float32)
+
+
+def records(data: bytes) -> np.ndarray:
+    assert np.frombuffer(data[stl.HEADER_SIZE:stl.HEADER_SIZE + 4], dtype='<u4')[0] == \
+        (len(data) - stl.HEADER_SIZE - 4) // stl.STL_DTYPE.itemsize
+    return np.frombuffer(data, dtype=stl.STL_DTYPE, offset=stl.HEADER_SIZE + 4)
+
+
+def write(triangles, **kwargs) -> bytes:
+    file = io.BytesIO()
+    stl.write_binary(file, triangles, **kwargs)
+    return file.getvalue()
+
+
+def test_facet_normals():
+    np.testing.assert_array_equal(stl.facet_normals(CUBE), CUBE_NORMALS)
+    np.testing.assert_array_equal(stl.facet_normals(DEGENERATE), 0)
+    assert stl.facet_normals(np.empty((0, 3, 3))).shape == (0, 3)
+
+
+def test_facet_normals_are_unit_length(rng):
+    # Tiny triangles, a millimetre model in metres, must not lose their normal.
+    triangles = (rng.random((1000, 3, 3)) * 1e-5).astype(np.float32)
+    np.testing.assert_allclose(np.linalg.norm(stl.facet_normals(triangles), axis=1), 1, rtol=1e-5)
+
+
+@pytest.mark.parametrize('chunk_size', (1, 5, 12, stl.CHUNK_SIZE))
+def test_records(chunk_size):
+    # Several chunks, a partial last one and an empty part in the list.
+    parts = [CUBE[:7], np.empty((0, 3, 3), dtype=np.float32), CUBE[7:], DEGENERATE]
+    data = write(parts, header=b'cube', chunk_size=chunk_size)
+    assert data[:stl.HEADER_SIZE] == b'cube'.ljust(stl.HEADER_SIZE, b'\0')
+
+    written = records(data)
+    np.testing.assert_array_equal(written['vertices'], np.concatenate((CUBE, DEGENERATE)))
+    np.testing.assert_array_equal(written['normal'], np.concatenate((CUBE_NORMALS, np.zeros((2, 3)))))
+    np.testing.assert_array_equal(written['attribute'], 0)
+
+
+def test_double_precision_input(rng):
+    triangles = rng.random((100, 3, 3))
+    written = records(write(triangles, chunk_size=32))
+    np.testing.assert_array_equal(written['vertices'], triangles.astype(np.float32))
+    np.testing.assert_allclose(written['normal'], stl.facet_normals(triangles), atol=1e-5)
+
+
+def test_empty():
+    file = io.BytesIO()
+    assert stl.write_binary(file, np.empty((0, 3, 3), dtype=np.float32)) == 0
+    assert stl.write_binary(io.BytesIO(), []) == 0
+    assert len(records(file.getvalue())) == 0
+
+
+def test_header_is_cut_to_size():
+    data = write(CUBE[:1], header=b'x' * 100)
+    assert len(data) == stl.HEADER_SIZE + 4 + stl.STL_DTYPE.itemsize
+    assert data[:stl.HEADER_SIZE] == b'x' * stl.HEADER_SIZE
+
+
+def test_read_binary(tmp_path):
+    path = tmp_path / 'cube.stl'
+    path.write_bytes(write(CUBE, header=b'solid but binary'))
+    np.testing.assert_array_equal(stl.read(str(path)), CUBE)
+
+    path.write_bytes(write(CUBE[:0]))
+    assert stl.read(str(path)).shape == (0, 3, 3)
+
+
+def test_read_rejects_truncated_binary(tmp_path):
+    path = tmp_path / 'short.stl'
+    path.write_bytes(write(CUBE)[:-1])
+    assert stl.read_binary(str(path)) is None
+    path.write_bytes(b'\0' * 10)
+    assert stl.read_binary(str(path)) is None
+
+
+def test_read_ascii(tmp_path):
+    path = tmp_path / 'ascii.stl'
+    path.write_text('solid test\n facet normal 0 0 1\n  outer loop\n   vertex 0 0 0\n   vertex 1 0 0\n'
+                    '   vertex 0 1 0\n  endloop\n endfacet\n facet normal 0 0 1\n  outer loop\n   vertex 1 0 0\n'
+                    '   vertex 1e0 1 0\n   vertex -0.5 1 0\n  endloop\n endfacet\nendsolid test\n')
+    np.testing.assert_array_equal(stl.read(str(path)), (((0, 0, 0), (1, 0, 0), (0, 1, 0)),
+                                                        ((1, 0, 0), (1, 1, 0), (-.5, 1, 0))))
+    path.write_text('solid empty\nendsolid empty\n')
+    assert stl.read(str(path)).shape == (0, 3, 3)
+
+
+def test_weld():
+    vertices, faces = stl.weld(CUBE)
+    assert len(vertices) == 8
+    np.testing.assert_array_equal(vertices[faces], CUBE)
+    # -0.0 welds with 0.0, so the mirrored triangle adds two corners, the collinear one shares the origin
+    # and the collapsed one welds to a single vertex.
+    vertices, faces = stl.weld(np.concatenate((CUBE[:1], CUBE[:1] * np.float32(-1), DEGENERATE)))
+    assert len(vertices) == 3 + 2 + 2 + 1
+    assert len(np.unique(faces[-1])) == 1
+
+
+def test_load(tmp_path):
+    path = tmp_path / 'cube.stl'
+    path.write_bytes(write(CUBE))
+    vertices, faces = stl.load(str(path), scale=.001)
+    assert vertices.dtype == np.float32 and faces.dtype == np.int32
+    np.testing.assert_allclose(vertices[faces], CUBE * .001)
+
+
+def test_cluster(rng):
+    vertices, faces = stl.weld(CUBE)
+    # Every corner is in a cell of its own, nothing merges.
+    merged, merged_faces = stl.cluster(vertices, faces, 1)
+    np.testing.assert_array_equal(merged[merged_faces], CUBE)
+
+    vertices = rng.random((5000, 3)).astype(np.float32)
+    faces = rng.integers(0, len(vertices), (2000, 3)).astype(np.int32)
+    merged, merged_faces = stl.cluster(vertices, faces, 4)
+    assert len(merged) <= 5 ** 3
+    assert merged_faces.max() < len(merged)
+    assert np.all((merged_faces[:, 0] != merged_faces[:, 1]) & (merged_faces[:, 1] != merged_faces[:, 2])
+                  & (merged_faces[:, 2] != merged_faces[:, 0]))
+    assert len(np.unique(np.sort(merged_faces, axis=1), axis=0)) == len(merged_faces)
+
+
+def test_cluster_without_extent():
+    # Empty meshes and meshes collapsed to a point are returned as they are.
+    point = np.zeros((3, 3), dtype=np.float32)
+    faces = np.array(((0, 1, 2),), dtype=np.int32)
+    assert stl.cluster(point, faces, 4)[1] is faces
+    assert len(stl.cluster(np.empty((0, 3), dtype=np.float32), np.empty((0, 3), dtype=np.int32), 4)[0]) == 0
@@ -0,0 +1,62 @@
+import math
+
+import numpy as np
+import pytest
+
+from core.construction import construct
+from core.sweep import PARAMETERS, SweepSpace, evaluate_parameters, parse_range, read_columns, run_sweep
+
+STRAIGHT = (.03, 0, .02, 0, .02, .001)
+BENT = (.03, .3, .02, -.5, .02, .001)
+
+
+def test_grid_chunks_cover_the_space_in_order():
+    space = SweepSpace(ranges=((1, 2, 2), (0, 0, 1), (10, 30, 3), (0, 0, 1), (0, 0, 1), (0, 0, 1)), chunk_size=4)
+    assert space.size == 6 and space.chunks == 2
+    grid = np.concatenate([space.chunk(i) for i in range(space.chunks)])
+    # The last parameter varies fastest, like nested loops in PARAMETERS order.
+    np.testing.assert_array_equal(grid[:, [0, 2]], ((1, 10), (1, 20), (1, 30), (2, 10), (2, 20), (2, 30)))
+
+
+def test_random_chunks_are_reproducible():
+    space = SweepSpace(ranges=((0, 1, 1),) * len(PARAMETERS), samples=10, chunk_size=4)
+    assert [len(space.chunk(i)) for i in range(space.chunks)] == [4, 4, 2]
+    np.testing.assert_array_equal(space.chunk(1), space.chunk(1))
+    assert not np.array_equal(space.chunk(0), SweepSpace(space.ranges, samples=10, seed=1, chunk_size=4).chunk(0))
+    assert np.all((space.chunk(0) >= 0) & (space.chunk(0) <= 1))
+
+
+def test_evaluate_parameters():
+    columns = evaluate_parameters(np.array((STRAIGHT, BENT)), steps=10)
+    np.testing.assert_allclose(np.stack([columns[i] for i in PARAMETERS], axis=1), (STRAIGHT, BENT))
+    np.testing.assert_allclose((columns['c_x'][1], columns['c_z'][1]), construct(*BENT[:5]).c)
+    # A, B and C in a line give a straight spline: no curvature, no Pruett circle.
+    np.testing.assert_allclose(columns['length'][0], .04)
+    np.testing.assert_allclose(columns['max_curvature'][0], 0, atol=1e-9)
+    assert columns['min_radius'][0] > 1e6
+    assert not columns['pruett_active'][0] and columns['pruett_active'][1]
+    np.testing.assert_allclose(columns['min_radius'][1], 1 / abs(columns['max_curvature'][1]))
+
+
+def test_rows_are_independent():
+    together = evaluate_parameters(np.array((STRAIGHT, BENT)), steps=10)
+    alone = evaluate_parameters(np.array((BENT,)), steps=10)
+    for name, values in alone.items():
+        np.testing.assert_allclose(together[name][1:], values)
+
+
+@pytest.mark.parametrize('workers', (0, 2))
+def test_sweep_streams_every_chunk_in_order(tmp_path, workers):
+    space = SweepSpace(ranges=((.03, .03, 1), (-.5, .5, 7), (.02, .02, 1), (-.5, .5, 5), (.02, .02, 1),
+                               (.001, .001, 1)), chunk_size=8)
+    assert run_sweep(space, str(tmp_path), workers=workers, steps=10) == space.size
+    columns = read_columns(str(tmp_path))
+    expected = evaluate_parameters(np.concatenate([space.chunk(i) for i in range(space.chunks)]), steps=10)
+    for name, values in expected.items():
+        np.testing.assert_allclose(columns[name], values)
+
+
+def test_parse_range():
+    assert parse_range('b_angle', '-60:60:121') == (-math.pi / 3, math.pi / 3, 121)
+    assert parse_range('height', '30') == (.03, .03, 1)
+    assert parse_range('c_distance', '5:40')[2] == 2
@@ -0,0 +1,122 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from core.stl import weld
+from core.tube import ring_sides, rotation_minimizing_frames, tube
+
+
+def edge_counts(triangles: np.ndarray) -> Counter:
+    """Faces around every edge of the welded triangles, directed so that a flipped face shows up too."""
+    _, faces = weld(triangles)
+    edges = np.concatenate([faces[:, (i, (i + 1) % 3)] for i in range(3)])
+    return Counter(map(tuple, edges))
+
+
+def signed_volume(triangles: np.ndarray) -> float:
+    triangles = triangles.astype(np.float64)
+    return float(np.einsum('ij,ij->i', triangles[:, 0], np.cross(triangles[:, 1], triangles[:, 2])).sum() / 6)
+
+
+def straight(length: float = .05, count: int = 4) -> np.ndarray:
+    x = np.linspace(0, length, 3 * count + 1)
+    points = np.stack((x, np.zeros_like(x), np.zeros_like(x)), axis=1)
+    return np.stack([points[i:i + 4] for i in range(0, 3 * count, 3)])
+
+
+def circle(radius: float = .02, count: int = 8) -> np.ndarray:
+    angle = np.linspace(0, 2 * np.pi, count + 1)
+    k = 4 / 3 * np.tan(np.pi / (2 * count)) * radius
+    co = np.stack((np.cos(angle), np.sin(angle), np.zeros_like(angle)), axis=1) * radius
+    tangent = np.stack((-np.sin(angle), np.cos(angle), np.zeros_like(angle)), axis=1)
+    return np.stack((co[:-1], co[:-1] + tangent[:-1] * k, co[1:] - tangent[1:] * k, co[1:]), axis=1)
+
+
+def helix(radius: float = .02, turns: int = 2, count: int = 8) -> np.ndarray:
+    angle = np.linspace(0, 2 * np.pi * turns, count + 1)
+    co = np.stack((np.cos(angle), np.sin(angle), angle / 10), axis=1) * radius
+    tangent = np.stack((-np.sin(angle), np.cos(angle), np.full_like(angle, .1)), axis=1) * radius * (angle[1] / 3)
+    return np.stack((co[:-1], co[:-1] + tangent[:-1], co[1:] - tangent[1:], co[1:]), axis=1)
+
+
+def collapsed_handles() -> np.ndarray:
+    """A bend between two segments whose handles sit on the points at the corner and at both ends."""
+    co = np.array(((0, 0, 0), (.02, .01, 0), (.03, .02, 0)))
+    return np.array(((co[0], co[0], (.01, 0, 0), co[1]), (co[1], co[1], (.02, .02, 0), co[2])))
+
+
+def zero_length() -> np.ndarray:
+    """A straight spline with a segment collapsed to a point in the middle."""
+    segments = straight()
+    return np.concatenate((segments[:2], np.repeat(segments[1, -1:], 4, axis=0)[None], segments[2:]))
+
+
+@pytest.mark.parametrize('segments, radius, cyclic', (
+    (straight(), np.full(5, .002), False),
+    (circle(), np.full(8, .002), True),
+    (helix(), np.linspace(.001, .003, 9), False),
+    (collapsed_handles(), np.full(3, .002), False),
+    (zero_length(), np.full(6, .002), False),
+))
+def test_tube_is_closed_manifold(segments, radius, cyclic):
+    mesh = tube(segments, radius, 1e-5, cyclic=cyclic)
+    assert np.all(np.isfinite(mesh.vertices))
+    counts = edge_counts(mesh.triangles())
+    # Closed and consistently wound: every directed edge appears once and so does its reverse.
+    assert set(counts.values()) == {1}
+    assert all((b, a) in counts for a, b in counts)
+    assert len(mesh.caps) == (0 if cyclic else 2)
+    assert signed_volume(mesh.triangles()) > 0
+
+
+def test_tapered_tube_ends_in_a_point():
+    segments = straight()
+    mesh = tube(segments, np.array((.002, .002, .002, .002, 0)), 1e-5)
+    assert np.all(np.isfinite(mesh.vertices))
+    np.testing.assert_allclose(mesh.vertices[mesh.caps[1]], np.broadcast_to(segments[-1, -1], (mesh.sides, 3)),
+                               atol=1e-9)
+    assert signed_volume(mesh.triangles()) > 0
+
+
+def test_collapsed_segment_adds_no_rings():
+    segments = zero_length()
+    vertices = len(tube(segments, np.full(6, .002), 1e-5).vertices)
+    assert vertices == len(tube(np.delete(segments, 2, axis=0), np.full(5, .002), 1e-5).vertices)
+
+
+def test_straight_tube_volume():
+    radius, length, tolerance = .002, .05, 1e-5
+    mesh = tube(straight(length), np.full(5, radius), tolerance)
+    # The rings are inscribed polygons, so the volume is a little below the cylinder.
+    cylinder = np.pi * radius ** 2 * length
+    assert cylinder * (1 - 2 * tolerance / radius) - 1e-12 <= signed_volume(mesh.triangles()) <= cylinder
+
+
+def test_torus_volume():
+    radius, major = .002, .02
+    mesh = tube(circle(major), np.full(8, radius), 1e-6, cyclic=True)
+    np.testing.assert_allclose(signed_volume(mesh.triangles()), 2 * np.pi ** 2 * major * radius ** 2, rtol=5e-3)
+
+
+def test_ring_sides_meet_tolerance():
+    for radius, tolerance in ((.002, 1e-5), (.01, 1e-6), (.001, 1e-4)):
+        sides = ring_sides(radius, tolerance, 3, 1000)
+        assert radius * (1 - np.cos(np.pi / sides)) <= tolerance
+        assert radius * (1 - np.cos(np.pi / (sides - 1))) > tolerance or sides == 3
+
+
+def test_frames_are_orthonormal_and_minimal():
+    segments = circle()
+    t = np.linspace(0, 1, 17)[:-1]
+    mt = 1 - t[:, None]
+    p0, p1, p2, p3 = (segments[:, i, None] for i in range(4))
+    positions = (mt ** 3 * p0 + 3 * mt ** 2 * t[:, None] * p1 + 3 * mt * t[:, None] ** 2 * p2
+                 + t[:, None] ** 3 * p3).reshape(-1, 3)
+    tangents = np.gradient(positions, axis=0)
+    tangents /= np.linalg.norm(tangents, axis=1, keepdims=True)
+    normals = rotation_minimizing_frames(positions, tangents)
+    np.testing.assert_allclose(np.einsum('ij,ij->i', normals, tangents), 0, atol=1e-9)
+    np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1)
+    # A planar circle needs no twist, the normal keeps pointing in or out of the plane the same way.
+    assert np.ptp(normals[:, 2]) < 1e-9
@@ -1,14 +1,37 @@
+import time
+from contextlib import contextmanager
+
 import bpy.types
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from . import ZenUtilsPreferences
 
+# Name -> milliseconds of the register steps and lazy loads, listed in the add-on preferences.
+timings: dict[str, float] = {}
+
+
+@contextmanager
+def timed(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = (time.perf_counter() - start) * 1000
+
 
 def update_window():
-    for region in bpy.context.area.regions:
-        if region.type == 'WINDOW':
-            region.tag_redraw()
+    """Redraw the current area, or every 3D view outside of one: in handlers, timers and background mode."""
+    area = bpy.context.area
+    if area is not None:
+        areas = [area]
+    else:
+        areas = [i for window in bpy.context.window_manager.windows for i in window.screen.areas
+                 if i.type == 'VIEW_3D']
+    for area in areas:
+        for region in area.regions:
+            if region.type == 'WINDOW':
+                region.tag_redraw()
 
 
 def get_prefs() -> 'ZenUtilsPreferences':